@@ -0,0 +1,63 @@
+import http from "k6/http";
+import { check } from "k6";
+
+// Замер пропускной способности API-views одним воркером uvicorn.
+// Сценарий без пауз: каждый VU сразу шлёт следующий запрос, поэтому
+// итоговый http_reqs rate — это RPS, который выдерживает сервер.
+// Для сравнения до/после запустите его на обеих ревизиях с одинаковыми
+// BENCH_VUS/BENCH_DURATION и поднятыми THROTTLE_RATE_* в .env.
+
+const BASE_URL = (__ENV.BASE_URL || "http://web:8000").replace(/\/$/, "");
+const BENCH_LABEL = __ENV.BENCH_LABEL || "current";
+const BENCH_VUS = Number(__ENV.BENCH_VUS || 100);
+const BENCH_DURATION = __ENV.BENCH_DURATION || "60s";
+const PUBLIC_QUERY = __ENV.PUBLIC_QUERY || "metallica";
+const YEAR_GENRE = __ENV.YEAR_GENRE || "rock";
+
+const ENDPOINTS = [
+  `/music_api/year-chart/?genre=${encodeURIComponent(YEAR_GENRE)}`,
+  "/music_api/trending/",
+  `/music_api/search/?q=${encodeURIComponent(PUBLIC_QUERY)}&page=1`,
+  `/music_api/search/artists/?q=${encodeURIComponent(PUBLIC_QUERY)}`,
+  "/api/playlists/public/trending/",
+];
+
+export const options = {
+  scenarios: {
+    async_views: {
+      executor: "constant-vus",
+      vus: BENCH_VUS,
+      duration: BENCH_DURATION,
+    },
+  },
+  thresholds: {
+    http_req_failed: ["rate<0.01"],
+  },
+};
+
+export function setup() {
+  // Прогреваем кэш, чтобы замер не зависел от первого похода к провайдерам.
+  for (const path of ENDPOINTS) {
+    http.get(`${BASE_URL}${path}`);
+  }
+}
+
+export default function () {
+  const path = ENDPOINTS[__ITER % ENDPOINTS.length];
+  const res = http.get(`${BASE_URL}${path}`, {
+    tags: { endpoint: path.split("?")[0] },
+  });
+  check(res, {
+    "status is 200": (r) => r.status === 200,
+  });
+}
+
+export function handleSummary(data) {
+  const reqs = data.metrics.http_reqs.values;
+  const duration = data.metrics.http_req_duration.values;
+  const line =
+    `[${BENCH_LABEL}] vus=${BENCH_VUS} duration=${BENCH_DURATION} ` +
+    `rps=${reqs.rate.toFixed(1)} requests=${reqs.count} ` +
+    `p50=${duration.med.toFixed(1)}ms p95=${duration["p(95)"].toFixed(1)}ms\n`;
+  return { stdout: line };
+}
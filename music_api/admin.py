@@ -6,12 +6,21 @@ from django.contrib import messages
 from django.contrib.auth import logout
 from django.core.exceptions import PermissionDenied
 from django.conf import settings
+from django.db.models import Count
 from django.http import FileResponse, Http404, HttpResponseRedirect
 from django.template.response import TemplateResponse
 from django.urls import path, reverse
 from django.utils.html import format_html_join, format_html
 
-from .models import Playlist, PlaylistComment, PlaylistLike, PlaylistLikeNotification
+from .models import (
+    ArtistMetadata,
+    Playlist,
+    PlaylistComment,
+    PlaylistLike,
+    PlaylistLikeNotification,
+    TrackMetadata,
+)
+from .services import cache_namespaces, track_playlists
 from .services.db_backup import (
     DatabaseBackupError,
     cleanup_old_backup_files,
@@ -231,6 +240,45 @@ def _admin_backup_restore_view(request, filename):
     return TemplateResponse(request, "admin/backup_restore.html", context)
 
 
+def _admin_cache_view(request):
+    if not request.user.is_superuser:
+        raise PermissionDenied("Only superusers can invalidate cache namespaces.")
+
+    generations = cache_namespaces.generations()
+    context = {
+        **admin.site.each_context(request),
+        "title": "Кэш",
+        "namespaces": [
+            {"name": name, "description": description, "generation": generations[name]}
+            for name, description in cache_namespaces.NAMESPACES.items()
+        ],
+    }
+    return TemplateResponse(request, "admin/cache.html", context)
+
+
+def _admin_cache_invalidate_view(request, namespace):
+    if not request.user.is_superuser:
+        raise PermissionDenied("Only superusers can invalidate cache namespaces.")
+
+    if request.method != "POST":
+        return HttpResponseRedirect(reverse("admin:music_api_cache"))
+
+    if namespace not in cache_namespaces.NAMESPACES:
+        messages.error(request, f"Неизвестное пространство имён: {namespace}")
+        return HttpResponseRedirect(reverse("admin:music_api_cache"))
+
+    generation = cache_namespaces.bump(namespace)
+    logger.info(
+        "Cache namespace %s invalidated by superuser %s (id=%s): g%s",
+        namespace,
+        request.user.get_username(),
+        request.user.pk,
+        generation,
+    )
+    messages.success(request, f"Кэш {namespace} сброшен (поколение {generation})")
+    return HttpResponseRedirect(reverse("admin:music_api_cache"))
+
+
 def _get_admin_urls():
     urls = _original_admin_get_urls()
     custom_urls = [
@@ -259,6 +307,16 @@ def _get_admin_urls():
             admin.site.admin_view(_admin_backup_restore_view),
             name="music_api_db_backup_restore",
         ),
+        path(
+            "cache/",
+            admin.site.admin_view(_admin_cache_view),
+            name="music_api_cache",
+        ),
+        path(
+            "cache/invalidate/<str:namespace>/",
+            admin.site.admin_view(_admin_cache_invalidate_view),
+            name="music_api_cache_invalidate",
+        ),
     ]
     return custom_urls + urls
 
@@ -283,41 +341,26 @@ class PlaylistAdmin(admin.ModelAdmin):
     list_select_related = ("user",)
     readonly_fields = ("created_at", "tracks_preview")
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_tracks_count=Count("items"))
+
     def tracks_count(self, obj):
-        tracks = obj.tracks if isinstance(obj.tracks, list) else []
-        return len(tracks)
+        return obj._tracks_count
 
     tracks_count.short_description = "Tracks"
+    tracks_count.admin_order_field = "_tracks_count"
 
     def tracks_preview(self, obj):
-        tracks = obj.tracks if isinstance(obj.tracks, list) else []
+        tracks = [(item.name, item.artist) for item in obj.items.all()]
         if not tracks:
             return "No tracks"
 
-        normalized = []
-        for item in tracks:
-            if not isinstance(item, dict):
-                continue
-            name = str(item.get("name", "")).strip()
-            artist_raw = item.get("artist", "")
-            artist = (
-                artist_raw.get("name", "")
-                if isinstance(artist_raw, dict)
-                else str(artist_raw or "").strip()
-            )
-            if not name or not artist:
-                continue
-            normalized.append((name, artist))
-
-        if not normalized:
-            return "No tracks"
-
         return format_html(
             '<div style="max-height: 280px; overflow:auto;">{}</div>',
             format_html_join(
                 "",
                 '<div><strong>{}</strong> <span style="opacity:.8;">- {}</span></div>',
-                normalized,
+                tracks,
             ),
         )
 
@@ -335,78 +378,7 @@ class PlaylistAdmin(admin.ModelAdmin):
         return custom_urls + urls
 
     def tracks_report_view(self, request):
-        query = (request.GET.get("q") or "").strip().lower()
-        rows_map = {}
-
-        playlists = (
-            Playlist.objects.select_related("user")
-            .all()
-            .only("id", "tracks", "user__id", "user__username", "user__email")
-        )
-
-        for playlist in playlists.iterator():
-            tracks = playlist.tracks if isinstance(playlist.tracks, list) else []
-            username = playlist.user.username
-            email = playlist.user.email or ""
-
-            for item in tracks:
-                if not isinstance(item, dict):
-                    continue
-
-                name = str(item.get("name", "")).strip()
-                artist_raw = item.get("artist", "")
-                artist = (
-                    artist_raw.get("name", "")
-                    if isinstance(artist_raw, dict)
-                    else str(artist_raw or "").strip()
-                )
-
-                if not name or not artist:
-                    continue
-
-                search_blob = f"{name} {artist} {username} {email}".lower()
-                if query and query not in search_blob:
-                    continue
-
-                key = (name.lower(), artist.lower())
-                if key not in rows_map:
-                    rows_map[key] = {
-                        "name": name,
-                        "artist": artist,
-                        "users": {},
-                        "total_adds": 0,
-                    }
-
-                rows_map[key]["total_adds"] += 1
-                rows_map[key]["users"][playlist.user_id] = {
-                    "id": playlist.user_id,
-                    "username": username,
-                    "email": email,
-                }
-
-        rows = []
-        for item in rows_map.values():
-            users = sorted(
-                item["users"].values(), key=lambda u: (u["username"].lower(), u["id"])
-            )
-            rows.append(
-                {
-                    "name": item["name"],
-                    "artist": item["artist"],
-                    "user_count": len(users),
-                    "total_adds": item["total_adds"],
-                    "users": users,
-                }
-            )
-
-        rows.sort(
-            key=lambda r: (
-                -r["user_count"],
-                -r["total_adds"],
-                r["name"].lower(),
-                r["artist"].lower(),
-            )
-        )
+        rows = track_playlists.report(request.GET.get("q") or "")
 
         context = {
             **self.admin_site.each_context(request),
@@ -439,3 +411,23 @@ class PlaylistCommentAdmin(admin.ModelAdmin):
     list_display = ("id", "playlist", "parent", "author", "created_at")
     list_select_related = ("playlist", "parent", "author")
     search_fields = ("playlist__title", "playlist__user__username", "author__username")
+
+
+@admin.register(TrackMetadata)
+class TrackMetadataAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "artist",
+        "name",
+        "mbid",
+        "itunes_fetched_at",
+        "deezer_fetched_at",
+        "lastfm_fetched_at",
+    )
+    search_fields = ("artist", "name", "mbid")
+
+
+@admin.register(ArtistMetadata)
+class ArtistMetadataAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "mbid", "photo_fetched_at", "releases_fetched_at")
+    search_fields = ("name", "mbid")
@@ -10,6 +10,7 @@ from .views.playlists_async import (
     PublicFavoritesAPIView,
     PublicFavoritesLikeAPIView,
     PublicFavoritesTrendingAPIView,
+    TrackPlaylistsAPIView,
 )
 from .views.wikipedia_async import WikipediaArtistBatchAPIView
 
@@ -20,6 +21,11 @@ urlpatterns = [
         PlaylistTrackAddAPIView.as_view(),
         name="playlist_add_track",
     ),
+    path(
+        "playlists/by-track/",
+        TrackPlaylistsAPIView.as_view(),
+        name="playlist_by_track",
+    ),
     path(
         "playlists/public/trending/",
         PublicFavoritesTrendingAPIView.as_view(),
@@ -19,7 +19,7 @@ def _resolve_public_playlist_id_by_username(username: str):
 
     playlist = Playlist.objects.filter(user=owner).order_by("created_at").first()
     if playlist is None:
-        playlist = Playlist.objects.create(user=owner, title="Favorites", tracks=[])
+        playlist = Playlist.objects.create(user=owner, title="Favorites")
 
     return playlist.id
 
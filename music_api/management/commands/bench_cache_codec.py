@@ -0,0 +1,118 @@
+import os
+import time
+from itertools import islice
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django_redis.compressors.zlib import ZlibCompressor
+from django_redis.serializers.pickle import PickleSerializer
+
+from music_api.management.commands.bench_renderers import (
+    trending_payload,
+    year_chart_payload,
+)
+from music_api.services import swr
+from music_api.services.cache_codec import CacheCompressor, CacheSerializer
+
+CODECS = {
+    "pickle+zlib": (PickleSerializer({}), ZlibCompressor({})),
+    "json+zlib": (CacheSerializer({}), CacheCompressor({})),
+}
+
+LIVE_PATTERNS = ("tracks_chart:*", "search_enriched:*")
+
+
+def sample_entries():
+    """Значения в том виде, в каком их пишут views."""
+    return {
+        "tracks_chart (75)": swr.pack(year_chart_payload(75)["tracks"]),
+        "tracks_chart (15)": swr.pack(year_chart_payload(15)["tracks"]),
+        "search_enriched (14)": year_chart_payload(14)["tracks"],
+        "trending (75, releases)": swr.pack(trending_payload()),
+        "presence": "2026-10-18T12:00:00.123456+00:00",
+        "throttle history": [time.time() - i for i in range(60)],
+        "audio (1 MiB)": {
+            "content": os.urandom(1024 * 1024),
+            "content_type": "audio/mpeg",
+            "content_length": "1048576",
+            "accept_ranges": "bytes",
+        },
+    }
+
+
+def encode(codec, value):
+    serializer, compressor = codec
+    return compressor.compress(serializer.dumps(value))
+
+
+def decode(codec, raw):
+    serializer, compressor = codec
+    try:
+        raw = compressor.decompress(raw)
+    except Exception:
+        pass
+    return serializer.loads(raw)
+
+
+def measure(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+
+class Command(BaseCommand):
+    help = (
+        "Размер значения и CPU на cache.get: pickle+zlib против "
+        "orjson/msgpack+zlib/lz4. "
+        "С --live — по реальным ключам tracks_chart:* и search_enriched:* в Redis."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--live", action="store_true")
+        parser.add_argument("--keys", type=int, default=50)
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+        if options["live"]:
+            self._bench_live(iterations, options["keys"])
+        else:
+            for label, value in sample_entries().items():
+                self._report(label, value, iterations)
+
+    def _report(self, label, value, iterations, memory=None):
+        self.stdout.write(label)
+        for name, codec in CODECS.items():
+            raw = encode(codec, value)
+            decode_time = measure(lambda: decode(codec, raw), iterations)
+            line = f"  {name:12} {len(raw):9d} B  get {decode_time * 1e6:9.1f} us"
+            if memory is not None:
+                line += f"  redis {memory(raw):9d} B"
+            self.stdout.write(line)
+
+    def _bench_live(self, iterations, limit):
+        try:
+            from django_redis import get_redis_connection
+
+            conn = get_redis_connection("default")
+        except Exception as exc:
+            raise CommandError(f"--live needs django-redis cache: {exc}")
+
+        def memory(raw):
+            # MEMORY USAGE на временном ключе с тем же значением.
+            key = "bench_cache_codec:tmp"
+            conn.set(key, raw, ex=60)
+            try:
+                return int(conn.memory_usage(key, samples=0) or 0)
+            finally:
+                conn.delete(key)
+
+        for pattern in LIVE_PATTERNS:
+            keys = list(islice(conn.scan_iter(match=f"*{pattern}", count=500), limit))
+            if not keys:
+                self.stdout.write(f"{pattern}: no keys")
+                continue
+            for key in keys:
+                value = cache.client.decode(conn.get(key))
+                self._report(key.decode(), value, iterations, memory)
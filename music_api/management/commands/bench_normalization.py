@@ -0,0 +1,188 @@
+import json
+import re
+import time
+import unicodedata
+
+from django.core.management.base import BaseCommand, CommandError
+
+from music_api.services import normalization
+
+# Названия и артисты в том виде, в каком их отдают track.search / chart.gettoptracks.
+SAMPLE_TRACKS = [
+    ("Bohemian Rhapsody - Remastered 2011", "Queen"),
+    ("Blinding Lights", "The Weeknd"),
+    ("Despacito (feat. Daddy Yankee)", "Luis Fonsi"),
+    ("Enter Sandman (Remastered)", "Metallica"),
+    ("Señorita", "Shawn Mendes & Camila Cabello"),
+    ("Hey Jude - Remastered 2015", "The Beatles"),
+    ("Smells Like Teen Spirit [Live]", "Nirvana"),
+    ("Stan (feat. Dido)", "Eminem"),
+    ("Hurt", "Johnny Cash"),
+    ("Jóga", "Björk"),
+    ("99 Luftballons", "Nena"),
+    ("Sweet Child O' Mine", "Guns N' Roses"),
+    ("Lose Yourself - Soundtrack Version", "Eminem"),
+    ("Ниже и ниже", "Сплин"),
+    ("Wonderwall (Remastered) [Deluxe Edition]", "Oasis"),
+    ("Billie Jean - Single Version", "Michael Jackson"),
+]
+
+
+def _legacy_track_text(value):
+    if not value:
+        return ""
+    text = value.casefold()
+    text = re.sub(r"[\(\[\{].*?[\)\]\}]", " ", text)
+    text = re.sub(r"\b(feat\.|ft\.|featuring|with)\b.*", " ", text)
+    text = re.sub(
+        r"\b(remaster(ed)?|deluxe|explicit|clean|live|radio edit)\b", " ", text
+    )
+    text = re.sub(r"[^\w\s]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def _legacy_artist_tokens_match(target, candidate):
+    target_tokens = set(_legacy_track_text(target).split())
+    candidate_tokens = set(_legacy_track_text(candidate).split())
+    if not target_tokens or not candidate_tokens:
+        return False
+    return target_tokens.issubset(candidate_tokens) or candidate_tokens.issubset(
+        target_tokens
+    )
+
+
+def _legacy_track_names_match(target, candidate):
+    target_norm = _legacy_track_text(target)
+    candidate_norm = _legacy_track_text(candidate)
+    if not target_norm or not candidate_norm:
+        return False
+    if target_norm == candidate_norm:
+        return True
+    if len(target_norm) < 4 or len(candidate_norm) < 4:
+        return False
+    return target_norm in candidate_norm or candidate_norm in target_norm
+
+
+def _legacy_artist_name(value):
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.casefold()
+    text = re.sub(r"[^\w\s]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def _legacy_text(value):
+    collapsed = " ".join(str(value or "").split())
+    normalized = unicodedata.normalize("NFKD", collapsed)
+    normalized = "".join(ch for ch in normalized if not unicodedata.combining(ch))
+    return normalized.lower()
+
+
+LEGACY = {
+    "track_names_match": _legacy_track_names_match,
+    "artist_tokens_match": _legacy_artist_tokens_match,
+    "artist_name": _legacy_artist_name,
+    "text": _legacy_text,
+}
+CURRENT = {
+    "track_names_match": normalization.track_names_match,
+    "artist_tokens_match": normalization.artist_tokens_match,
+    "artist_name": normalization.normalize_artist_name,
+    "text": normalization.normalize_text,
+}
+
+
+def load_tracks(path):
+    """Пары (name, artist) из сохранённого ответа Last.fm."""
+    with open(path, encoding="utf-8") as fh:
+        payload = json.load(fh)
+    if "results" in payload:
+        items = payload["results"]["trackmatches"]["track"]
+    else:
+        items = payload["tracks"]["track"]
+    tracks = []
+    for item in items:
+        artist = item.get("artist")
+        if isinstance(artist, dict):
+            artist = artist.get("name")
+        if item.get("name") and artist:
+            tracks.append((str(item["name"]), str(artist)))
+    return tracks
+
+
+def build_workload(tracks, candidates=5):
+    """Сравнения, как в iTunes batch: трек против ``candidates`` ответов."""
+    pairs = []
+    for index, (name, artist) in enumerate(tracks):
+        for offset in range(candidates):
+            other_name, other_artist = tracks[(index + offset) % len(tracks)]
+            pairs.append((name, artist, other_name, other_artist))
+    return pairs
+
+
+def run(funcs, tracks, pairs):
+    names_match = funcs["track_names_match"]
+    tokens_match = funcs["artist_tokens_match"]
+    artist_name = funcs["artist_name"]
+    text = funcs["text"]
+    out = []
+    for name, artist, other_name, other_artist in pairs:
+        out.append(names_match(name, other_name) and tokens_match(artist, other_artist))
+    for name, artist in tracks:
+        out.append((artist_name(artist), text(name), text(artist)))
+    return out
+
+
+def measure(funcs, tracks, pairs, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        result = run(funcs, tracks, pairs)
+    return time.perf_counter() - started, result
+
+
+class Command(BaseCommand):
+    help = "Сравнить скорость нормализации текста с прежней реализацией."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--payload",
+            help="JSON-ответ Last.fm (track.search или chart.gettoptracks).",
+        )
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=8,
+            help="Сколько раз размножить пример, если --payload не задан.",
+        )
+
+    def handle(self, *args, **options):
+        if options["payload"]:
+            tracks = load_tracks(options["payload"])
+        else:
+            tracks = SAMPLE_TRACKS * max(1, options["repeat"])
+        if not tracks:
+            raise CommandError("No tracks in payload")
+        pairs = build_workload(tracks)
+        iterations = max(1, options["iterations"])
+
+        normalization.cache_clear()
+        legacy_time, legacy_result = measure(LEGACY, tracks, pairs, iterations)
+        current_time, current_result = measure(CURRENT, tracks, pairs, iterations)
+        if legacy_result != current_result:
+            raise CommandError("Normalization results differ from legacy version")
+
+        calls = iterations * (len(pairs) + len(tracks))
+        self.stdout.write(
+            f"tracks={len(tracks)} comparisons={len(pairs)} iterations={iterations}"
+        )
+        for label, elapsed in (("legacy", legacy_time), ("current", current_time)):
+            self.stdout.write(
+                f"{label:8} {elapsed * 1000:9.1f} ms "
+                f"{elapsed / calls * 1e6:7.2f} us/op"
+            )
+        self.stdout.write(f"speedup  {legacy_time / max(current_time, 1e-9):.1f}x")
@@ -0,0 +1,127 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from music_api.renderers import ORJSONParser, ORJSONRenderer
+
+
+def year_chart_payload(count=75):
+    tracks = [
+        {
+            "name": f"Track {i} (feat. Guest {i})",
+            "artist": f"Artist {i % 30}",
+            "listeners": 1_500_000 - i * 1000,
+            "playcount": 25_000_000 - i * 7000,
+            "url": f"https://audio-ssl.itunes.apple.com/preview/{i}.m4a",
+            "image_url": f"https://is1-ssl.mzstatic.com/image/{i}/600x600bb.jpg",
+            "mbid": f"8f1c5a2e-0000-4000-8000-{i:012d}",
+        }
+        for i in range(count)
+    ]
+    return {"tracks": tracks, "meta": {"cached": True, "created_at": 1760000000}}
+
+
+def trending_payload(count=75, releases=10):
+    artists = [
+        {
+            "name": f"Artist {i}",
+            "listeners": 3_000_000 - i * 5000,
+            "playcount": 90_000_000 - i * 9000,
+            "mbid": f"5b11f4ce-0000-4000-8000-{i:012d}",
+            "url": f"https://www.last.fm/music/Artist+{i}",
+            "image_url": f"https://r2.theaudiodb.com/images/media/artist/{i}.jpg",
+            "releases": [
+                {
+                    "name": f"Album {j} — Deluxe Édition",
+                    "playcount": 400_000 - j * 1000,
+                    "url": f"https://www.last.fm/music/Artist+{i}/Album+{j}",
+                    "image_url": f"https://lastfm.freetls.fastly.net/{i}/{j}.png",
+                }
+                for j in range(releases)
+            ],
+        }
+        for i in range(count)
+    ]
+    return {
+        "artists": artists,
+        "meta": {"genre": "all", "count": count, "limit": count, "cached": True},
+    }
+
+
+def comments_payload(count=50, replies=3):
+    def comment(i, parent_id=None):
+        return {
+            "id": i,
+            "text": "Отличный плейлист, спасибо! " * 3,
+            "author_username": f"user{i}",
+            "author_avatar_url": None,
+            "author_profile_url": f"/users/user{i}/",
+            "created_at": "2026-10-18T12:00:00+03:00",
+            "created_at_display": "18.10.2026 12:00",
+            "can_delete": False,
+            "parent_id": parent_id,
+            "reply_to_user_id": None,
+            "reply_to_username": None,
+            "likes_count": i % 7,
+            "liked_by_me": False,
+            "replies": [],
+        }
+
+    roots = []
+    for i in range(count):
+        root = comment(i)
+        root["replies"] = [comment(count + i * replies + j, i) for j in range(replies)]
+        roots.append(root)
+    return {"comments": roots, "meta": {"count": len(roots)}}
+
+
+PAYLOADS = {
+    "year-chart": year_chart_payload,
+    "trending": trending_payload,
+    "playlist-comments": comments_payload,
+}
+
+
+def measure(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+
+class Command(BaseCommand):
+    help = "Сравнить orjson-рендерер и парсер с JSON DRF на самых больших ответах."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+        pairs = (
+            ("render", JSONRenderer(), ORJSONRenderer()),
+            ("parse", JSONParser(), ORJSONParser()),
+        )
+        for label, build in PAYLOADS.items():
+            payload = build()
+            body = JSONRenderer().render(payload)
+            self.stdout.write(f"{label}: {len(body) / 1024:.1f} KiB")
+            for action, stdlib, fast in pairs:
+                if action == "render":
+                    timings = [
+                        measure(lambda r=r: r.render(payload), iterations)
+                        for r in (stdlib, fast)
+                    ]
+                else:
+                    timings = [
+                        measure(lambda p=p: p.parse(io.BytesIO(body)), iterations)
+                        for p in (stdlib, fast)
+                    ]
+                drf_time, orjson_time = timings
+                self.stdout.write(
+                    f"  {action:6} drf {drf_time * 1e6:8.1f} us  "
+                    f"orjson {orjson_time * 1e6:8.1f} us  "
+                    f"speedup {drf_time / max(orjson_time, 1e-9):.1f}x"
+                )
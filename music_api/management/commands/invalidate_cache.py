@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from music_api.services import cache_namespaces
+
+
+class Command(BaseCommand):
+    help = (
+        "Сбросить пространства имён кэша (tracks_chart, search_enriched, ...) "
+        "увеличением поколения, без SCAN по Redis."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("namespaces", nargs="*")
+        parser.add_argument("--all", action="store_true")
+        parser.add_argument(
+            "--list", action="store_true", help="Показать текущие поколения."
+        )
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for namespace, generation in cache_namespaces.generations().items():
+                self.stdout.write(
+                    f"{namespace:24} g{generation}  "
+                    f"{cache_namespaces.NAMESPACES[namespace]}"
+                )
+            return
+
+        namespaces = options["namespaces"]
+        if options["all"]:
+            namespaces = list(cache_namespaces.NAMESPACES)
+        if not namespaces:
+            raise CommandError("Pass namespaces, --all or --list")
+        unknown = [ns for ns in namespaces if ns not in cache_namespaces.NAMESPACES]
+        if unknown:
+            raise CommandError(f"Unknown cache namespaces: {', '.join(unknown)}")
+
+        for namespace in namespaces:
+            generation = cache_namespaces.bump(namespace)
+            self.stdout.write(f"{namespace}: g{generation}")
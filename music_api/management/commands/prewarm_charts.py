@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from music_api.services import swr
+from music_api.services.http_clients import close_http_clients
+from music_api.views.artists_async import (
+    CACHE_TIMEOUT as TRENDING_SOFT_TTL,
+    DEFAULT_ARTIST_COUNT,
+    _refresh_artists,
+    _trending_cache_key,
+)
+from music_api.views.tracks_async import (
+    CACHE_TIMEOUT as CHART_SOFT_TTL,
+    DEFAULT_TRACK_COUNT,
+    DeezerChartAPIView,
+    YearChartAPIView,
+    _apple_chart_cache_key,
+    _year_chart_cache_key,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChartTarget:
+    label: str
+    cache_key: str
+    soft_ttl: float
+    refresh: Callable[[], Awaitable[Any]]
+
+
+async def build_targets(genres):
+    """Комбинации, которые запрашивает главная страница (trending.js, year2025.js)."""
+    year_view = YearChartAPIView()
+    apple_view = DeezerChartAPIView()
+
+    apple_key = await _apple_chart_cache_key("us", 50, "songs")
+    trending_key = await _trending_cache_key(None, DEFAULT_ARTIST_COUNT)
+    targets = [
+        ChartTarget(
+            "apple-chart",
+            apple_key,
+            CHART_SOFT_TTL,
+            partial(apple_view._refresh_chart_async, apple_key, "us", 50, "songs"),
+        ),
+        ChartTarget(
+            "trending",
+            trending_key,
+            TRENDING_SOFT_TTL,
+            partial(_refresh_artists, trending_key, None, DEFAULT_ARTIST_COUNT),
+        ),
+    ]
+    for genre in genres:
+        trending_key = await _trending_cache_key(genre, DEFAULT_ARTIST_COUNT)
+        year_key = await _year_chart_cache_key(genre, DEFAULT_TRACK_COUNT)
+        targets.append(
+            ChartTarget(
+                f"trending:{genre}",
+                trending_key,
+                TRENDING_SOFT_TTL,
+                partial(_refresh_artists, trending_key, genre, DEFAULT_ARTIST_COUNT),
+            )
+        )
+        targets.append(
+            ChartTarget(
+                f"year-chart:{genre}",
+                year_key,
+                CHART_SOFT_TTL,
+                partial(
+                    year_view._refresh_chart_async, year_key, genre, DEFAULT_TRACK_COUNT
+                ),
+            )
+        )
+    return targets
+
+
+async def is_due(target, lead, jitter):
+    entry = await swr.aget_entry(target.cache_key)
+    if entry is None:
+        return True
+    return entry.age >= target.soft_ttl - lead - random.uniform(0, jitter)
+
+
+class Command(BaseCommand):
+    help = "Прогревает кэш чартов и трендов для жанров с главной страницы."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Один проход (например, из cron) вместо бесконечного цикла.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Обновить все комбинации, даже если кэш ещё свежий.",
+        )
+        parser.add_argument(
+            "--genres",
+            help="Жанры через запятую вместо CHART_PREWARM_GENRES.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=settings.CHART_PREWARM_INTERVAL_SECONDS,
+            help="Пауза между проходами, секунды.",
+        )
+
+    def handle(self, *args, **options):
+        genres = settings.CHART_PREWARM_GENRES
+        if options["genres"]:
+            genres = [g.strip() for g in options["genres"].split(",") if g.strip()]
+
+        asyncio.run(
+            self._run(
+                genres,
+                once=options["once"],
+                force=options["force"],
+                interval=options["interval"],
+            )
+        )
+
+    async def _run(self, genres, once, force, interval):
+        lead = settings.CHART_PREWARM_LEAD_SECONDS
+        jitter = settings.CHART_PREWARM_JITTER_SECONDS
+        try:
+            targets = await build_targets(genres)
+            self.stdout.write(f"Prewarming {len(targets)} chart combinations")
+            while True:
+                refreshed = await self._warm(targets, lead, jitter, force)
+                self.stdout.write(f"Refreshed {refreshed}/{len(targets)} combinations")
+                if once:
+                    return
+                force = False
+                await asyncio.sleep(interval)
+                # После сброса пространства имён ключи уже другие.
+                targets = await build_targets(genres)
+        finally:
+            await close_http_clients()
+
+    async def _warm(self, targets, lead, jitter, force):
+        # Комбинации обновляются по очереди: запросы к провайдерам и так
+        # проходят через общий rate limiter, прогрев не должен его выбирать.
+        refreshed = 0
+        for target in targets:
+            if not force and not await is_due(target, lead, jitter):
+                continue
+            try:
+                if await swr.arefresh_now(target.cache_key, target.refresh):
+                    refreshed += 1
+            except Exception as exc:
+                logger.warning("Prewarm of %s failed: %s", target.label, exc)
+        return refreshed
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_api", "0011_playlistcommentlike"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrackMetadata",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                ("artist", models.CharField(max_length=255)),
+                ("name_key", models.CharField(max_length=255)),
+                ("artist_key", models.CharField(max_length=255)),
+                ("mbid", models.CharField(blank=True, default="", max_length=64)),
+                ("itunes", models.JSONField(blank=True, null=True)),
+                ("itunes_fetched_at", models.DateTimeField(blank=True, null=True)),
+                ("deezer", models.JSONField(blank=True, null=True)),
+                ("deezer_fetched_at", models.DateTimeField(blank=True, null=True)),
+                ("lastfm", models.JSONField(blank=True, null=True)),
+                ("lastfm_fetched_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="trackmetadata",
+            index=models.Index(fields=["mbid"], name="music_api_t_mbid_2599d0_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="trackmetadata",
+            constraint=models.UniqueConstraint(
+                fields=("artist_key", "name_key"), name="unique_track_metadata_key"
+            ),
+        ),
+    ]
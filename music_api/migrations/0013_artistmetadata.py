@@ -0,0 +1,39 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_api", "0012_trackmetadata"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArtistMetadata",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                ("name_key", models.CharField(max_length=255, unique=True)),
+                ("mbid", models.CharField(blank=True, default="", max_length=64)),
+                ("photo_url", models.CharField(blank=True, default="", max_length=500)),
+                ("photo_fetched_at", models.DateTimeField(blank=True, null=True)),
+                ("releases", models.JSONField(blank=True, default=list)),
+                ("releases_fetched_at", models.DateTimeField(blank=True, null=True)),
+                ("bios", models.JSONField(blank=True, default=dict)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="artistmetadata",
+            index=models.Index(fields=["mbid"], name="music_api_a_mbid_f29023_idx"),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_api", "0013_artistmetadata"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlaylistTrack",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.PositiveIntegerField(default=0)),
+                ("name", models.CharField(max_length=255)),
+                ("artist", models.CharField(max_length=255)),
+                ("name_key", models.CharField(max_length=255)),
+                ("artist_key", models.CharField(max_length=255)),
+                ("mbid", models.CharField(blank=True, default="", max_length=64)),
+                ("added_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["position", "id"],
+            },
+        ),
+        migrations.AddField(
+            model_name="playlisttrack",
+            name="playlist",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="items",
+                to="music_api.playlist",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playlisttrack",
+            index=models.Index(
+                fields=["playlist", "position"], name="music_api_p_playlis_fcdb38_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playlisttrack",
+            index=models.Index(fields=["mbid"], name="music_api_p_mbid_9b7d9e_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="playlisttrack",
+            constraint=models.UniqueConstraint(
+                fields=("playlist", "artist_key", "name_key"),
+                name="unique_playlist_track_key",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="playlisttrack",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("mbid", ""), _negated=True),
+                fields=("playlist", "mbid"),
+                name="unique_playlist_track_mbid",
+            ),
+        ),
+    ]
@@ -0,0 +1,94 @@
+import unicodedata
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def normalize_text(value):
+    # Копия normalization.normalize_text на момент миграции: ключи в базе не
+    # должны зависеть от того, как сервис нормализует текст сейчас.
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", " ".join(str(value).split()))
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+
+def _track_fields(item):
+    if not isinstance(item, dict):
+        return None
+    name = str(item.get("name") or "").strip()
+    artist_raw = item.get("artist") or ""
+    if isinstance(artist_raw, dict):
+        artist_raw = artist_raw.get("name") or ""
+    artist = str(artist_raw).strip()
+    if not name or not artist:
+        return None
+    return {
+        "name": name[:255],
+        "artist": artist[:255],
+        "name_key": normalize_text(name)[:255],
+        "artist_key": normalize_text(artist)[:255],
+        "mbid": str(item.get("mbid") or "").strip()[:64],
+    }
+
+
+def copy_tracks_to_rows(apps, schema_editor):
+    Playlist = apps.get_model("music_api", "Playlist")
+    PlaylistTrack = apps.get_model("music_api", "PlaylistTrack")
+
+    pending = []
+    for playlist in Playlist.objects.only("id", "tracks").iterator():
+        tracks = playlist.tracks if isinstance(playlist.tracks, list) else []
+        seen_keys = set()
+        seen_mbids = set()
+        for item in tracks:
+            fields = _track_fields(item)
+            if fields is None:
+                continue
+            # Старые дубликаты не должны уронить миграцию на уникальности.
+            key = (fields["artist_key"], fields["name_key"])
+            if key in seen_keys or (fields["mbid"] and fields["mbid"] in seen_mbids):
+                continue
+            seen_keys.add(key)
+            if fields["mbid"]:
+                seen_mbids.add(fields["mbid"])
+            pending.append(
+                PlaylistTrack(
+                    playlist_id=playlist.id, position=len(seen_keys), **fields
+                )
+            )
+        if len(pending) >= BATCH_SIZE:
+            PlaylistTrack.objects.bulk_create(pending)
+            pending = []
+    if pending:
+        PlaylistTrack.objects.bulk_create(pending)
+
+
+def copy_rows_to_tracks(apps, schema_editor):
+    Playlist = apps.get_model("music_api", "Playlist")
+    PlaylistTrack = apps.get_model("music_api", "PlaylistTrack")
+
+    for playlist in Playlist.objects.only("id").iterator():
+        tracks = []
+        for item in PlaylistTrack.objects.filter(playlist_id=playlist.id).order_by(
+            "position", "id"
+        ):
+            stored = {"name": item.name, "artist": item.artist}
+            if item.mbid:
+                stored["mbid"] = item.mbid
+            tracks.append(stored)
+        Playlist.objects.filter(id=playlist.id).update(tracks=tracks)
+    # Иначе повторный прямой проход упрётся в уникальность тех же строк.
+    PlaylistTrack.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_api", "0014_playlisttrack"),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_tracks_to_rows, copy_rows_to_tracks),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_api", "0015_copy_playlist_tracks"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="playlist",
+            name="tracks",
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_api", "0016_remove_playlist_tracks"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="playlisttrack",
+            index=models.Index(
+                fields=["artist_key", "name_key"], name="music_api_p_artist__43ef26_idx"
+            ),
+        ),
+    ]
@@ -7,7 +7,6 @@ class Playlist(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="playlists"
     )
     title = models.CharField(max_length=255, default="Favorites")
-    tracks = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -19,6 +18,58 @@ class Playlist(models.Model):
     def __str__(self):
         return f"{self.user_id}:{self.title}"
 
+    def track_dicts(self):
+        """Треки в порядке добавления, в прежнем формате {name, artist, mbid}."""
+        return [item.as_dict() for item in self.items.all()]
+
+
+class PlaylistTrack(models.Model):
+    """Трек плейлиста.
+
+    Дубликаты отсекает база: уникальны нормализованная пара (artist, name) и
+    непустой mbid в пределах плейлиста. Ключи считает ``normalize_text``.
+    """
+
+    playlist = models.ForeignKey(
+        Playlist, on_delete=models.CASCADE, related_name="items"
+    )
+    position = models.PositiveIntegerField(default=0)
+    name = models.CharField(max_length=255)
+    artist = models.CharField(max_length=255)
+    name_key = models.CharField(max_length=255)
+    artist_key = models.CharField(max_length=255)
+    mbid = models.CharField(max_length=64, blank=True, default="")
+    added_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["position", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["playlist", "artist_key", "name_key"],
+                name="unique_playlist_track_key",
+            ),
+            models.UniqueConstraint(
+                fields=["playlist", "mbid"],
+                condition=~models.Q(mbid=""),
+                name="unique_playlist_track_mbid",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["playlist", "position"]),
+            # Обратный индекс: трек -> плейлисты (services/track_playlists.py).
+            models.Index(fields=["artist_key", "name_key"]),
+            models.Index(fields=["mbid"]),
+        ]
+
+    def __str__(self):
+        return f"{self.playlist_id}:{self.position} {self.artist} — {self.name}"
+
+    def as_dict(self):
+        stored = {"name": self.name, "artist": self.artist}
+        if self.mbid:
+            stored["mbid"] = self.mbid
+        return stored
+
 
 class PlaylistLike(models.Model):
     playlist = models.ForeignKey(
@@ -138,3 +189,61 @@ class PlaylistCommentLike(models.Model):
 
     def __str__(self):
         return f"{self.user_id}->{self.comment_id}"
+
+
+class TrackMetadata(models.Model):
+    """Результаты провайдеров по треку, переживающие вытеснение из Redis.
+
+    Ключ — нормализованная пара (artist, name); mbid хранится для поиска по
+    нему. У каждого провайдера своё значение и время получения.
+    """
+
+    name = models.CharField(max_length=255)
+    artist = models.CharField(max_length=255)
+    name_key = models.CharField(max_length=255)
+    artist_key = models.CharField(max_length=255)
+    mbid = models.CharField(max_length=64, blank=True, default="")
+    itunes = models.JSONField(null=True, blank=True)
+    itunes_fetched_at = models.DateTimeField(null=True, blank=True)
+    deezer = models.JSONField(null=True, blank=True)
+    deezer_fetched_at = models.DateTimeField(null=True, blank=True)
+    lastfm = models.JSONField(null=True, blank=True)
+    lastfm_fetched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["artist_key", "name_key"], name="unique_track_metadata_key"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["mbid"]),
+        ]
+
+    def __str__(self):
+        return f"{self.artist} — {self.name}"
+
+
+class ArtistMetadata(models.Model):
+    """Фото (TheAudioDB), топ-альбомы (Last.fm) и bio (Wikipedia) артиста.
+
+    Ключ — ``normalize_artist_name`` от имени; mbid хранится для поиска по
+    нему. ``bios`` — {lang: summary}, время получения внутри summary.
+    """
+
+    name = models.CharField(max_length=255)
+    name_key = models.CharField(max_length=255, unique=True)
+    mbid = models.CharField(max_length=64, blank=True, default="")
+    photo_url = models.CharField(max_length=500, blank=True, default="")
+    photo_fetched_at = models.DateTimeField(null=True, blank=True)
+    releases = models.JSONField(default=list, blank=True)
+    releases_fetched_at = models.DateTimeField(null=True, blank=True)
+    bios = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["mbid"]),
+        ]
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,69 @@
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# datetime/date/time уходят в JSONEncoder DRF: формат (миллисекунды, "Z")
+# остаётся прежним. Decimal, lazy-строки и прочее — туда же.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_encoder = JSONEncoder()
+
+
+def dumps(data, option=0) -> bytes:
+    """JSON через orjson; типы, которых он не знает, — через JSONEncoder DRF."""
+    ret = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS | option)
+    # Как JSONRenderer: U+2028/U+2029 экранируются, чтобы JSON оставался
+    # подмножеством JavaScript.
+    if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+        ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+    return ret
+
+
+def ndjson_line(data) -> bytes:
+    return dumps(data, orjson.OPT_APPEND_NEWLINE)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson; вывод совпадает с компактным JSON DRF."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None:
+            # orjson умеет только отступ в 2 пробела (browsable API просит 4).
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON.
+
+    Потоковые ответы view пишут строки сами через ``ndjson_line``; рендерер
+    нужен для content negotiation и обычных ответов (ошибок) — одной строкой.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return ndjson_line(data)
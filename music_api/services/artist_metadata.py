@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Iterable
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import ArtistMetadata
+from .normalization import normalize_artist_name
+
+logger = logging.getLogger(__name__)
+
+# Поля, которые обновляются отдельно: значение и время получения.
+FIELDS = {
+    "photo": ("photo_url", "photo_fetched_at"),
+    "releases": ("releases", "releases_fetched_at"),
+}
+MAX_AGE = {
+    "photo": timedelta(days=30),
+    "releases": timedelta(days=3),
+    "bio": timedelta(days=30),
+}
+# Пустой ответ (не нашли или ошибка провайдера) перепроверяем чаще.
+EMPTY_MAX_AGE = timedelta(hours=1)
+
+# Сколько устаревших артистов обновлять за один запрос трендов; остальные
+# отдаются из таблицы и дойдут до обновления в следующих запросах.
+REFRESH_PER_REQUEST = 10
+
+
+def name_key(name: Any) -> str:
+    return normalize_artist_name(name)[:255]
+
+
+def _as_item(artist: Any) -> dict:
+    if isinstance(artist, dict):
+        return {
+            "name": str(artist.get("name") or "").strip(),
+            "mbid": str(artist.get("mbid") or "").strip(),
+        }
+    return {"name": str(artist or "").strip(), "mbid": ""}
+
+
+@sync_to_async
+def _select_rows(mbids, keys):
+    query = Q(name_key__in=keys)
+    if mbids:
+        query |= Q(mbid__in=mbids)
+    return list(ArtistMetadata.objects.filter(query).values())
+
+
+async def load(artists: Iterable[Any]) -> dict[str, dict]:
+    """Строки ArtistMetadata одним запросом: {имя из запроса: row}."""
+    items = [item for item in map(_as_item, artists) if item["name"]]
+    if not items:
+        return {}
+    mbids = sorted({item["mbid"] for item in items} - {""})
+    keys = sorted({name_key(item["name"]) for item in items})
+    try:
+        rows = await _select_rows(mbids, keys)
+    except Exception as exc:
+        logger.warning("Artist metadata read failed: %s", exc)
+        return {}
+
+    by_mbid = {row["mbid"]: row for row in rows if row["mbid"]}
+    by_key = {row["name_key"]: row for row in rows}
+    found = {}
+    for item in items:
+        row = by_mbid.get(item["mbid"]) or by_key.get(name_key(item["name"]))
+        if row is not None:
+            found[item["name"]] = row
+    return found
+
+
+def _age(row: dict | None, field: str, now) -> timedelta | None:
+    if row is None:
+        return None
+    fetched_at = row.get(FIELDS[field][1])
+    if fetched_at is None:
+        return None
+    return now - fetched_at
+
+
+def stored_value(row: dict | None, field: str) -> Any:
+    """Значение из таблицы независимо от возраста (None — ещё не получали)."""
+    if row is None or row.get(FIELDS[field][1]) is None:
+        return None
+    return row.get(FIELDS[field][0])
+
+
+def is_fresh(row: dict | None, field: str, now=None) -> bool:
+    age = _age(row, field, now or timezone.now())
+    if age is None:
+        return False
+    max_age = MAX_AGE[field] if stored_value(row, field) else EMPTY_MAX_AGE
+    return age <= max_age
+
+
+def due_for_refresh(artists, rows, field, limit=REFRESH_PER_REQUEST):
+    """Артисты, которых нужно запросить у провайдера.
+
+    Без строки в таблице — всегда (показать нечего), устаревшие — не больше
+    ``limit`` самых старых за раз.
+    """
+    now = timezone.now()
+    missing, stale = [], []
+    for artist in artists:
+        row = rows.get(_as_item(artist)["name"])
+        if stored_value(row, field) is None:
+            missing.append(artist)
+        elif not is_fresh(row, field, now):
+            stale.append(artist)
+    stale.sort(
+        key=lambda artist: _age(rows.get(_as_item(artist)["name"]), field, now),
+        reverse=True,
+    )
+    return missing + stale[:limit]
+
+
+@sync_to_async
+def _upsert(objs, update_fields):
+    ArtistMetadata.objects.bulk_create(
+        objs,
+        update_conflicts=True,
+        unique_fields=["name_key"],
+        update_fields=update_fields,
+    )
+
+
+async def save(field: str, values: Iterable[tuple[Any, Any]]) -> None:
+    """Bulk upsert одного поля: [(artist, value)] — artist это dict или имя."""
+    value_field, fetched_field = FIELDS[field]
+    now = timezone.now()
+    objs = {}
+    for artist, value in values:
+        item = _as_item(artist)
+        if not item["name"]:
+            continue
+        key = name_key(item["name"])
+        objs[key] = ArtistMetadata(
+            name=item["name"][:255],
+            name_key=key,
+            mbid=item["mbid"][:64],
+            **{value_field: value, fetched_field: now},
+        )
+    if not objs:
+        return
+    try:
+        await _upsert(list(objs.values()), [value_field, fetched_field])
+    except Exception as exc:
+        logger.warning("Artist metadata write failed for %s: %s", field, exc)
+
+
+def stored_bio(row: dict | None, lang: str) -> dict | None:
+    entry = ((row or {}).get("bios") or {}).get(lang)
+    return entry if isinstance(entry, dict) else None
+
+
+def fresh_bio(row: dict | None, lang: str) -> dict | None:
+    entry = stored_bio(row, lang)
+    if entry is None:
+        return None
+    max_age = MAX_AGE["bio"] if entry.get("bio") else EMPTY_MAX_AGE
+    if time.time() - float(entry.get("fetched_at", 0)) > max_age.total_seconds():
+        return None
+    return {key: value for key, value in entry.items() if key != "fetched_at"}
+
+
+@sync_to_async
+def _merge_bios(lang: str, entries: dict[str, tuple[str, dict]]) -> None:
+    # Строки, которых ещё нет, создаём пустыми, чтобы дальше было что
+    # блокировать; bios читаем заново под блокировкой, а не из запроса.
+    ArtistMetadata.objects.bulk_create(
+        [
+            ArtistMetadata(name=name[:255], name_key=key)
+            for key, (name, _) in entries.items()
+        ],
+        ignore_conflicts=True,
+    )
+    with transaction.atomic():
+        locked = list(
+            ArtistMetadata.objects.select_for_update()
+            .filter(name_key__in=entries)
+            .order_by("name_key")
+        )
+        for row in locked:
+            row.bios = {**(row.bios or {}), lang: entries[row.name_key][1]}
+        ArtistMetadata.objects.bulk_update(locked, ["bios"])
+
+
+async def save_bios(lang: str, summaries: dict[str, dict]) -> None:
+    """Дописывает bio на языке ``lang``, не трогая остальные языки.
+
+    Слияние идёт со свежей строкой под ``select_for_update``, поэтому
+    параллельные запросы на разных языках не затирают друг друга.
+    """
+    now = time.time()
+    entries = {}
+    for name, summary in summaries.items():
+        key = name_key(name)
+        if not key:
+            continue
+        entries[key] = (name, {**summary, "fetched_at": now})
+    if not entries:
+        return
+    try:
+        await _merge_bios(lang, entries)
+    except Exception as exc:
+        logger.warning("Artist metadata write failed for bios: %s", exc)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Iterable
+
+from asgiref.sync import sync_to_async
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .cache_metrics import key_prefix
+from .local_cache import get_invalidator, get_local_cache, uses_redis
+from .metrics import CACHE_L1_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# Бэкенды без сетевого ввода-вывода: вызывать их синхронно дешевле,
+# чем переключаться в пул потоков.
+IN_PROCESS_BACKENDS = (LocMemCache, DummyCache)
+
+
+class AsyncCache:
+    """Неблокирующий фасад над Django cache для корутин.
+
+    Для Redis операции выполняются через ``aget``/``aset`` и т.п. (вне event
+    loop), ``get_many``/``set_many`` уходят одним MGET/pipeline. LocMemCache
+    вызывается напрямую, как раньше.
+
+    Горячие ключи Redis (см. ``local_cache``) сначала ищутся в L1 воркера;
+    их запись и удаление рассылают сброс копий остальным воркерам.
+    """
+
+    def __init__(self, alias: str = DEFAULT_CACHE_ALIAS):
+        self.alias = alias
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def is_in_process(self) -> bool:
+        return isinstance(self.backend, IN_PROCESS_BACKENDS)
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        backend = self.backend
+        if isinstance(backend, IN_PROCESS_BACKENDS):
+            return backend.get(key, default)
+        if self._l1_for(backend, key):
+            return (await self._get_many_l1(backend, [key])).get(key, default)
+        return await backend.aget(key, default)
+
+    async def set(self, key: str, value: Any, timeout: Any = None) -> None:
+        backend = self.backend
+        if isinstance(backend, IN_PROCESS_BACKENDS):
+            backend.set(key, value, timeout=timeout)
+            return
+        await backend.aset(key, value, timeout=timeout)
+        if self._l1_for(backend, key):
+            get_local_cache().set(key, value, timeout)
+            await self._invalidate_others([key])
+
+    async def add(self, key: str, value: Any, timeout: Any = None) -> bool:
+        backend = self.backend
+        if isinstance(backend, IN_PROCESS_BACKENDS):
+            return backend.add(key, value, timeout=timeout)
+        return await backend.aadd(key, value, timeout=timeout)
+
+    async def delete(self, key: str) -> None:
+        backend = self.backend
+        if isinstance(backend, IN_PROCESS_BACKENDS):
+            backend.delete(key)
+            return
+        await backend.adelete(key)
+        if self._l1_for(backend, key):
+            get_local_cache().discard([key])
+            await self._invalidate_others([key])
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        backend = self.backend
+        if isinstance(backend, IN_PROCESS_BACKENDS):
+            return backend.get_many(keys)
+        hot = [key for key in keys if self._l1_for(backend, key)]
+        if not hot:
+            return await backend.aget_many(keys)
+        found = await self._get_many_l1(backend, hot)
+        rest = [key for key in keys if key not in hot]
+        if rest:
+            found.update(await backend.aget_many(rest))
+        return found
+
+    async def set_many(self, data: dict[str, Any], timeout: Any = None) -> None:
+        if not data:
+            return
+        backend = self.backend
+        if isinstance(backend, IN_PROCESS_BACKENDS):
+            backend.set_many(data, timeout=timeout)
+            return
+        await backend.aset_many(data, timeout=timeout)
+        hot = {key: value for key, value in data.items() if self._l1_for(backend, key)}
+        if hot:
+            get_local_cache().set_many(hot, timeout)
+            await self._invalidate_others(list(hot))
+
+    def _l1_for(self, backend, key: str) -> bool:
+        return (
+            self.alias == DEFAULT_CACHE_ALIAS
+            and uses_redis(backend)
+            and get_local_cache().handles(key)
+        )
+
+    async def _get_many_l1(self, backend, keys: list[str]) -> dict[str, Any]:
+        local = get_local_cache()
+        get_invalidator().start()
+        found = local.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        _count_l1(found, "hit")
+        if not missing:
+            return found
+        try:
+            fetched = await sync_to_async(_strict_get_many, thread_sensitive=False)(
+                backend, missing
+            )
+        except Exception as exc:
+            # IGNORE_EXCEPTIONS превратил бы каждое попадание в запрос к
+            # провайдеру; пока Redis лежит, отдаём истёкшие копии из L1.
+            stale = local.get_many(missing, allow_stale=True)
+            if not stale and not getattr(backend, "_ignore_exceptions", False):
+                raise
+            logger.warning(
+                "Redis unavailable, %d/%d keys from stale L1: %s",
+                len(stale),
+                len(missing),
+                exc,
+            )
+            _count_l1(stale, "stale")
+            found.update(stale)
+            return found
+        _count_l1(missing, "miss")
+        local.set_many(fetched)
+        found.update(fetched)
+        return found
+
+    async def _invalidate_others(self, keys: list[str]) -> None:
+        await sync_to_async(get_invalidator().publish, thread_sensitive=False)(keys)
+
+
+def _count_l1(keys: Iterable[str], result: str) -> None:
+    for key in keys:
+        CACHE_L1_REQUESTS.labels(prefix=key_prefix(key), result=result).inc()
+
+
+def _strict_get_many(backend, keys: list[str]) -> dict[str, Any]:
+    # RedisCache.get_many с IGNORE_EXCEPTIONS отдаёт {} при обрыве связи;
+    # клиент под ним поднимает ConnectionInterrupted.
+    return backend.client.get_many(keys)
+
+
+async_cache = AsyncCache()
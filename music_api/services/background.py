@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+from django.db import close_old_connections
+
+from .http_clients import close_http_clients
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 2
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=MAX_WORKERS, thread_name_prefix="rubysound-background"
+        )
+    return _executor
+
+
+async def _run_and_cleanup(job: Callable[[], Awaitable[Any]]) -> Any:
+    try:
+        return await job()
+    finally:
+        # Клиенты привязаны к loop этого потока, и он сейчас закроется.
+        await close_http_clients()
+
+
+def _run_job(name: str, job: Callable[[], Awaitable[Any]]) -> Any:
+    close_old_connections()
+    try:
+        return asyncio.run(_run_and_cleanup(job))
+    except Exception:
+        logger.exception("Background job %s failed", name)
+        return None
+    finally:
+        close_old_connections()
+
+
+def run_in_background(name: str, job: Callable[[], Awaitable[Any]]) -> Future:
+    """Выполнить корутину вне запроса, в отдельном потоке со своим event loop.
+
+    Ответ пользователю не ждёт результата; ошибки только логируются.
+    """
+    return _get_executor().submit(_run_job, name, job)
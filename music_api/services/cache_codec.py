@@ -0,0 +1,120 @@
+"""Сериализатор и компрессор значений Redis-кэша (django-redis).
+
+Значения в формате JSON (списки треков, SWR-конверты, presence, throttling)
+кодируются orjson, такие же структуры с bytes (аудио, готовые ответы) —
+msgpack, всё остальное — pickle, как раньше. Кортежи, как и в JSON,
+читаются списками. Сжимается только то, что длиннее порога: обычные
+значения — zlib (JSON от него меньше, чем прежний pickle + zlib), большие
+(аудио) — быстрым lz4.
+
+Каждое значение начинается с префикса формата. Записи без префикса
+(pickle + zlib до перехода) по-прежнему читаются, поэтому переход не требует
+сброса кэша, а следующий формат получит свой префикс.
+"""
+
+from __future__ import annotations
+
+import pickle
+import zlib
+from typing import Any
+
+import lz4.frame
+import msgpack
+import orjson
+from django_redis.compressors.base import BaseCompressor
+from django_redis.exceptions import CompressorError
+from django_redis.serializers.base import BaseSerializer
+
+JSON_PREFIX = b"j1:"
+MSGPACK_PREFIX = b"m1:"
+PICKLE_PREFIX = b"p1:"
+LZ4_PREFIX = b"z1:"
+ZLIB_PREFIX = b"d1:"
+
+COMPRESS_MIN_BYTES = 1024
+# JSON-списки треков lz4 сжимает в 1,5 раза хуже zlib, и память Redis росла
+# по сравнению с pickle + zlib; распаковка zlib на таких размерах — единицы
+# микросекунд. Начиная с LZ4_MIN_BYTES (аудио) важнее скорость, там lz4.
+COMPRESS_LEVEL = 6
+LZ4_MIN_BYTES = 256 * 1024
+
+# datetime, dataclass и подклассы dict/list/str не превращаются молча в
+# JSON-типы, а уходят в default и дальше в msgpack/pickle.
+JSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_SUBCLASS
+)
+
+
+def _not_plain(value: Any) -> Any:
+    # Тип, который JSON/msgpack не передают без потерь, кодирует следующий
+    # формат: get должен вернуть ровно тот тип, что был записан.
+    raise TypeError(f"{type(value).__name__} is not a plain value")
+
+
+class CacheSerializer(BaseSerializer):
+    def __init__(self, options):
+        super().__init__(options=options)
+        self._pickle_version = int(
+            options.get("PICKLE_VERSION", pickle.DEFAULT_PROTOCOL)
+        )
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return JSON_PREFIX + orjson.dumps(
+                value, default=_not_plain, option=JSON_OPTIONS
+            )
+        except TypeError:
+            pass
+        try:
+            packed = msgpack.packb(
+                value, use_bin_type=True, strict_types=True, default=_not_plain
+            )
+        except (TypeError, ValueError, OverflowError):
+            return PICKLE_PREFIX + pickle.dumps(value, self._pickle_version)
+        return MSGPACK_PREFIX + packed
+
+    def loads(self, value: bytes) -> Any:
+        if value.startswith(JSON_PREFIX):
+            return orjson.loads(memoryview(value)[len(JSON_PREFIX) :])
+        if value.startswith(MSGPACK_PREFIX):
+            return msgpack.unpackb(
+                memoryview(value)[len(MSGPACK_PREFIX) :],
+                raw=False,
+                strict_map_key=False,
+            )
+        if value.startswith(PICKLE_PREFIX):
+            return pickle.loads(memoryview(value)[len(PICKLE_PREFIX) :])
+        # Запись старого формата (PickleSerializer).
+        return pickle.loads(value)
+
+
+class CacheCompressor(BaseCompressor):
+    def __init__(self, options):
+        super().__init__(options)
+        self.min_length = int(options.get("COMPRESS_MIN_BYTES", COMPRESS_MIN_BYTES))
+        self.level = int(options.get("COMPRESS_LEVEL", COMPRESS_LEVEL))
+
+    def compress(self, value: bytes) -> bytes:
+        if len(value) < self.min_length:
+            return value
+        if len(value) < LZ4_MIN_BYTES:
+            compressed = ZLIB_PREFIX + zlib.compress(value, self.level)
+        else:
+            compressed = LZ4_PREFIX + lz4.frame.compress(value)
+        # Уже сжатые данные (аудио, картинки) храним как есть.
+        return compressed if len(compressed) < len(value) else value
+
+    def decompress(self, value: bytes) -> bytes:
+        if value.startswith(ZLIB_PREFIX):
+            return zlib.decompress(memoryview(value)[len(ZLIB_PREFIX) :])
+        if value.startswith(LZ4_PREFIX):
+            return lz4.frame.decompress(memoryview(value)[len(LZ4_PREFIX) :])
+        if value.startswith((JSON_PREFIX, MSGPACK_PREFIX, PICKLE_PREFIX)):
+            raise CompressorError("value is not compressed")
+        # Запись старого формата (ZlibCompressor).
+        try:
+            return zlib.decompress(value)
+        except zlib.error as exc:
+            raise CompressorError from exc
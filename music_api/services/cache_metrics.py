@@ -0,0 +1,120 @@
+"""Метрики Redis-кэша по префиксу ключа (CLIENT_CLASS для django-redis).
+
+Префикс — первый сегмент ключа до двоеточия (``itunes``, ``tracks_chart``,
+``prepared``, ``audio_proxy``...). Ключи без такого сегмента (throttling DRF,
+presence) сводятся к короткому имени или ``other``, чтобы число меток
+оставалось ограниченным.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Any
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.client import DefaultClient
+
+from .metrics import (
+    CACHE_OPERATION_SECONDS,
+    CACHE_REQUESTS,
+    CACHE_SETS,
+    CACHE_VALUE_BYTES,
+)
+
+_PREFIX_RE = re.compile(r"[a-z][a-z0-9_]{0,39}")
+_UNDERSCORE_PREFIXES = ("throttle", "ws_presence")
+_MISSING = object()
+
+
+def key_prefix(key: Any) -> str:
+    head, sep, _ = str(key).partition(":")
+    if sep and _PREFIX_RE.fullmatch(head):
+        return head
+    for prefix in _UNDERSCORE_PREFIXES:
+        if head.startswith(f"{prefix}_"):
+            return prefix
+    return "other"
+
+
+class InstrumentedClient(DefaultClient):
+    """DefaultClient, который считает попадания, записи, размер и задержку."""
+
+    def __init__(self, server, params, backend):
+        super().__init__(server, params, backend)
+        # encode() не знает ключа: префикс текущей записи передаёт set().
+        self._writing = threading.local()
+
+    def get(self, key, default=None, version=None, client=None):
+        prefix = key_prefix(key)
+        started = time.perf_counter()
+        try:
+            value = super().get(key, default=_MISSING, version=version, client=client)
+        finally:
+            CACHE_OPERATION_SECONDS.labels(prefix=prefix, operation="get").observe(
+                time.perf_counter() - started
+            )
+        hit = value is not _MISSING
+        CACHE_REQUESTS.labels(prefix=prefix, result="hit" if hit else "miss").inc()
+        return value if hit else default
+
+    def get_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        started = time.perf_counter()
+        try:
+            found = super().get_many(keys, version=version, client=client)
+        finally:
+            if keys:
+                CACHE_OPERATION_SECONDS.labels(
+                    prefix=key_prefix(keys[0]), operation="get_many"
+                ).observe(time.perf_counter() - started)
+        for key in keys:
+            CACHE_REQUESTS.labels(
+                prefix=key_prefix(key), result="hit" if key in found else "miss"
+            ).inc()
+        return found
+
+    def set(
+        self,
+        key,
+        value,
+        timeout=DEFAULT_TIMEOUT,
+        version=None,
+        client=None,
+        nx=False,
+        xx=False,
+    ):
+        prefix = key_prefix(key)
+        # Внутри set_many client — pipeline: задержку считает сам set_many.
+        timed = client is None
+        started = time.perf_counter()
+        self._writing.prefix = prefix
+        try:
+            return super().set(
+                key, value, timeout, version=version, client=client, nx=nx, xx=xx
+            )
+        finally:
+            self._writing.prefix = None
+            CACHE_SETS.labels(prefix=prefix).inc()
+            if timed:
+                CACHE_OPERATION_SECONDS.labels(prefix=prefix, operation="set").observe(
+                    time.perf_counter() - started
+                )
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        started = time.perf_counter()
+        try:
+            return super().set_many(data, timeout, version=version, client=client)
+        finally:
+            if data:
+                CACHE_OPERATION_SECONDS.labels(
+                    prefix=key_prefix(next(iter(data))), operation="set_many"
+                ).observe(time.perf_counter() - started)
+
+    def encode(self, value):
+        encoded = super().encode(value)
+        prefix = getattr(self._writing, "prefix", None)
+        if prefix is not None and isinstance(encoded, bytes):
+            CACHE_VALUE_BYTES.labels(prefix=prefix).observe(len(encoded))
+        return encoded
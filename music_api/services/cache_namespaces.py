@@ -0,0 +1,124 @@
+"""Поколения пространств имён кэша.
+
+Ключ строится как ``<namespace>:g<generation>:...``, номер поколения лежит в
+кэше под ``cache_ns:<namespace>``. Увеличить его — значит за O(1) сбросить
+все ключи пространства (и производные ``prepared:``/``stale:``): старые
+просто перестают читаться и истекают по своему TTL.
+
+Поколение впервые создаётся из текущего времени в микросекундах, поэтому
+потерянный счётчик (рестарт Redis, вытеснение) не вернёт к жизни старые ключи.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from django.core.cache import cache
+
+from .async_cache import async_cache
+from .local_cache import invalidate
+
+logger = logging.getLogger(__name__)
+
+GENERATION_PREFIX = "cache_ns"
+
+# Пространство имён -> что в нём лежит (для админки и manage.py).
+NAMESPACES = {
+    "tracks_chart": "Чарт треков за год по жанру",
+    "apple_chart": "Чарт Apple Music",
+    "trending_artists_full": "Тренды артистов с релизами",
+    "search_raw": "Сырые результаты поиска Last.fm",
+    "search_enriched": "Страницы поиска с обложками и превью",
+    "artist_search": "Поиск артистов",
+    "itunes": "Обложки и превью iTunes",
+    "deezer": "Обложки и превью Deezer",
+    "lastfm_track_info": "Слушатели и прослушивания треков Last.fm",
+    "lastfm_releases": "Релизы артистов Last.fm",
+    "theaudiodb_artist_image": "Фото артистов TheAudioDB",
+    "wikipedia_artist_bio": "Биографии артистов из Wikipedia",
+}
+
+
+def generation_key(namespace: str) -> str:
+    if namespace not in NAMESPACES:
+        raise KeyError(f"Unknown cache namespace: {namespace}")
+    return f"{GENERATION_PREFIX}:{namespace}"
+
+
+def _initial_generation() -> int:
+    return time.time_ns() // 1000
+
+
+def _format(namespace: str, generation: int, parts) -> str:
+    return ":".join([f"{namespace}:g{generation}", *(str(part) for part in parts)])
+
+
+# Поколения на случай недоступного кэша: одно на пространство и процесс.
+_fallback_generations: dict[str, int] = {}
+
+
+def _fallback_generation(namespace: str) -> int:
+    """Ключ всё равно строится: с IGNORE_EXCEPTIONS get() при отказе Redis
+    вернёт None, а add() ничего не запишет."""
+    if namespace not in _fallback_generations:
+        logger.warning("Cache generation for %s unavailable, using local", namespace)
+        _fallback_generations[namespace] = _initial_generation()
+    return _fallback_generations[namespace]
+
+
+def generation(namespace: str) -> int:
+    key = generation_key(namespace)
+    try:
+        value = cache.get(key)
+        if value is None:
+            cache.add(key, _initial_generation(), timeout=None)
+            value = cache.get(key)
+    except Exception:
+        logger.warning("Failed to read cache generation", exc_info=True)
+        value = None
+    if value is None:
+        return _fallback_generation(namespace)
+    return int(value)
+
+
+async def ageneration(namespace: str) -> int:
+    key = generation_key(namespace)
+    try:
+        value = await async_cache.get(key)
+        if value is None:
+            # Первым может успеть другой воркер — читаем то, что победило.
+            await async_cache.add(key, _initial_generation(), timeout=None)
+            value = await async_cache.get(key)
+    except Exception:
+        logger.warning("Failed to read cache generation", exc_info=True)
+        value = None
+    if value is None:
+        return _fallback_generation(namespace)
+    return int(value)
+
+
+def key(namespace: str, *parts) -> str:
+    return _format(namespace, generation(namespace), parts)
+
+
+async def akey(namespace: str, *parts) -> str:
+    """Ключ текущего поколения: ``akey("tracks_chart", "all", 15)``."""
+    return _format(namespace, await ageneration(namespace), parts)
+
+
+def bump(namespace: str) -> int:
+    """Сбросить пространство имён; возвращает новое поколение."""
+    key = generation_key(namespace)
+    try:
+        value = cache.incr(key)
+    except ValueError:
+        # Счётчика нет: новое время всё равно больше любого прежнего поколения.
+        value = _initial_generation()
+        cache.set(key, value, timeout=None)
+    invalidate([key])
+    return int(value)
+
+
+def generations() -> dict[str, int]:
+    return {namespace: generation(namespace) for namespace in NAMESPACES}
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from django.conf import settings
+
+from .errors import UpstreamUnavailable
+from .metrics import UPSTREAM_CIRCUIT_STATE
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+STATE_GAUGE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(UpstreamUnavailable):
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(
+            provider, f"{provider} circuit is open, retry in {retry_in:.1f}s"
+        )
+        self.retry_in = retry_in
+
+
+@dataclass(frozen=True)
+class BreakerConfig:
+    failure_threshold: int = 5  # подряд неудачных (или медленных) запросов
+    slow_call_seconds: float = 3.0
+    open_seconds: float = 30.0
+    half_open_max_calls: int = 1
+
+
+DEFAULT_BREAKER_CONFIGS = {
+    "wikipedia": BreakerConfig(slow_call_seconds=4.0),
+    "apple_rss": BreakerConfig(failure_threshold=3, open_seconds=60.0),
+}
+
+
+def get_breaker_config(provider: str) -> BreakerConfig:
+    config = DEFAULT_BREAKER_CONFIGS.get(provider, BreakerConfig())
+    overrides = getattr(settings, "UPSTREAM_CIRCUIT_BREAKERS", {}).get(provider) or {}
+    return replace(config, **overrides) if overrides else config
+
+
+class CircuitBreaker:
+    """Breaker одного провайдера в пределах процесса.
+
+    closed -> open после ``failure_threshold`` неудач подряд; через
+    ``open_seconds`` пропускает ``half_open_max_calls`` пробных запросов:
+    удачная проба закрывает breaker, неудачная снова открывает.
+    """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def config(self) -> BreakerConfig:
+        return get_breaker_config(self.provider)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.config.open_seconds:
+            self._set_state(HALF_OPEN)
+            self._probes = 0
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            logger.warning(
+                "Circuit breaker %s: %s -> %s", self.provider, self._state, state
+            )
+        self._state = state
+        UPSTREAM_CIRCUIT_STATE.labels(provider=self.provider).set(
+            STATE_GAUGE_VALUES[state]
+        )
+
+    def _open(self, now: float) -> None:
+        self._set_state(OPEN)
+        self._opened_at = now
+        self._probes = 0
+
+    def before_call(self) -> None:
+        """Пропустить запрос или сразу отказать ``CircuitOpenError``."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == CLOSED:
+                return
+            config = self.config
+            if state == HALF_OPEN and self._probes < config.half_open_max_calls:
+                self._probes += 1
+                return
+            retry_in = max(0.0, self._opened_at + config.open_seconds - now)
+            raise CircuitOpenError(self.provider, retry_in)
+
+    def release(self) -> None:
+        """Запрос так и не ушёл (отмена, rate limit) — вернуть слот пробы."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record_success(self, elapsed: float) -> None:
+        if elapsed > self.config.slow_call_seconds:
+            self.record_failure()
+            return
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._failures += 1
+            if self._state == HALF_OPEN:
+                self._open(now)
+            elif (
+                self._state == CLOSED
+                and self._failures >= self.config.failure_threshold
+            ):
+                self._open(now)
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(provider, CircuitBreaker(provider))
+    return breaker
+
+
+def breaker_states(providers) -> dict[str, str]:
+    return {provider: get_breaker(provider).state for provider in providers}
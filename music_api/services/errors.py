@@ -0,0 +1,10 @@
+class UpstreamUnavailable(Exception):
+    """Запрос к провайдеру не отправлялся: его отклонил rate limiter или breaker.
+
+    Такой отказ не говорит ничего о самих данных, поэтому пустой результат
+    по нему не кэшируется.
+    """
+
+    def __init__(self, provider: str, message: str):
+        super().__init__(message)
+        self.provider = provider
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import time
+from dataclasses import dataclass, replace
+
+import httpx
+from django.conf import settings
+
+from .circuit_breaker import get_breaker
+from .metrics import UPSTREAM_CONNECTIONS
+from .rate_limit import acquire, get_rate_limit
+from .upstream_metrics import RequestMetrics
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "RubySound.fm/1.0 (musicPlatform_api_django; contact: admin@rubysound.fm)"
+
+PROVIDERS = (
+    "lastfm",
+    "itunes",
+    "deezer",
+    "theaudiodb",
+    "wikipedia",
+    "apple_rss",
+)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    max_connections: int = 20
+    max_keepalive_connections: int = 5
+    keepalive_expiry: float = 30.0
+    timeout: float = 7.0
+    connect_timeout: float = 2.0
+
+
+# Отдельный пул на каждого провайдера = лимиты соединений на конкретный хост.
+DEFAULT_POOL_CONFIGS = {
+    "lastfm": PoolConfig(max_connections=20, max_keepalive_connections=10),
+    "itunes": PoolConfig(max_connections=10, max_keepalive_connections=5),
+    "deezer": PoolConfig(max_connections=20, max_keepalive_connections=10),
+    "theaudiodb": PoolConfig(max_connections=10, max_keepalive_connections=5),
+    "wikipedia": PoolConfig(max_connections=10, max_keepalive_connections=5),
+    "apple_rss": PoolConfig(max_connections=4, max_keepalive_connections=2),
+}
+
+# loop -> {provider: client}. Клиент httpx привязан к event loop, в котором
+# открыты его соединения, поэтому пул ведётся отдельно для каждого loop.
+_clients: dict[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]] = {}
+_http2_warning_logged = False
+
+
+def get_pool_config(provider: str) -> PoolConfig:
+    config = DEFAULT_POOL_CONFIGS.get(provider, PoolConfig())
+    overrides = getattr(settings, "UPSTREAM_HTTP_POOLS", {}).get(provider) or {}
+    return replace(config, **overrides) if overrides else config
+
+
+def concurrency_cap(provider: str) -> int:
+    """Сколько запросов одного batch держать в полёте одновременно.
+
+    Темп запросов задаёт token bucket (rate_limit), это только ограничение
+    параллельности: не больше соединений пула (иначе запросы ждут слот пула
+    и упираются в его таймаут) и не больше burst (остальные всё равно ждут
+    токен в bucket).
+    """
+    return max(
+        1,
+        min(get_pool_config(provider).max_connections, get_rate_limit(provider).burst),
+    )
+
+
+def _http2_enabled() -> bool:
+    global _http2_warning_logged
+
+    if not getattr(settings, "UPSTREAM_HTTP2", False):
+        return False
+    if importlib.util.find_spec("h2") is None:
+        if not _http2_warning_logged:
+            logger.warning("UPSTREAM_HTTP2 is enabled but the h2 package is missing")
+            _http2_warning_logged = True
+        return False
+    return True
+
+
+class UpstreamTransport(httpx.AsyncBaseTransport):
+    """Транспорт провайдера: общий пул соединений, circuit breaker, rate limit,
+    учёт соединений и метрики запросов (upstream_metrics)."""
+
+    def __init__(self, provider: str, transport: httpx.AsyncBaseTransport):
+        self.provider = provider
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        opened_connection = False
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event_name, info):
+            nonlocal opened_connection
+            if event_name == "connection.connect_tcp.complete":
+                opened_connection = True
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        metrics = RequestMetrics(self.provider, request)
+        breaker = get_breaker(self.provider)
+        try:
+            breaker.before_call()
+        except BaseException as exc:
+            metrics.failed(exc)
+            raise
+        try:
+            await acquire(self.provider)
+            started = time.monotonic()
+            metrics.sent()
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError as exc:
+            breaker.record_failure()
+            metrics.failed(exc)
+            raise
+        except BaseException as exc:
+            breaker.release()
+            metrics.failed(exc)
+            raise
+
+        # 429 и 5xx — признак перегрузки провайдера, 4xx — ошибка запроса.
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success(time.monotonic() - started)
+        UPSTREAM_CONNECTIONS.labels(
+            provider=self.provider,
+            outcome="new" if opened_connection else "reused",
+        ).inc()
+        metrics.responded(response)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _build_http_client(provider: str) -> httpx.AsyncClient:
+    config = get_pool_config(provider)
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        http2=_http2_enabled(),
+    )
+    return httpx.AsyncClient(
+        transport=UpstreamTransport(provider, transport),
+        timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+        headers={"User-Agent": USER_AGENT, "Accept": "application/json"},
+    )
+
+
+def _prune_closed_loops() -> None:
+    # Клиенты закрытых loop уже нельзя закрыть через await — просто отпускаем их.
+    for loop in [loop for loop in _clients if loop.is_closed()]:
+        _clients.pop(loop, None)
+
+
+def get_http_client(provider: str) -> httpx.AsyncClient:
+    """Долгоживущий клиент провайдера для текущего event loop."""
+    loop = asyncio.get_running_loop()
+    loop_clients = _clients.get(loop)
+    if loop_clients is None:
+        _prune_closed_loops()
+        loop_clients = _clients.setdefault(loop, {})
+
+    client = loop_clients.get(provider)
+    if client is None or client.is_closed:
+        client = _build_http_client(provider)
+        loop_clients[provider] = client
+    return client
+
+
+def open_http_clients() -> None:
+    for provider in PROVIDERS:
+        get_http_client(provider)
+
+
+async def close_http_clients() -> None:
+    loop = asyncio.get_running_loop()
+    loop_clients = _clients.pop(loop, {})
+    for provider, client in loop_clients.items():
+        try:
+            await client.aclose()
+        except Exception as exc:
+            logger.warning("Failed to close %s HTTP client: %s", provider, exc)
@@ -0,0 +1,273 @@
+"""In-process L1 перед Redis для горячих ключей (чарты, тренды, готовые ответы).
+
+Копия живёт в памяти воркера не дольше TTL своего пространства имён (первый
+сегмент ключа), LRU ограничивает число записей. Запись или удаление ключа
+через ``async_cache`` рассылается по Redis pub/sub, и остальные воркеры
+сбрасывают свою копию. Если Redis недоступен, истёкшие копии ещё
+``stale_seconds`` отдаются вместо промаха.
+
+Значения общие для всех запросов воркера — менять их на месте нельзя.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import orjson
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+
+logger = logging.getLogger(__name__)
+
+# Пространство имён -> сколько секунд копия считается свежей.
+DEFAULT_TTL = {
+    "tracks_chart": 30,
+    "apple_chart": 30,
+    "trending_artists_full": 30,
+    "prepared": 30,
+    # Поколения пространств имён (cache_namespaces): сброс рассылается сразу.
+    "cache_ns": 30,
+}
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_STALE_SECONDS = 15 * 60
+
+INVALIDATION_CHANNEL = "l1_invalidate"
+POLL_SECONDS = 1.0
+RECONNECT_SECONDS = 5.0
+
+MISSING = object()
+
+
+def namespace(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+@dataclass(frozen=True)
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class LocalCache:
+    def __init__(
+        self,
+        ttl: dict[str, float] | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        stale_seconds: float = DEFAULT_STALE_SECONDS,
+    ):
+        self.ttl = dict(DEFAULT_TTL if ttl is None else ttl)
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def handles(self, key: str) -> bool:
+        return self.max_entries > 0 and namespace(key) in self.ttl
+
+    def get(self, key: str, allow_stale: bool = False) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            limit = entry.stale_until if allow_stale else entry.fresh_until
+            if now >= limit:
+                if now >= entry.stale_until:
+                    del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def get_many(
+        self, keys: Iterable[str], allow_stale: bool = False
+    ) -> dict[str, Any]:
+        found = {}
+        for key in keys:
+            value = self.get(key, allow_stale=allow_stale)
+            if value is not MISSING:
+                found[key] = value
+        return found
+
+    def set(self, key: str, value: Any, timeout: Any = None) -> None:
+        if not self.handles(key):
+            return
+        ttl = self.ttl[namespace(key)]
+        if isinstance(timeout, (int, float)):
+            # Копия не переживает сам ключ в Redis.
+            ttl = min(ttl, timeout)
+        if ttl <= 0 or value is None:
+            self.discard([key])
+            return
+        now = time.monotonic()
+        entry = _Entry(value, now + ttl, now + max(ttl, self.stale_seconds))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set_many(self, data: dict[str, Any], timeout: Any = None) -> None:
+        for key, value in data.items():
+            self.set(key, value, timeout)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def expire_all(self) -> None:
+        """Считать все копии устаревшими, но оставить их на случай сбоя Redis."""
+        with self._lock:
+            for key, entry in self._entries.items():
+                self._entries[key] = _Entry(entry.value, 0.0, entry.stale_until)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class Invalidator:
+    """Рассылка и приём сброса L1-копий через Redis pub/sub."""
+
+    def __init__(self, local: LocalCache, alias: str = DEFAULT_CACHE_ALIAS):
+        self.local = local
+        self.alias = alias
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._origin = ""
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def channel(self) -> str:
+        # С KEY_PREFIX, чтобы окружения на одном Redis не сбрасывали друг друга.
+        return caches[self.alias].make_key(INVALIDATION_CHANNEL)
+
+    def _connection(self):
+        from django_redis import get_redis_connection
+
+        return get_redis_connection(self.alias)
+
+    @property
+    def origin(self) -> str:
+        self._ensure_process()
+        return self._origin
+
+    def _ensure_process(self) -> None:
+        # После fork у воркера свой id и свой поток-подписчик.
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            self._origin = f"{pid}:{uuid.uuid4().hex}"
+            self._thread = None
+
+    def start(self) -> None:
+        self._ensure_process()
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._listen, name="rubysound-l1-invalidate", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def publish(self, keys: list[str]) -> None:
+        if not keys:
+            return
+        message = orjson.dumps({"origin": self.origin, "keys": keys})
+        try:
+            self._connection().publish(self.channel, message)
+        except Exception as exc:
+            # Остальные воркеры обновят копию по TTL.
+            logger.warning("L1 invalidation publish failed: %s", exc)
+
+    def handle_message(self, data: Any) -> None:
+        try:
+            message = orjson.loads(data)
+            origin, keys = message["origin"], message["keys"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            logger.warning("Malformed L1 invalidation message: %r", data)
+            return
+        if origin != self.origin:
+            self.local.discard(keys)
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            pubsub = None
+            try:
+                pubsub = self._connection().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Пока подписки не было, сообщения могли потеряться.
+                self.local.expire_all()
+                while not self._stopped.is_set():
+                    # get_message с таймаутом не упирается в SOCKET_TIMEOUT пула.
+                    message = pubsub.get_message(timeout=POLL_SECONDS)
+                    if message and message.get("type") == "message":
+                        self.handle_message(message["data"])
+            except Exception as exc:
+                logger.warning("L1 invalidation listener reconnecting: %s", exc)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            self._stopped.wait(RECONNECT_SECONDS)
+
+
+def uses_redis(backend) -> bool:
+    return type(backend).__module__.startswith("django_redis")
+
+
+_local_cache: LocalCache | None = None
+_invalidator: Invalidator | None = None
+
+
+def get_local_cache() -> LocalCache:
+    global _local_cache
+
+    if _local_cache is None:
+        _local_cache = LocalCache(
+            ttl={**DEFAULT_TTL, **getattr(settings, "CACHE_L1_TTL", {})},
+            max_entries=getattr(settings, "CACHE_L1_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+            stale_seconds=getattr(
+                settings, "CACHE_L1_STALE_SECONDS", DEFAULT_STALE_SECONDS
+            ),
+        )
+    return _local_cache
+
+
+def get_invalidator() -> Invalidator:
+    global _invalidator
+
+    if _invalidator is None:
+        _invalidator = Invalidator(get_local_cache())
+    return _invalidator
+
+
+def invalidate(keys: list[str]) -> None:
+    """Сбросить L1-копии после синхронной записи мимо ``async_cache``."""
+    get_local_cache().discard(keys)
+    if uses_redis(caches[DEFAULT_CACHE_ALIAS]):
+        get_invalidator().publish(keys)
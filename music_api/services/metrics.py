@@ -0,0 +1,95 @@
+"""Prometheus-метрики music_api (экспортируются через django-prometheus /metrics)."""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+UPSTREAM_CONNECTIONS = Counter(
+    "rubysound_upstream_connections_total",
+    "Upstream HTTP requests by provider and whether a pooled connection was reused.",
+    ["provider", "outcome"],
+)
+
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    "rubysound_upstream_request_seconds",
+    "Upstream request latency until response headers, by provider and API method.",
+    ["provider", "method"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 7, 12),
+)
+
+UPSTREAM_RESPONSES = Counter(
+    "rubysound_upstream_responses_total",
+    "Upstream responses by provider, API method and HTTP status.",
+    ["provider", "method", "status"],
+)
+
+UPSTREAM_ERRORS = Counter(
+    "rubysound_upstream_errors_total",
+    "Upstream requests that got no response (timeouts, connection errors, "
+    "open circuit, rate limit), by exception type.",
+    ["provider", "method", "error"],
+)
+
+UPSTREAM_IN_FLIGHT = Gauge(
+    "rubysound_upstream_in_flight_requests",
+    "Upstream requests sent and waiting for response headers.",
+    ["provider"],
+    multiprocess_mode="livesum",
+)
+
+UPSTREAM_RETRIES = Counter(
+    "rubysound_upstream_retries_total",
+    "Repeated upstream requests after a failed attempt.",
+    ["provider", "method"],
+)
+
+UPSTREAM_RESPONSE_BYTES = Histogram(
+    "rubysound_upstream_response_bytes",
+    "Upstream response body size (as received), by provider and API method.",
+    ["provider", "method"],
+    buckets=(512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608),
+)
+
+UPSTREAM_RATE_LIMIT_WAIT = Histogram(
+    "rubysound_upstream_rate_limit_wait_seconds",
+    "Time spent waiting for an upstream rate-limit token.",
+    ["provider", "outcome"],
+    buckets=(0, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+
+UPSTREAM_CIRCUIT_STATE = Gauge(
+    "rubysound_upstream_circuit_state",
+    "Circuit breaker state per provider: 0 closed, 1 half-open, 2 open.",
+    ["provider"],
+    multiprocess_mode="max",
+)
+
+CACHE_REQUESTS = Counter(
+    "rubysound_cache_requests_total",
+    "Redis cache lookups by key prefix and result (hit or miss).",
+    ["prefix", "result"],
+)
+
+CACHE_SETS = Counter(
+    "rubysound_cache_sets_total",
+    "Redis cache writes by key prefix.",
+    ["prefix"],
+)
+
+CACHE_VALUE_BYTES = Histogram(
+    "rubysound_cache_value_bytes",
+    "Encoded size of values written to Redis by key prefix.",
+    ["prefix"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+CACHE_OPERATION_SECONDS = Histogram(
+    "rubysound_cache_operation_seconds",
+    "Redis cache get/set latency (including decode/encode) by key prefix.",
+    ["prefix", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+CACHE_L1_REQUESTS = Counter(
+    "rubysound_cache_l1_requests_total",
+    "In-process L1 lookups by key prefix and result (hit, miss or stale).",
+    ["prefix", "result"],
+)
@@ -0,0 +1,124 @@
+"""Нормализация названий треков и имён артистов для сравнения и ключей.
+
+Одни и те же имена приходят сотнями раз за ответ Last.fm (чарты, поиск,
+тренды), поэтому шаблоны скомпилированы один раз, а результаты
+мемоизированы LRU-кэшем. Кэш ограничен по размеру и общий для процесса.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Callable, Iterable
+
+CACHE_SIZE = 16384
+
+_BRACKETS_RE = re.compile(r"[\(\[\{].*?[\)\]\}]")
+_FEATURING_RE = re.compile(r"\b(feat\.|ft\.|featuring|with)\b.*")
+_EDITION_RE = re.compile(r"\b(remaster(ed)?|deluxe|explicit|clean|live|radio edit)\b")
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def _strip_accents(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    if text.isascii():
+        return text
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _track_text(value: str) -> str:
+    text = value.casefold()
+    text = _BRACKETS_RE.sub(" ", text)
+    text = _FEATURING_RE.sub(" ", text)
+    text = _EDITION_RE.sub(" ", text)
+    text = _PUNCTUATION_RE.sub(" ", text)
+    return _SPACES_RE.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _track_tokens(value: str) -> frozenset[str]:
+    return frozenset(_track_text(value).split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _artist_name(value: str) -> str:
+    text = _strip_accents(value).casefold()
+    text = _PUNCTUATION_RE.sub(" ", text)
+    return _SPACES_RE.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _plain_text(value: str) -> str:
+    return _strip_accents(" ".join(value.split())).lower()
+
+
+def normalize_track_text(value: Any) -> str:
+    """Название без скобок, feat., пометок издания и пунктуации."""
+    if not value:
+        return ""
+    return _track_text(str(value))
+
+
+def normalize_artist_name(value: Any) -> str:
+    """Имя артиста без диакритики и пунктуации, casefold."""
+    if not value:
+        return ""
+    return _artist_name(str(value))
+
+
+def normalize_text(value: Any) -> str:
+    """Ключ для сравнения треков в плейлистах: пробелы, NFKD, lower."""
+    if not value:
+        return ""
+    return _plain_text(str(value))
+
+
+def tokenize_artist(value: Any) -> frozenset[str]:
+    if not value:
+        return frozenset()
+    return _track_tokens(str(value))
+
+
+def normalize_many(
+    values: Iterable[Any], normalizer: Callable[[Any], str] = normalize_track_text
+) -> list[str]:
+    """Нормализует список значений; повторы считаются один раз."""
+    seen: dict[Any, str] = {}
+    result = []
+    for value in values:
+        try:
+            normalized = seen[value]
+        except KeyError:
+            normalized = seen[value] = normalizer(value)
+        except TypeError:
+            normalized = normalizer(value)
+        result.append(normalized)
+    return result
+
+
+def artist_tokens_match(target: Any, candidate: Any) -> bool:
+    target_tokens = tokenize_artist(target)
+    candidate_tokens = tokenize_artist(candidate)
+    if not target_tokens or not candidate_tokens:
+        return False
+    return target_tokens <= candidate_tokens or candidate_tokens <= target_tokens
+
+
+def track_names_match(target: Any, candidate: Any) -> bool:
+    target_norm = normalize_track_text(target)
+    candidate_norm = normalize_track_text(candidate)
+    if not target_norm or not candidate_norm:
+        return False
+    if target_norm == candidate_norm:
+        return True
+    if len(target_norm) < 4 or len(candidate_norm) < 4:
+        return False
+    return target_norm in candidate_norm or candidate_norm in target_norm
+
+
+def cache_clear() -> None:
+    for func in (_track_text, _track_tokens, _artist_name, _plain_text):
+        func.cache_clear()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+
+from .errors import UpstreamUnavailable
+from .metrics import UPSTREAM_RATE_LIMIT_WAIT
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamRateLimited(UpstreamUnavailable):
+    """Слот у провайдера не освобождается дольше ``max_wait`` секунд."""
+
+    def __init__(self, provider: str, wait: float):
+        super().__init__(provider, f"{provider} rate limit: next slot in {wait:.2f}s")
+        self.wait = wait
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: float = 10.0  # токенов в секунду
+    burst: int = 20
+    max_wait: float = 2.0
+
+
+# Самые большие пакеты, которые уходят к провайдеру за один запрос
+# (services_async: iTunes — 25 треков, Deezer и TheAudioDB — 40,
+# Last.fm — 75 артистов в релизах).
+LARGEST_BATCH = {
+    "lastfm": 75,
+    "itunes": 25,
+    "deezer": 40,
+    "theaudiodb": 40,
+}
+
+
+def _batch_limit(rate: float, burst: int, provider: str) -> RateLimit:
+    """Лимит, при котором холодный пакет целиком дожидается своих слотов,
+    а не получает отказ на хвосте — даже если прямо перед ним такой же пакет
+    выбрал burst и занял очередь (иначе отказы кэшируются как нули на весь
+    soft TTL)."""
+    batch = LARGEST_BATCH[provider]
+    return RateLimit(rate=rate, burst=burst, max_wait=(2 * batch - burst) / rate + 0.5)
+
+
+# Лимиты общие для всех воркеров (через Redis). Last.fm просит не больше
+# 5 запросов в секунду в среднем за 5 минут, поэтому burst — на весь пакет;
+# Deezer — 50 за 5 секунд. Превью проксирует синхронный view: он не должен
+# занимать воркер надолго, поэтому при очереди сразу отдаёт 503.
+DEFAULT_RATE_LIMITS = {
+    "lastfm": _batch_limit(rate=5, burst=75, provider="lastfm"),
+    "itunes": _batch_limit(rate=4, burst=8, provider="itunes"),
+    "deezer": _batch_limit(rate=8, burst=20, provider="deezer"),
+    "theaudiodb": _batch_limit(rate=2, burst=10, provider="theaudiodb"),
+    "wikipedia": RateLimit(rate=20, burst=40),
+    "apple_rss": RateLimit(rate=2, burst=4),
+    "itunes_preview": RateLimit(rate=20, burst=40, max_wait=0.25),
+    "deezer_preview": RateLimit(rate=20, burst=40, max_wait=0.25),
+}
+
+# Резервирующий token bucket: токены могут уйти в минус, тогда ответ —
+# сколько ждать до своего слота. Если ждать дольше max_wait, токен не
+# списывается и возвращается отрицательное ожидание.
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens < 1 then
+  wait = (1 - tokens) / rate
+end
+if wait > max_wait then
+  return tostring(-wait)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens - 1, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + math.ceil(max_wait) + 1)
+return tostring(wait)
+"""
+
+
+def get_rate_limit(provider: str) -> RateLimit:
+    limit = DEFAULT_RATE_LIMITS.get(provider, RateLimit())
+    overrides = getattr(settings, "UPSTREAM_RATE_LIMITS", {}).get(provider) or {}
+    return replace(limit, **overrides) if overrides else limit
+
+
+class _LocalBucket:
+    """Тот же алгоритм в памяти процесса — когда Redis не настроен или недоступен."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: float | None = None
+        self._updated_at = 0.0
+
+    def reserve(self, limit: RateLimit) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if self._tokens is None:
+                tokens = float(limit.burst)
+            else:
+                elapsed = max(0.0, now - self._updated_at)
+                tokens = min(limit.burst, self._tokens + elapsed * limit.rate)
+            wait = (1 - tokens) / limit.rate if tokens < 1 else 0.0
+            if wait > limit.max_wait:
+                return -wait
+            self._tokens = tokens - 1
+            self._updated_at = now
+            return wait
+
+
+_local_buckets: dict[str, _LocalBucket] = {}
+_local_buckets_lock = threading.Lock()
+_redis_script = None
+
+
+def _local_reserve(provider: str, limit: RateLimit) -> float:
+    bucket = _local_buckets.get(provider)
+    if bucket is None:
+        with _local_buckets_lock:
+            bucket = _local_buckets.setdefault(provider, _LocalBucket())
+    return bucket.reserve(limit)
+
+
+def _uses_redis() -> bool:
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    return type(backend).__module__.startswith("django_redis")
+
+
+def _get_redis_script():
+    global _redis_script
+
+    if _redis_script is None:
+        from django_redis import get_redis_connection
+
+        connection = get_redis_connection(DEFAULT_CACHE_ALIAS)
+        _redis_script = connection.register_script(TOKEN_BUCKET_LUA)
+    return _redis_script
+
+
+def _reserve(provider: str, limit: RateLimit) -> float:
+    if not _uses_redis():
+        return _local_reserve(provider, limit)
+    key = caches[DEFAULT_CACHE_ALIAS].make_key(f"rate_limit:{provider}")
+    try:
+        script = _get_redis_script()
+        return float(script(keys=[key], args=[limit.rate, limit.burst, limit.max_wait]))
+    except Exception as exc:
+        logger.warning("Redis rate limiter unavailable, using local bucket: %s", exc)
+        return _local_reserve(provider, limit)
+
+
+def _checked_wait(provider: str, wait: float) -> float:
+    if wait < 0:
+        UPSTREAM_RATE_LIMIT_WAIT.labels(provider=provider, outcome="rejected").observe(
+            -wait
+        )
+        raise UpstreamRateLimited(provider, -wait)
+    UPSTREAM_RATE_LIMIT_WAIT.labels(provider=provider, outcome="acquired").observe(wait)
+    return wait
+
+
+async def acquire(provider: str) -> float:
+    """Дождаться слота у провайдера; возвращает время ожидания в секундах."""
+    limit = get_rate_limit(provider)
+    if not _uses_redis():
+        wait = _local_reserve(provider, limit)
+    else:
+        wait = await sync_to_async(_reserve, thread_sensitive=False)(provider, limit)
+    wait = _checked_wait(provider, wait)
+    if wait:
+        await asyncio.sleep(wait)
+    return wait
+
+
+def acquire_sync(provider: str) -> float:
+    """Синхронный вариант ``acquire`` для обычных view."""
+    wait = _checked_wait(provider, _reserve(provider, get_rate_limit(provider)))
+    if wait:
+        time.sleep(wait)
+    return wait
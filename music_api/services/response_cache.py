@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable
+
+import brotli
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from ..renderers import ORJSONRenderer
+from . import swr
+from .async_cache import async_cache
+
+# Готовый ответ (JSON-байты, gzip, brotli и ETag) лежит рядом с SWR-записью
+# и отдаётся на попадании без DRF-рендерера и без повторного сжатия.
+PREPARED_PREFIX = "prepared"
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+ENCODINGS = ("br", "gzip")
+
+
+def prepared_key(cache_key: str) -> str:
+    return f"{PREPARED_PREFIX}:{cache_key}"
+
+
+@dataclass(frozen=True)
+class PreparedResponse:
+    body: bytes
+    gzip: bytes
+    br: bytes
+    etag: str
+    created_at: float
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.created_at)
+
+    def is_stale(self, soft_ttl: float) -> bool:
+        return self.age > soft_ttl
+
+    def variant(self, encoding: str | None) -> bytes:
+        if encoding == "br":
+            return self.br
+        if encoding == "gzip":
+            return self.gzip
+        return self.body
+
+
+def prepare(payload: Any, created_at: float) -> PreparedResponse:
+    body = ORJSONRenderer().render(payload)
+    return PreparedResponse(
+        body=body,
+        gzip=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+        br=brotli.compress(body, quality=BROTLI_QUALITY),
+        etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+        created_at=created_at,
+    )
+
+
+async def aset(
+    cache_key: str, payload: Any, created_at: float, hard_ttl: float
+) -> PreparedResponse:
+    prepared = prepare(payload, created_at)
+    await async_cache.set(prepared_key(cache_key), asdict(prepared), timeout=hard_ttl)
+    return prepared
+
+
+async def aget(cache_key: str) -> PreparedResponse | None:
+    raw = await async_cache.get(prepared_key(cache_key))
+    if not isinstance(raw, dict):
+        return None
+    try:
+        return PreparedResponse(**raw)
+    except TypeError:
+        return None
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    accepted = _accepted_encodings(accept_encoding or "")
+    for encoding in ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Сравнение слабое (RFC 9110): W/"x" совпадает с "x".
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def respond(request, prepared: PreparedResponse, soft_ttl: float) -> HttpResponse:
+    """Ответ из готовых байтов: 304 по If-None-Match, иначе нужный вариант."""
+    headers = {
+        "ETag": prepared.etag,
+        "Cache-Control": "no-cache",
+        **swr.cache_headers(prepared, soft_ttl),
+    }
+    if _etag_matches(request.META.get("HTTP_IF_NONE_MATCH", ""), prepared.etag):
+        response = HttpResponseNotModified(headers=headers)
+    else:
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        response = HttpResponse(
+            prepared.variant(encoding),
+            content_type="application/json",
+            headers=headers,
+        )
+        if encoding:
+            response["Content-Encoding"] = encoding
+        response["Content-Length"] = str(len(response.content))
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+async def aserve(
+    request,
+    cache_key: str,
+    soft_ttl: float,
+    refresh: Callable[[], Awaitable[Any]],
+) -> HttpResponse | None:
+    """Готовый ответ из кэша (с фоновым обновлением, если он устарел) или None."""
+    prepared = await aget(cache_key)
+    if prepared is None:
+        return None
+    if prepared.is_stale(soft_ttl):
+        await swr.aschedule_refresh(cache_key, refresh)
+    return respond(request, prepared, soft_ttl)
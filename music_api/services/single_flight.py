@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from .async_cache import async_cache
+
+logger = logging.getLogger(__name__)
+
+LEASE_PREFIX = "single_flight"
+LEASE_TIMEOUT_SECONDS = 15
+# Ожидающие воркеры опрашивают Redis с нарастающим интервалом.
+POLL_INTERVAL_SECONDS = 0.05
+MAX_POLL_INTERVAL_SECONDS = 0.5
+# После успеха лидер кладёт результат в lease: ожидающие забирают его сразу,
+# не дожидаясь записи основного ключа (batch write-back) и истечения lease.
+DONE_TTL_SECONDS = 10
+
+_MISSING = object()
+
+# (loop, cache_key) -> future лидера. Future привязан к своему loop,
+# поэтому ключ включает loop.
+_inflight: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # Без ожидающих исключение лидера иначе попадёт в лог asyncio как
+    # "Future exception was never retrieved".
+    if not future.cancelled():
+        future.exception()
+
+
+async def _wait_for_other_worker(cache_key: str, lease_key: str, timeout: float):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    interval = POLL_INTERVAL_SECONDS
+    while loop.time() < deadline:
+        await asyncio.sleep(interval)
+        interval = min(interval * 2, MAX_POLL_INTERVAL_SECONDS)
+        # Один round-trip на опрос: и lease, и сам ключ.
+        values = await async_cache.get_many([lease_key, cache_key])
+        lease = values.get(lease_key)
+        if isinstance(lease, dict) and "value" in lease:
+            return lease["value"]
+        if values.get(cache_key) is not None:
+            return values[cache_key]
+        if lease is None:
+            break
+    return _MISSING
+
+
+async def _fetch_with_lease(
+    cache_key: str,
+    fetch: Callable[[], Awaitable[Any]],
+    lease_timeout: float,
+):
+    lease_key = f"{LEASE_PREFIX}:{cache_key}"
+    if not await async_cache.add(lease_key, 1, timeout=lease_timeout):
+        cached = await _wait_for_other_worker(cache_key, lease_key, lease_timeout)
+        if cached is not _MISSING:
+            return cached
+        logger.debug("Single-flight lease for %s expired, fetching", cache_key)
+        return await fetch()
+
+    try:
+        result = await fetch()
+    except BaseException:
+        await async_cache.delete(lease_key)
+        raise
+    await async_cache.set(lease_key, {"value": result}, timeout=DONE_TTL_SECONDS)
+    return result
+
+
+async def single_flight(
+    cache_key: str,
+    fetch: Callable[[], Awaitable[Any]],
+    lease_timeout: float = LEASE_TIMEOUT_SECONDS,
+):
+    """Один upstream-запрос на ключ кэша, сколько бы корутин его ни ждали.
+
+    Внутри процесса ожидающие получают результат общего future. Между
+    воркерами Redis-lease (``cache.add``) пропускает к upstream только
+    одного, остальные ждут появления значения по ``cache_key``.
+    """
+    loop = asyncio.get_running_loop()
+    flight_key = (loop, cache_key)
+    leader = _inflight.get(flight_key)
+    if leader is not None:
+        try:
+            return await asyncio.shield(leader)
+        except asyncio.CancelledError:
+            if not leader.cancelled():
+                raise
+        # Лидер отменён (например, истёк бюджет его запроса) — пробуем сами.
+        return await single_flight(cache_key, fetch, lease_timeout)
+
+    future = loop.create_future()
+    future.add_done_callback(_consume_exception)
+    _inflight[flight_key] = future
+    try:
+        result = await _fetch_with_lease(cache_key, fetch, lease_timeout)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(flight_key, None)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Any
+
+from .async_cache import async_cache
+
+# Копия последнего удачного значения живёт дольше основного ключа и отдаётся,
+# когда провайдер недоступен (открыт circuit breaker или исчерпан rate limit).
+STALE_PREFIX = "stale"
+
+DAY = 60 * 60 * 24
+# TTL основного ключа для найденного значения по пространствам имён
+# (views/services_async, tracks_async, artists_async). Копия переживает его
+# на STALE_MARGIN_SECONDS: после истечения ключа провайдер спрашивают
+# заново, и при отказе должно остаться, что отдать.
+PRIMARY_TTL_SECONDS = {
+    "tracks_chart": 60 * 60 * 6,
+    "apple_chart": 60 * 60 * 6,
+    "trending_artists_full": 60 * 60 * 6,
+    "itunes": 7 * DAY,
+    "deezer": 7 * DAY,
+    "lastfm_track_info": 7 * DAY,
+    "theaudiodb_artist_image": 7 * DAY,
+    "lastfm_releases": 3 * DAY,
+    "wikipedia_artist_bio": 3 * DAY,
+}
+STALE_MARGIN_SECONDS = 2 * DAY
+
+
+def stale_key(cache_key: str) -> str:
+    return f"{STALE_PREFIX}:{cache_key}"
+
+
+def stale_ttl(cache_key: str) -> int:
+    namespace = cache_key.split(":", 1)[0]
+    primary = PRIMARY_TTL_SECONDS.get(namespace, max(PRIMARY_TTL_SECONDS.values()))
+    return primary + STALE_MARGIN_SECONDS
+
+
+async def remember(cache_key: str, value: Any) -> None:
+    await async_cache.set(stale_key(cache_key), value, timeout=stale_ttl(cache_key))
+
+
+async def remember_many(data: dict[str, Any]) -> None:
+    by_ttl: dict[int, dict[str, Any]] = {}
+    for key, value in data.items():
+        by_ttl.setdefault(stale_ttl(key), {})[stale_key(key)] = value
+    for ttl, entries in by_ttl.items():
+        await async_cache.set_many(entries, timeout=ttl)
+
+
+async def recall(cache_key: str, default: Any = None) -> Any:
+    return await async_cache.get(stale_key(cache_key), default)
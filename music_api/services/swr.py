@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from .async_cache import async_cache
+from .background import run_in_background
+
+logger = logging.getLogger(__name__)
+
+REFRESH_LEASE_PREFIX = "swr_refresh"
+REFRESH_LEASE_SECONDS = 120
+
+
+@dataclass(frozen=True)
+class CachedEntry:
+    """Значение из кэша вместе со временем его расчёта."""
+
+    value: Any
+    created_at: float
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.created_at)
+
+    def is_stale(self, soft_ttl: float) -> bool:
+        return self.age > soft_ttl
+
+
+def pack(value: Any) -> dict[str, Any]:
+    return {"value": value, "created_at": time.time()}
+
+
+def unpack(raw: Any) -> CachedEntry | None:
+    # Значения в старом формате (без конверта) считаем промахом.
+    if not isinstance(raw, dict) or "created_at" not in raw or "value" not in raw:
+        return None
+    return CachedEntry(value=raw["value"], created_at=float(raw["created_at"]))
+
+
+async def aget_entry(cache_key: str) -> CachedEntry | None:
+    return unpack(await async_cache.get(cache_key))
+
+
+async def aset_entry(cache_key: str, value: Any, hard_ttl: float) -> CachedEntry:
+    packed = pack(value)
+    await async_cache.set(cache_key, packed, timeout=hard_ttl)
+    return CachedEntry(value=value, created_at=packed["created_at"])
+
+
+def _lease_key(cache_key: str) -> str:
+    return f"{REFRESH_LEASE_PREFIX}:{cache_key}"
+
+
+def _submit_refresh(cache_key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+    async def job():
+        try:
+            await refresh()
+        finally:
+            await async_cache.delete(_lease_key(cache_key))
+
+    run_in_background(f"refresh {cache_key}", job)
+
+
+async def aschedule_refresh(
+    cache_key: str, refresh: Callable[[], Awaitable[Any]]
+) -> bool:
+    """Запустить одно фоновое обновление ключа на все воркеры.
+
+    Lease в кэше не даёт нескольким запросам (и воркерам) обновлять один и
+    тот же ключ одновременно. ``refresh`` сам сохраняет новое значение.
+    """
+    lease_key = _lease_key(cache_key)
+    if not await async_cache.add(lease_key, 1, timeout=REFRESH_LEASE_SECONDS):
+        return False
+    _submit_refresh(cache_key, refresh)
+    return True
+
+
+async def arefresh_now(cache_key: str, refresh: Callable[[], Awaitable[Any]]) -> bool:
+    """Обновить ключ прямо сейчас, если его не обновляет кто-то другой."""
+    lease_key = _lease_key(cache_key)
+    if not await async_cache.add(lease_key, 1, timeout=REFRESH_LEASE_SECONDS):
+        return False
+    try:
+        await refresh()
+    finally:
+        await async_cache.delete(lease_key)
+    return True
+
+
+def meta_for(entry: CachedEntry | None) -> dict[str, Any]:
+    """meta в теле ответа — одна и та же для готовых байтов и обычного рендера.
+
+    Она не зависит от времени запроса; возраст и свежесть — в заголовках
+    (``cache_headers``).
+    """
+    if entry is None:
+        return {"cached": False, "created_at": None}
+    return {"cached": True, "created_at": int(entry.created_at)}
+
+
+def cache_headers(entry: Any, soft_ttl: float) -> dict[str, str]:
+    """Age и X-Cache для записи кэша (CachedEntry или готового ответа)."""
+    if entry is None:
+        return {"X-Cache": "MISS"}
+    return {
+        "Age": str(int(entry.age)),
+        "X-Cache": "STALE" if entry.is_stale(soft_ttl) else "HIT",
+    }
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any, Iterable
+
+from asgiref.sync import sync_to_async
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from ..models import TrackMetadata
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("itunes", "deezer", "lastfm")
+
+# Найденное значение живёт в таблице долго, пустое перепроверяется так же
+# часто, как раньше истекал отрицательный ключ в Redis.
+FOUND_MAX_AGE = timedelta(days=30)
+EMPTY_MAX_AGE = timedelta(hours=1)
+
+# TTL, с которым batch сам кладёт значение провайдера в Redis: копия,
+# поднятая из таблицы, не живёт дольше.
+CACHE_TTL_SECONDS = {
+    "itunes": {"found": 60 * 60 * 24 * 7, "empty": 60 * 60},
+    "deezer": {"found": 60 * 60 * 24 * 7, "empty": 60 * 30},
+    "lastfm": {"found": 60 * 60 * 24 * 7, "empty": 60 * 60 * 24 * 7},
+}
+
+
+def metadata_key(value: Any) -> str:
+    return " ".join(str(value or "").split()).casefold()[:255]
+
+
+def _pair(track: dict) -> tuple[str, str]:
+    return metadata_key(track["artist"]), metadata_key(track["name"])
+
+
+def _mbid(track: dict) -> str:
+    return str(track.get("mbid") or "").strip()
+
+
+def _is_empty(value: Any) -> bool:
+    return not isinstance(value, dict) or not any(value.values())
+
+
+@sync_to_async
+def _select_rows(mbids, pairs):
+    query = Q(mbid__in=mbids) if mbids else Q()
+    for artist_key, name_key in pairs:
+        query |= Q(artist_key=artist_key, name_key=name_key)
+    return list(TrackMetadata.objects.filter(query).values())
+
+
+async def load(tracks: Iterable[dict]) -> dict[tuple[str, str], dict]:
+    """Строки TrackMetadata для batch одним запросом: {(name, artist): row}."""
+    tracks = list(tracks)
+    if not tracks:
+        return {}
+    mbids = sorted({_mbid(track) for track in tracks} - {""})
+    pairs = sorted({_pair(track) for track in tracks})
+    try:
+        rows = await _select_rows(mbids, pairs)
+    except Exception as exc:
+        logger.warning("Track metadata read failed: %s", exc)
+        return {}
+
+    by_mbid = {row["mbid"]: row for row in rows if row["mbid"]}
+    by_pair = {(row["artist_key"], row["name_key"]): row for row in rows}
+    found = {}
+    for track in tracks:
+        row = by_mbid.get(_mbid(track)) or by_pair.get(_pair(track))
+        if row is not None:
+            found[(track["name"], track["artist"])] = row
+    return found
+
+
+def _remaining(row: dict | None, provider: str, now=None) -> timedelta | None:
+    """Сколько ещё значение провайдера в строке считается свежим."""
+    if row is None:
+        return None
+    value = row.get(provider)
+    fetched_at = row.get(f"{provider}_fetched_at")
+    if value is None or fetched_at is None:
+        return None
+    max_age = EMPTY_MAX_AGE if _is_empty(value) else FOUND_MAX_AGE
+    remaining = max_age - ((now or timezone.now()) - fetched_at)
+    return remaining if remaining > timedelta(0) else None
+
+
+def fresh_value(row: dict | None, provider: str, now=None) -> Any:
+    """Значение провайдера из строки, если оно ещё не устарело."""
+    if _remaining(row, provider, now) is None:
+        return None
+    return row.get(provider)
+
+
+def warm_ttl(row: dict | None, provider: str, now=None) -> int:
+    """TTL копии в Redis: остаток жизни значения в таблице, но не дольше
+    TTL провайдера. 0 — значение устарело, поднимать нечего."""
+    remaining = _remaining(row, provider, now)
+    if remaining is None:
+        return 0
+    kind = "empty" if _is_empty(row.get(provider)) else "found"
+    return min(int(remaining.total_seconds()), CACHE_TTL_SECONDS[provider][kind])
+
+
+class StoredTracks:
+    """Ленивое чтение TrackMetadata, общее для нескольких провайдеров.
+
+    Запрос выполняется при первом ``get()`` (только если в Redis были
+    промахи), остальные провайдеры того же batch получают тот же результат.
+    """
+
+    def __init__(self, tracks: Iterable[dict]):
+        self._tracks = list(tracks)
+        self._future: asyncio.Future | None = None
+
+    async def get(self) -> dict[tuple[str, str], dict]:
+        if self._future is None:
+            self._future = asyncio.ensure_future(load(self._tracks))
+        return await self._future
+
+
+@sync_to_async
+def _upsert(provider, rows):
+    TrackMetadata.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["artist_key", "name_key"],
+        update_fields=[provider, f"{provider}_fetched_at"],
+    )
+    # Строка, созданная без mbid, получает его, как только он пришёл; уже
+    # записанный mbid не перетираем.
+    with_mbid = [row for row in rows if row.mbid]
+    if not with_mbid:
+        return
+    pairs = Q(pk__in=[])
+    whens = []
+    for row in with_mbid:
+        pair = Q(artist_key=row.artist_key, name_key=row.name_key)
+        pairs |= pair
+        whens.append(When(pair, then=Value(row.mbid)))
+    TrackMetadata.objects.filter(pairs, mbid="").update(
+        mbid=Case(*whens, default=F("mbid"))
+    )
+
+
+async def save(provider: str, values: dict[tuple[str, str, str], Any]) -> None:
+    """Bulk upsert результатов провайдера: {(name, artist, mbid): value}."""
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown track metadata provider: {provider}")
+    if not values:
+        return
+
+    now = timezone.now()
+    rows = {}
+    for (name, artist, mbid), value in values.items():
+        track = {"name": name, "artist": artist}
+        # Одна строка на пару: дубли в одном INSERT ... ON CONFLICT недопустимы.
+        rows[_pair(track)] = TrackMetadata(
+            name=name[:255],
+            artist=artist[:255],
+            name_key=metadata_key(name),
+            artist_key=metadata_key(artist),
+            mbid=str(mbid or "").strip()[:64],
+            **{provider: value, f"{provider}_fetched_at": now},
+        )
+    try:
+        await _upsert(provider, list(rows.values()))
+    except Exception as exc:
+        logger.warning("Track metadata write failed for %s: %s", provider, exc)
@@ -0,0 +1,122 @@
+"""Обратный индекс «трек -> плейлисты» поверх PlaylistTrack.
+
+Трек ищется по нормализованной паре (artist_key, name_key) или по mbid,
+оба поиска идут по индексам таблицы, без обхода плейлистов.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.models import Count, Max, Q, QuerySet
+
+from ..models import Playlist, PlaylistTrack
+from .normalization import normalize_text
+
+# Сколько треков показывать в отчёте админки.
+REPORT_LIMIT = 500
+
+
+def track_keys(name: Any, artist: Any) -> dict[str, str]:
+    return {
+        "name_key": normalize_text(name)[:255],
+        "artist_key": normalize_text(artist)[:255],
+    }
+
+
+def track_match(name: Any = "", artist: Any = "", mbid: Any = "") -> Q:
+    """Условие на строки PlaylistTrack: та же пара ключей или тот же mbid."""
+    match = Q(pk__in=[])
+    if name and artist:
+        match |= Q(**track_keys(name, artist))
+    mbid = str(mbid or "").strip()
+    if mbid:
+        match |= Q(mbid=mbid)
+    return match
+
+
+def saved_count(match: Q) -> int:
+    """Сколько пользователей сохранили трек (в любой свой плейлист)."""
+    return (
+        PlaylistTrack.objects.filter(match)
+        .order_by()
+        .values("playlist__user")
+        .distinct()
+        .count()
+    )
+
+
+def public_playlists(match: Q) -> QuerySet:
+    """Публичные плейлисты с треком, новые сначала."""
+    playlist_ids = PlaylistTrack.objects.filter(match).values("playlist_id")
+    return (
+        Playlist.objects.filter(id__in=playlist_ids, user__is_public_favorites=True)
+        .select_related("user")
+        .order_by("-created_at", "-id")
+    )
+
+
+def report(query: str = "", limit: int = REPORT_LIMIT) -> list[dict]:
+    """Треки по числу пользователей: группировка в базе, пользователи — только
+    для попавших в лимит строк.
+
+    Каждое слово запроса должно найтись в названии, артисте, логине или email,
+    поэтому «numb linkin» находит Numb — Linkin Park, как раньше поиск по
+    общей строке «название артист пользователь email».
+    """
+    items = PlaylistTrack.objects.all()
+    for word in normalize_text(query).split():
+        items = items.filter(
+            Q(name_key__contains=word)
+            | Q(artist_key__contains=word)
+            | Q(playlist__user__username__icontains=word)
+            | Q(playlist__user__email__icontains=word)
+        )
+
+    grouped = list(
+        items.values("artist_key", "name_key")
+        .annotate(
+            name=Max("name"),
+            artist=Max("artist"),
+            user_count=Count("playlist__user", distinct=True),
+            total_adds=Count("id"),
+        )
+        .order_by("-user_count", "-total_adds", "name_key", "artist_key")[:limit]
+    )
+    if not grouped:
+        return []
+
+    keys = Q(pk__in=[])
+    for row in grouped:
+        keys |= Q(artist_key=row["artist_key"], name_key=row["name_key"])
+    users_by_key: dict[tuple[str, str], dict[int, dict]] = {}
+    for artist_key, name_key, user_id, username, email in items.filter(
+        keys
+    ).values_list(
+        "artist_key",
+        "name_key",
+        "playlist__user__id",
+        "playlist__user__username",
+        "playlist__user__email",
+    ):
+        users_by_key.setdefault((artist_key, name_key), {})[user_id] = {
+            "id": user_id,
+            "username": username,
+            "email": email or "",
+        }
+
+    rows = []
+    for row in grouped:
+        users = users_by_key.get((row["artist_key"], row["name_key"]), {})
+        rows.append(
+            {
+                "name": row["name"],
+                "artist": row["artist"],
+                "user_count": row["user_count"],
+                "total_adds": row["total_adds"],
+                "users": sorted(
+                    users.values(), key=lambda u: (u["username"].lower(), u["id"])
+                ),
+            }
+        )
+    return rows
@@ -0,0 +1,166 @@
+"""Метрики запросов к внешним API: задержка, статусы, ошибки, запросы в
+полёте, повторы и размер ответа по провайдеру и методу.
+
+Для async-клиентов их пишет ``UpstreamTransport`` (http_clients), для
+синхронного аудио-прокси — ``InstrumentedTransport``. Метод — это метод API
+(``track.getInfo`` у Last.fm) или первый/последний сегмент пути, так что
+число меток ограничено.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import AsyncIterator, Callable, Iterator
+
+import httpx
+
+from .metrics import (
+    UPSTREAM_ERRORS,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_REQUEST_SECONDS,
+    UPSTREAM_RESPONSE_BYTES,
+    UPSTREAM_RESPONSES,
+    UPSTREAM_RETRIES,
+)
+
+_METHOD_RE = re.compile(r"[A-Za-z][A-Za-z0-9_.-]{0,39}")
+# У этих провайдеров смысл несёт последний сегмент пути (search.php, songs.json).
+_LAST_SEGMENT_PROVIDERS = ("theaudiodb", "apple_rss")
+
+
+def _bounded(value: str) -> str:
+    return value if _METHOD_RE.fullmatch(value or "") else "other"
+
+
+def upstream_method(provider: str, request: httpx.Request) -> str:
+    params = request.url.params
+    if provider == "lastfm":
+        return _bounded(params.get("method", ""))
+    if provider == "wikipedia":
+        if params.get("generator") == "search" or params.get("list") == "search":
+            return "search"
+        if "titles" in params:
+            return "titles"
+        return _bounded(params.get("action", ""))
+    if provider.endswith("_preview"):
+        return "preview"
+    segments = [segment for segment in request.url.path.split("/") if segment]
+    if not segments:
+        return "other"
+    segment = segments[-1] if provider in _LAST_SEGMENT_PROVIDERS else segments[0]
+    return _bounded(segment.rsplit(".", 1)[0])
+
+
+def record_retry(provider: str, method: str) -> None:
+    UPSTREAM_RETRIES.labels(provider=provider, method=method).inc()
+
+
+def record_error(provider: str, method: str, exc: BaseException) -> None:
+    UPSTREAM_ERRORS.labels(
+        provider=provider, method=method, error=type(exc).__name__
+    ).inc()
+
+
+class RequestMetrics:
+    """Учёт одного запроса: от отправки до заголовков ответа и до конца тела.
+
+    Ожидание rate limit и отказ circuit breaker до ``sent()`` в задержку и
+    запросы в полёте не входят, но считаются ошибками.
+    """
+
+    def __init__(self, provider: str, request: httpx.Request):
+        self.provider = provider
+        self.method = upstream_method(provider, request)
+        self._started: float | None = None
+        self._in_flight = UPSTREAM_IN_FLIGHT.labels(provider=provider)
+
+    def sent(self) -> None:
+        self._started = time.perf_counter()
+        self._in_flight.inc()
+
+    def failed(self, exc: BaseException) -> None:
+        if self._started is not None:
+            self._in_flight.dec()
+        record_error(self.provider, self.method, exc)
+
+    def responded(self, response: httpx.Response, asynchronous: bool = True) -> None:
+        if self._started is None:
+            self.sent()
+        self._in_flight.dec()
+        UPSTREAM_REQUEST_SECONDS.labels(
+            provider=self.provider, method=self.method
+        ).observe(time.perf_counter() - self._started)
+        UPSTREAM_RESPONSES.labels(
+            provider=self.provider,
+            method=self.method,
+            status=str(response.status_code),
+        ).inc()
+        # Тело ещё не прочитано: размер считается по мере чтения потока.
+        if asynchronous:
+            response.stream = _CountingAsyncStream(response.stream, self._observe_size)
+        else:
+            response.stream = _CountingSyncStream(response.stream, self._observe_size)
+
+    def _observe_size(self, size: int) -> None:
+        UPSTREAM_RESPONSE_BYTES.labels(
+            provider=self.provider, method=self.method
+        ).observe(size)
+
+
+class _CountingAsyncStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[int], None]):
+        self._stream = stream
+        self._on_close = on_close
+        self._size = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._size += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close(self._size)
+
+
+class _CountingSyncStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, on_close: Callable[[int], None]):
+        self._stream = stream
+        self._on_close = on_close
+        self._size = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._size += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._on_close(self._size)
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """Синхронный транспорт с теми же метриками (аудио-прокси)."""
+
+    def __init__(self, provider: str, transport: httpx.BaseTransport | None = None):
+        self.provider = provider
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        metrics = RequestMetrics(self.provider, request)
+        metrics.sent()
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException as exc:
+            metrics.failed(exc)
+            raise
+        metrics.responded(response, asynchronous=False)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
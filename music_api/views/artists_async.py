@@ -1,15 +1,24 @@
-from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
-from django.core.cache import cache
 import asyncio
 import logging
-from asgiref.sync import async_to_sync
+
+from ..services import (
+    artist_metadata,
+    cache_namespaces,
+    response_cache,
+    stale_cache,
+    swr,
+)
+from ..services.async_cache import async_cache
+
+from .async_api import AsyncAPIView
 
 # Асинхронные сервисные функции
 from .services_async import (
+    ArtistBatchResult,
     _get_lastfm_artists_by_genre_async,
     _get_lastfm_artists_chart_async,
     _get_lastfm_releases_batch_async,
@@ -19,7 +28,7 @@ from .services_async import (
 
 DEFAULT_ARTIST_COUNT = 16
 CACHE_TIMEOUT = 600  # 10 минут
-CACHE_VERSION = "v7"
+CACHE_HARD_TTL = 60 * 60 * 6  # после CACHE_TIMEOUT обновляем в фоне
 
 THEAUDIODB_ARTISTS_BATCH_LIMIT = 40
 LASTFM_RELEASES_BATCH_LIMIT = 75
@@ -28,13 +37,44 @@ LASTFM_CHART_LIMIT = 75
 logger = logging.getLogger(__name__)
 
 
-async def _async_get_artists(genre=None, limit=DEFAULT_ARTIST_COUNT):
-    """Асинхронное получение трендовых артистов с batch обогащением"""
-    cache_key = f"trending_artists_full:{CACHE_VERSION}:{genre or 'all'}:{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached, True
+class _MergedValues(dict):
+    """{name: value} + список (artist, value) для записи в ArtistMetadata."""
+
+    def __init__(self):
+        super().__init__()
+        self.updated = []
+
+
+def _merge_stored(fetched_artists, fetched, stored, field):
+    merged = _MergedValues()
+    for name, row in stored.items():
+        value = artist_metadata.stored_value(row, field)
+        if value is not None:
+            merged[name] = value
+    for art in fetched_artists:
+        name = art["name"]
+        if name not in fetched:
+            # Провайдер отказал (rate limit, breaker) — ответа не было.
+            continue
+        value = fetched[name]
+        # Значение из Redis отдаём, но в таблицу не пишем: с fetched_at=now
+        # due_for_refresh перестал бы видеть его настоящий возраст.
+        from_provider = name in fetched.fetched
+        if value:
+            merged[name] = value
+            if from_provider:
+                merged.updated.append((art, value))
+        elif from_provider and not artist_metadata.stored_value(
+            stored.get(name), field
+        ):
+            # «Не найдено» не затирает сохранённое значение, но отмечает, что
+            # артиста уже запрашивали.
+            merged.updated.append((art, "" if field == "photo" else []))
+    return merged
 
+
+async def _fetch_artists_payload(genre, limit):
+    """Асинхронное получение трендовых артистов с batch обогащением"""
     try:
         if genre:
             artists_raw = await _get_lastfm_artists_by_genre_async(genre, limit)
@@ -42,28 +82,38 @@ async def _async_get_artists(genre=None, limit=DEFAULT_ARTIST_COUNT):
             artists_raw = await _get_lastfm_artists_chart_async(limit)
 
         if not artists_raw:
-            return {"artists": []}, False
+            return {"artists": []}
 
         artists_raw = artists_raw[:limit]
 
-        theaudiodb_photos_task = _get_theaudiodb_artists_batch_async(
-            artists_raw[:THEAUDIODB_ARTISTS_BATCH_LIMIT]
-        )
-        releases_task = _get_lastfm_releases_batch_async(
-            artists_raw[:LASTFM_RELEASES_BATCH_LIMIT]
+        # Фото и релизы берём из ArtistMetadata одним запросом; у провайдеров
+        # запрашиваем только отсутствующих и понемногу самых устаревших.
+        stored = await artist_metadata.load(artists_raw)
+        photo_candidates = artists_raw[:THEAUDIODB_ARTISTS_BATCH_LIMIT]
+        release_candidates = artists_raw[:LASTFM_RELEASES_BATCH_LIMIT]
+        photos_due = artist_metadata.due_for_refresh(photo_candidates, stored, "photo")
+        releases_due = artist_metadata.due_for_refresh(
+            release_candidates, stored, "releases"
         )
 
         theaudiodb_photos, releases_data = await asyncio.gather(
-            theaudiodb_photos_task, releases_task, return_exceptions=True
+            _get_theaudiodb_artists_batch_async(photos_due),
+            _get_lastfm_releases_batch_async(releases_due),
+            return_exceptions=True,
         )
 
         if isinstance(theaudiodb_photos, Exception):
             logger.error(f"TheAudioDB batch fail: {theaudiodb_photos}")
-            theaudiodb_photos = {}
+            theaudiodb_photos = ArtistBatchResult()
 
         if isinstance(releases_data, Exception):
             logger.error(f"Last.fm releases fail: {releases_data}")
-            releases_data = {}
+            releases_data = ArtistBatchResult()
+
+        photos = _merge_stored(photos_due, theaudiodb_photos, stored, "photo")
+        releases = _merge_stored(releases_due, releases_data, stored, "releases")
+        await artist_metadata.save("photo", photos.updated)
+        await artist_metadata.save("releases", releases.updated)
 
         enriched_artists = []
         for art in artists_raw:
@@ -71,10 +121,10 @@ async def _async_get_artists(genre=None, limit=DEFAULT_ARTIST_COUNT):
             enriched_artists.append(
                 {
                     "name": name,
-                    "photo_url": theaudiodb_photos.get(name) or "",
+                    "photo_url": photos.get(name) or "",
                     "listeners": art.get("listeners", 0),
                     "playcount": art.get("playcount", 0),
-                    "releases": releases_data.get(name, []),
+                    "releases": releases.get(name) or [],
                 }
             )
 
@@ -83,22 +133,78 @@ async def _async_get_artists(genre=None, limit=DEFAULT_ARTIST_COUNT):
             key=lambda artist: (artist["listeners"], artist["playcount"]), reverse=True
         )
 
-        data = {"artists": enriched_artists}
-        cache.set(cache_key, data, timeout=CACHE_TIMEOUT)
-        return data, False
+        return {"artists": enriched_artists}
 
     except Exception as e:
         logger.error(f"Critical error in _async_get_artists: {str(e)}", exc_info=True)
-        return {"artists": []}, False
+        return {"artists": []}
+
+
+def _trending_payload(data, genre, limit, cache_meta):
+    artists = data.get("artists", [])
+    return {
+        "artists": artists,
+        "meta": {
+            "genre": genre or "all",
+            "count": len(artists),
+            "limit": limit,
+            **cache_meta,
+        },
+    }
+
+
+async def _refresh_artists(cache_key, genre, limit):
+    data = await _fetch_artists_payload(genre, limit)
+    if data["artists"]:
+        entry = await swr.aset_entry(cache_key, data, CACHE_HARD_TTL)
+        await stale_cache.remember(cache_key, data)
+        await response_cache.aset(
+            cache_key,
+            _trending_payload(data, genre, limit, swr.meta_for(entry)),
+            entry.created_at,
+            CACHE_HARD_TTL,
+        )
+    return data
+
+
+async def _trending_cache_key(genre, limit):
+    return await cache_namespaces.akey("trending_artists_full", genre or "all", limit)
+
+
+async def _async_get_artists_with_meta(genre=None, limit=DEFAULT_ARTIST_COUNT):
+    cache_key = await _trending_cache_key(genre, limit)
+    entry = await swr.aget_entry(cache_key)
+    if entry is not None and entry.value:
+        if entry.is_stale(CACHE_TIMEOUT):
+            await swr.aschedule_refresh(
+                cache_key, lambda: _refresh_artists(cache_key, genre, limit)
+            )
+        return (
+            entry.value,
+            swr.meta_for(entry),
+            swr.cache_headers(entry, CACHE_TIMEOUT),
+        )
+
+    data = await _refresh_artists(cache_key, genre, limit)
+    if not data["artists"]:
+        stale = await stale_cache.recall(cache_key)
+        if stale:
+            return stale, {"cached": True, "stale": True}, {}
+    return data, swr.meta_for(None), swr.cache_headers(None, CACHE_TIMEOUT)
 
 
-class TrendingArtistsAPIView(APIView):
+async def _async_get_artists(genre=None, limit=DEFAULT_ARTIST_COUNT):
+    data, meta, _ = await _async_get_artists_with_meta(genre, limit)
+    return data, meta["cached"]
+
+
+class TrendingArtistsAPIView(AsyncAPIView):
     """API для получения топа артистов"""
 
     permission_classes = [AllowAny]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
 
-    def get(self, request):
+    async def get(self, request):
         genre = request.query_params.get("genre")
         limit_str = request.query_params.get("limit", str(DEFAULT_ARTIST_COUNT))
 
@@ -112,18 +218,19 @@ class TrendingArtistsAPIView(APIView):
             )
 
         try:
-            data, cached_flag = async_to_sync(_async_get_artists)(genre, limit)
-
-            response_data = {
-                "artists": data.get("artists", []),
-                "meta": {
-                    "genre": genre or "all",
-                    "count": len(data.get("artists", [])),
-                    "limit": limit,
-                    "cached": cached_flag,
-                },
-            }
-            return Response(response_data, status=status.HTTP_200_OK)
+            cache_key = await _trending_cache_key(genre, limit)
+            response = await response_cache.aserve(
+                request,
+                cache_key,
+                CACHE_TIMEOUT,
+                lambda: _refresh_artists(cache_key, genre, limit),
+            )
+            if response is not None:
+                return response
+
+            data, cache_meta, headers = await _async_get_artists_with_meta(genre, limit)
+            response_data = _trending_payload(data, genre, limit, cache_meta)
+            return Response(response_data, status=status.HTTP_200_OK, headers=headers)
 
         except Exception as e:
             logger.error(f"TrendingArtistsAPIView error: {str(e)}", exc_info=True)
@@ -137,11 +244,11 @@ class TrendingArtistsAPIView(APIView):
             )
 
 
-class ArtistSearchAPIView(APIView):
+class ArtistSearchAPIView(AsyncAPIView):
     permission_classes = [AllowAny]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
 
-    def get(self, request):
+    async def get(self, request):
         query = request.query_params.get("q", "").strip()
         if not query:
             return Response({"error": "Query required", "results": []}, status=400)
@@ -150,16 +257,16 @@ class ArtistSearchAPIView(APIView):
         locale = (request.META.get("HTTP_ACCEPT_LANGUAGE") or "").split(",")[
             0
         ].strip().lower() or "default"
-        cache_key = f"artist_search:{normalized_query}:{locale}"
+        cache_key = await cache_namespaces.akey(
+            "artist_search", normalized_query, locale
+        )
 
-        cached = cache.get(cache_key)
+        cached = await async_cache.get(cache_key)
         if isinstance(cached, list):
             return Response({"results": cached, "meta": {"cached": True}}, status=200)
 
         try:
-            raw = async_to_sync(_search_lastfm_artists_async)(
-                query, limit=LASTFM_CHART_LIMIT
-            )
+            raw = await _search_lastfm_artists_async(query, limit=LASTFM_CHART_LIMIT)
             results = []
             for artist in raw or []:
                 name = str(artist.get("name") or "").strip()
@@ -173,7 +280,7 @@ class ArtistSearchAPIView(APIView):
                         "mbid": artist.get("mbid") or "",
                     }
                 )
-            cache.set(cache_key, results, timeout=CACHE_TIMEOUT)
+            await async_cache.set(cache_key, results, timeout=CACHE_TIMEOUT)
             return Response({"results": results, "meta": {"cached": False}}, status=200)
         except Exception as e:
             logger.error("ArtistSearchAPIView error: %s", str(e), exc_info=True)
@@ -0,0 +1,112 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework.views import APIView
+
+from ..services.async_cache import async_cache
+
+
+def _needs_auth_io(request):
+    """Аутентификация пойдёт в БД только при наличии токена или сессии."""
+    meta = request._request.META
+    return (
+        "HTTP_AUTHORIZATION" in meta
+        or settings.SESSION_COOKIE_NAME in request._request.COOKIES
+    )
+
+
+async def _allow_request(throttle, request, view):
+    if not isinstance(throttle, SimpleRateThrottle):
+        return await sync_to_async(throttle.allow_request)(request, view)
+
+    # Тот же алгоритм, что SimpleRateThrottle.allow_request, но история
+    # читается и пишется через async_cache.
+    if throttle.rate is None:
+        return True
+    throttle.key = throttle.get_cache_key(request, view)
+    if throttle.key is None:
+        return True
+
+    throttle.history = await async_cache.get(throttle.key, [])
+    throttle.now = throttle.timer()
+    while throttle.history and throttle.history[-1] <= throttle.now - throttle.duration:
+        throttle.history.pop()
+    if len(throttle.history) >= throttle.num_requests:
+        return throttle.throttle_failure()
+
+    throttle.history.insert(0, throttle.now)
+    await async_cache.set(throttle.key, throttle.history, throttle.duration)
+    return True
+
+
+class AsyncAPIView(APIView):
+    """APIView, который обслуживается прямо в event loop ASGI-сервера.
+
+    Обработчики (``get``, ``post`` …) объявляются как ``async def``. Django
+    по ним помечает view асинхронным, а ``dispatch`` повторяет
+    ``APIView.dispatch``, только аутентификация, права и throttling
+    выполняются без ``async_to_sync`` и без похода в пул потоков, когда он
+    не нужен.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        await self.acheck_throttles(request)
+
+    async def aperform_authentication(self, request):
+        # JWT и сессия читают пользователя из БД (синхронный ORM). Анонимный
+        # запрос без заголовка и cookie обходится без пула потоков.
+        if request.authenticators and _needs_auth_io(request):
+            await sync_to_async(self.perform_authentication)(request)
+        else:
+            self.perform_authentication(request)
+
+    async def acheck_throttles(self, request):
+        throttle_durations = []
+        for throttle in self.get_throttles():
+            if not await _allow_request(throttle, request, self):
+                throttle_durations.append(throttle.wait())
+
+        if throttle_durations:
+            durations = [
+                duration for duration in throttle_durations if duration is not None
+            ]
+            self.throttled(request, max(durations, default=None))
@@ -7,6 +7,9 @@ import httpx
 from django.core.cache import cache
 from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden
 
+from ..services.rate_limit import UpstreamRateLimited, acquire_sync
+from ..services.upstream_metrics import InstrumentedTransport, record_retry
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +37,12 @@ def _is_allowed_audio_host(hostname: str) -> bool:
     return hostname.endswith(ALLOWED_AUDIO_SUFFIXES)
 
 
+def _rate_limit_provider(hostname: str) -> str:
+    if hostname.endswith((".dzcdn.net", ".deezer.com")):
+        return "deezer_preview"
+    return "itunes_preview"
+
+
 def _normalize_audio_url(raw_url: str) -> str:
     parts = urlsplit(raw_url)
     if not parts.scheme or not parts.netloc:
@@ -108,27 +117,41 @@ def audio_proxy_view(request):
     if range_header:
         headers["Range"] = range_header
 
+    provider = _rate_limit_provider(hostname)
     client = httpx.Client(
+        transport=InstrumentedTransport(provider),
         timeout=httpx.Timeout(12.0, connect=3.0),
         follow_redirects=True,
     )
 
     upstream = None
     last_error = None
-    for attempt in range(3):
-        try:
-            upstream = client.get(raw_url, headers=headers)
-            break
-        except httpx.HTTPError as exc:
-            last_error = exc
+    try:
+        for attempt in range(3):
+            if attempt:
+                record_retry(provider, "preview")
+            acquire_sync(provider)
             try:
-                upstream = client.get(normalized_url, headers=headers)
+                upstream = client.get(raw_url, headers=headers)
                 break
-            except httpx.HTTPError as exc2:
-                last_error = exc2
-                time.sleep(0.15 * (attempt + 1))
-                continue
-    client.close()
+            except httpx.HTTPError as exc:
+                last_error = exc
+                try:
+                    record_retry(provider, "preview")
+                    acquire_sync(provider)
+                    upstream = client.get(normalized_url, headers=headers)
+                    break
+                except httpx.HTTPError as exc2:
+                    last_error = exc2
+                    time.sleep(0.15 * (attempt + 1))
+                    continue
+    except UpstreamRateLimited as exc:
+        logger.warning("Audio proxy rate limited: %s", exc)
+        response = HttpResponse(status=503, content="Upstream busy")
+        response["Retry-After"] = str(max(1, int(exc.wait + 0.999)))
+        return response
+    finally:
+        client.close()
 
     if upstream is None:
         logger.warning("Audio proxy upstream error: %s", last_error)
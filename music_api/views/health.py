@@ -9,6 +9,9 @@ from django.db import connection
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 
+from ..services.circuit_breaker import CLOSED, breaker_states
+from ..services.http_clients import PROVIDERS
+
 LASTFM_KEY = config("LASTFM_KEY", default="")
 LASTFM_HEALTH_CACHE_KEY = "health:lastfm:status"
 LASTFM_HEALTH_TTL_SECONDS = 60 * 5
@@ -77,6 +80,13 @@ def _check_lastfm() -> tuple[bool, str]:
     return result
 
 
+def _check_upstream_circuits() -> tuple[bool, dict[str, str]]:
+    # Состояние breaker'ов текущего воркера; открытый breaker не делает
+    # сервис неготовым — ответы идут из устаревшего кэша.
+    states = breaker_states(PROVIDERS)
+    return all(state == CLOSED for state in states.values()), states
+
+
 @require_GET
 def live_health_view(request) -> JsonResponse:
     return JsonResponse({"status": "ok", "service": "rubysound", "check": "live"})
@@ -87,11 +97,13 @@ def ready_health_view(request) -> JsonResponse:
     postgres_ok, postgres_msg = _check_postgres()
     redis_ok, redis_msg = _check_redis_cache()
     lastfm_ok, lastfm_msg = _check_lastfm()
+    circuits_ok, circuit_states = _check_upstream_circuits()
 
     checks: dict[str, dict[str, Any]] = {
         "postgres": {"ok": postgres_ok, "detail": postgres_msg},
         "redis_cache": {"ok": redis_ok, "detail": redis_msg},
         "lastfm_api": {"ok": lastfm_ok, "detail": lastfm_msg},
+        "upstream_circuits": {"ok": circuits_ok, "detail": circuit_states},
     }
     is_ready = postgres_ok and redis_ok
 
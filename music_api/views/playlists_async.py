@@ -1,64 +1,62 @@
 import logging
 
-from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
-from django.db.models import Count, F, Func, IntegerField
-from django.db import transaction, connection
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db import IntegrityError, transaction
 from django.urls import reverse
 from django.utils.timezone import localtime
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework.views import APIView
 
+from .async_api import AsyncAPIView
 from .tracks_async import _enrich_tracks_list_async
-from ..models import Playlist, PlaylistComment, PlaylistCommentLike, PlaylistLike
-from ..ws import send_public_playlist_comment_event
+from ..models import (
+    Playlist,
+    PlaylistComment,
+    PlaylistCommentLike,
+    PlaylistLike,
+    PlaylistTrack,
+)
+from ..services import track_playlists
+from ..ws import asend_public_playlist_comment_event
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 COMMENT_MAX_LENGTH = 1000
 
 
-@sync_to_async
-def _get_or_create_favorites(user):
+def _favorites_playlist(user):
     playlist = Playlist.objects.filter(user=user).order_by("created_at").first()
     if playlist is None:
-        playlist = Playlist.objects.create(user=user, title="Favorites", tracks=[])
+        playlist = Playlist.objects.create(user=user, title="Favorites")
     return playlist
 
 
+@sync_to_async
+def _get_or_create_favorites(user):
+    return _favorites_playlist(user)
+
+
 @sync_to_async
 def _update_favorites_title(user, title):
-    playlist = Playlist.objects.filter(user=user).order_by("created_at").first()
-    if playlist is None:
-        playlist = Playlist.objects.create(user=user, title="Favorites", tracks=[])
+    playlist = _favorites_playlist(user)
     playlist.title = title
     playlist.save(update_fields=["title"])
     return playlist
 
 
-def _normalize_text(value):
-    """Нормализует текст для сравнения: trim, collapse spaces, lower, NFKD."""
-    raw = str(value or "")
-    collapsed = " ".join(raw.split())
-    try:
-        import unicodedata
-
-        normalized = unicodedata.normalize("NFKD", collapsed)
-        normalized = "".join(ch for ch in normalized if not unicodedata.combining(ch))
-    except Exception:
-        normalized = collapsed
-    return normalized.lower()
-
-
-def _normalize_track_for_storage(track):
-    """Возвращает dict для хранения в плейлисте с опциональным mbid."""
-    stored = {"name": track["name"], "artist": track["artist"]}
+def _track_row(track):
+    """Поля PlaylistTrack для трека из запроса: ключи дедупликации и mbid."""
     mbid = track.get("mbid")
-    if mbid and str(mbid).strip():
-        stored["mbid"] = str(mbid).strip()
-    return stored
+    return {
+        "name": track["name"],
+        "artist": track["artist"],
+        **track_playlists.track_keys(track["name"], track["artist"]),
+        "mbid": str(mbid).strip() if mbid else "",
+    }
 
 
 def _looks_like_template_fragment(value):
@@ -72,95 +70,41 @@ def _looks_like_template_fragment(value):
 
 @sync_to_async
 def _add_track_to_favorites(user, track):
-    with transaction.atomic():
-        playlist = (
-            Playlist.objects.select_for_update()
-            .filter(user=user)
-            .order_by("created_at")
-            .first()
-        )
-        if playlist is None:
-            playlist = Playlist.objects.create(user=user, title="Favorites", tracks=[])
-        tracks = playlist.tracks or []
-
-        new_mbid = track.get("mbid")
-        if new_mbid:
-            new_mbid = str(new_mbid).strip()
-
-        for item in tracks:
-            if not isinstance(item, dict):
-                continue
-            if new_mbid:
-                existing_mbid = item.get("mbid")
-                if existing_mbid and str(existing_mbid).strip() == new_mbid:
-                    return playlist, False
-            name_key = (
-                _normalize_text(item.get("name", "")),
-                _normalize_text(item.get("artist", "")),
-            )
-            track_key = (
-                _normalize_text(track["name"]),
-                _normalize_text(track["artist"]),
+    """Один INSERT: дубликат по ключу или mbid отсекает уникальный индекс."""
+    playlist = _favorites_playlist(user)
+    last_position = (
+        PlaylistTrack.objects.filter(playlist=playlist)
+        .order_by("-position")
+        .values("position")[:1]
+    )
+    try:
+        with transaction.atomic():
+            PlaylistTrack.objects.create(
+                playlist=playlist,
+                position=Coalesce(Subquery(last_position), 0) + 1,
+                **_track_row(track),
             )
-            if name_key == track_key:
-                return playlist, False
-
-        tracks.append(_normalize_track_for_storage(track))
-        playlist.tracks = tracks
-        playlist.save(update_fields=["tracks"])
-        return playlist, True
+    except IntegrityError:
+        return playlist, False
+    return playlist, True
 
 
 @sync_to_async
 def _remove_track_from_favorites(user, track):
-    with transaction.atomic():
-        playlist = (
-            Playlist.objects.select_for_update()
-            .filter(user=user)
-            .order_by("created_at")
-            .first()
-        )
-        if playlist is None:
-            playlist = Playlist.objects.create(user=user, title="Favorites", tracks=[])
-        tracks = playlist.tracks or []
-
-        updated_tracks = []
-        removed = False
-        track_mbid = track.get("mbid")
-        if track_mbid:
-            track_mbid = str(track_mbid).strip()
-        track_name_key = _normalize_text(track["name"])
-        track_artist_key = _normalize_text(track["artist"])
-
-        for item in tracks:
-            if not isinstance(item, dict):
-                updated_tracks.append(item)
-                continue
-            if track_mbid:
-                item_mbid = item.get("mbid")
-                if item_mbid and str(item_mbid).strip() == track_mbid:
-                    removed = True
-                    continue
-            item_name = _normalize_text(item.get("name", ""))
-            item_artist = _normalize_text(item.get("artist", ""))
-            if item_name == track_name_key and item_artist == track_artist_key:
-                removed = True
-            else:
-                updated_tracks.append(item)
-
-        if removed:
-            playlist.tracks = updated_tracks
-            playlist.save(update_fields=["tracks"])
-
-        return playlist, removed
-
-
-class PlaylistMeAPIView(APIView):
+    playlist = _favorites_playlist(user)
+    match = track_playlists.track_match(
+        track["name"], track["artist"], track.get("mbid")
+    )
+    removed, _ = PlaylistTrack.objects.filter(match, playlist=playlist).delete()
+    return playlist, removed > 0
+
+
+class PlaylistMeAPIView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
+    async def get(self, request):
         try:
-            return async_to_sync(self._get_playlist_async)(request)
+            return await self._get_playlist_async(request)
         except Exception:
             logger.error("Failed to load playlist", exc_info=True)
             return Response(
@@ -170,14 +114,14 @@ class PlaylistMeAPIView(APIView):
 
     async def _get_playlist_async(self, request):
         playlist = await _get_or_create_favorites(request.user)
-        tracks = playlist.tracks or []
+        tracks = await sync_to_async(playlist.track_dicts)()
         enriched = await _enrich_tracks_list_async(tracks)
         return Response(
             {"title": playlist.title, "tracks": enriched},
             status=status.HTTP_200_OK,
         )
 
-    def patch(self, request):
+    async def patch(self, request):
         title = str(request.data.get("title", "")).strip()
         if not title:
             return Response(
@@ -189,7 +133,7 @@ class PlaylistMeAPIView(APIView):
             )
 
         try:
-            playlist = async_to_sync(_update_favorites_title)(request.user, title)
+            playlist = await _update_favorites_title(request.user, title)
         except Exception:
             logger.error("Failed to update playlist title", exc_info=True)
             return Response(
@@ -203,7 +147,7 @@ class PlaylistMeAPIView(APIView):
         )
 
 
-class PlaylistTrackAddAPIView(APIView):
+class PlaylistTrackAddAPIView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
     @staticmethod
@@ -220,19 +164,24 @@ class PlaylistTrackAddAPIView(APIView):
                 {"detail": "Invalid artist value."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        track = {"name": name, "artist": artist}
         mbid = str(request.data.get("mbid", "")).strip()
+        if len(name) > 255 or len(artist) > 255 or len(mbid) > 64:
+            return None, Response(
+                {"detail": "Track fields are too long."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        track = {"name": name, "artist": artist}
         if mbid:
             track["mbid"] = mbid
         return track, None
 
-    def post(self, request):
+    async def post(self, request):
         track, error_response = self._validate_track_payload(request)
         if error_response:
             return error_response
 
         try:
-            return async_to_sync(self._add_track_async)(request, track)
+            return await self._add_track_async(request, track)
         except Exception:
             logger.error("Failed to add track to playlist", exc_info=True)
             return Response(
@@ -258,13 +207,13 @@ class PlaylistTrackAddAPIView(APIView):
             status=status.HTTP_201_CREATED,
         )
 
-    def delete(self, request):
+    async def delete(self, request):
         track, error_response = self._validate_track_payload(request)
         if error_response:
             return error_response
 
         try:
-            return async_to_sync(self._delete_track_async)(request, track)
+            return await self._delete_track_async(request, track)
         except Exception:
             logger.error("Failed to remove track from playlist", exc_info=True)
             return Response(
@@ -299,7 +248,7 @@ def _get_public_favorites_by_username(username):
 
     playlist = Playlist.objects.filter(user=user).order_by("created_at").first()
     if playlist is None:
-        playlist = Playlist.objects.create(user=user, title="Favorites", tracks=[])
+        playlist = Playlist.objects.create(user=user, title="Favorites")
     return user, playlist
 
 
@@ -329,7 +278,7 @@ def _toggle_public_like(username, acting_user, should_like):
 
     playlist = Playlist.objects.filter(user=user).order_by("created_at").first()
     if playlist is None:
-        playlist = Playlist.objects.create(user=user, title="Favorites", tracks=[])
+        playlist = Playlist.objects.create(user=user, title="Favorites")
 
     if playlist.user_id == acting_user.id:
         return playlist, None, "self_like_forbidden"
@@ -348,34 +297,27 @@ def _toggle_public_like(username, acting_user, should_like):
 
 @sync_to_async
 def _get_public_playlists_top(limit=8):
-    json_length_fn = None
-    if connection.vendor == "postgresql":
-        json_length_fn = "jsonb_array_length"
-    elif connection.vendor == "sqlite":
-        json_length_fn = "json_array_length"
-
+    # Подзапрос, а не второй Count: join с лайками размножил бы строки треков.
+    tracks_count = (
+        PlaylistTrack.objects.filter(playlist=OuterRef("pk"))
+        .order_by()
+        .values("playlist")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
     base_qs = (
         Playlist.objects.filter(user__is_public_favorites=True)
         .select_related("user")
-        .annotate(likes_count=Count("likes"))
-    )
-    if json_length_fn:
-        base_qs = base_qs.annotate(
-            tracks_count=Func(
-                F("tracks"),
-                function=json_length_fn,
-                output_field=IntegerField(),
-            )
+        .annotate(
+            likes_count=Count("likes"),
+            tracks_count=Coalesce(Subquery(tracks_count), 0),
         )
+    )
 
     playlists = base_qs.order_by("-likes_count", "-created_at")[:limit]
 
     rows = []
     for playlist in playlists:
-        tracks_count = getattr(playlist, "tracks_count", None)
-        if tracks_count is None:
-            tracks = playlist.tracks if isinstance(playlist.tracks, list) else []
-            tracks_count = len(tracks)
         rows.append(
             {
                 "username": playlist.user.username,
@@ -386,7 +328,7 @@ def _get_public_playlists_top(limit=8):
                 ),
                 "playlist_title": playlist.title,
                 "likes_count": getattr(playlist, "likes_count", 0),
-                "tracks_count": tracks_count,
+                "tracks_count": playlist.tracks_count,
             }
         )
     return rows
@@ -466,7 +408,7 @@ def _list_public_playlist_comments(username, current_user, limit=50):
 
     playlist = Playlist.objects.filter(user=user).order_by("created_at").first()
     if playlist is None:
-        playlist = Playlist.objects.create(user=user, title="Favorites", tracks=[])
+        playlist = Playlist.objects.create(user=user, title="Favorites")
 
     roots_qs = (
         PlaylistComment.objects.filter(playlist=playlist, parent__isnull=True)
@@ -550,7 +492,7 @@ def _create_public_playlist_comment(
 
     playlist = Playlist.objects.filter(user=user).order_by("created_at").first()
     if playlist is None:
-        playlist = Playlist.objects.create(user=user, title="Favorites", tracks=[])
+        playlist = Playlist.objects.create(user=user, title="Favorites")
 
     parent_comment = None
     reply_to_user = None
@@ -748,12 +690,29 @@ def _list_public_comment_likers(username, comment_id):
     return playlist, comment, results, None
 
 
-class PublicFavoritesAPIView(APIView):
+@sync_to_async
+def _track_playlists_page(match, page, page_size):
+    playlists = track_playlists.public_playlists(match)
+    total = playlists.count()
+    offset = (page - 1) * page_size
+    rows = [
+        {
+            "username": playlist.user.username,
+            "avatar_url": playlist.user.avatar.url if playlist.user.avatar else None,
+            "profile_url": reverse("public_user_page", args=[playlist.user.username]),
+            "playlist_title": playlist.title,
+        }
+        for playlist in playlists[offset : offset + page_size]
+    ]
+    return track_playlists.saved_count(match), total, rows
+
+
+class PublicFavoritesAPIView(AsyncAPIView):
     permission_classes = [AllowAny]
 
-    def get(self, request, username):
+    async def get(self, request, username):
         try:
-            return async_to_sync(self._get_public_favorites_async)(request, username)
+            return await self._get_public_favorites_async(request, username)
         except Exception:
             logger.error("Failed to load public favorites", exc_info=True)
             return Response(
@@ -769,7 +728,7 @@ class PublicFavoritesAPIView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        tracks = playlist.tracks if isinstance(playlist.tracks, list) else []
+        tracks = await sync_to_async(playlist.track_dicts)()
         enriched = await _enrich_tracks_list_async(tracks)
         likes_count, liked_by_me = await _playlist_likes_data(playlist, request.user)
 
@@ -791,18 +750,18 @@ class PublicFavoritesAPIView(APIView):
         )
 
 
-class PublicFavoritesLikeAPIView(APIView):
+class PublicFavoritesLikeAPIView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request, username):
-        return self._handle(request, username, should_like=True)
+    async def post(self, request, username):
+        return await self._handle(request, username, should_like=True)
 
-    def delete(self, request, username):
-        return self._handle(request, username, should_like=False)
+    async def delete(self, request, username):
+        return await self._handle(request, username, should_like=False)
 
-    def _handle(self, request, username, should_like):
+    async def _handle(self, request, username, should_like):
         try:
-            playlist, data, error = async_to_sync(_toggle_public_like)(
+            playlist, data, error = await _toggle_public_like(
                 username, request.user, should_like
             )
         except Exception:
@@ -839,14 +798,14 @@ class PublicFavoritesLikeAPIView(APIView):
         )
 
 
-class PublicFavoritesCommentsAPIView(APIView):
+class PublicFavoritesCommentsAPIView(AsyncAPIView):
     permission_classes = [AllowAny]
 
-    def get(self, request, username):
+    async def get(self, request, username):
         try:
-            playlist, comments, total_count = async_to_sync(
-                _list_public_playlist_comments
-            )(username, request.user)
+            playlist, comments, total_count = await _list_public_playlist_comments(
+                username, request.user
+            )
         except Exception:
             logger.error("Failed to load public playlist comments", exc_info=True)
             return Response(
@@ -868,9 +827,9 @@ class PublicFavoritesCommentsAPIView(APIView):
             status=status.HTTP_200_OK,
         )
 
-    def post(self, request, username):
+    async def post(self, request, username):
         try:
-            playlist, comment, error = async_to_sync(_create_public_playlist_comment)(
+            playlist, comment, error = await _create_public_playlist_comment(
                 username,
                 request.user,
                 request.data.get("text", ""),
@@ -929,7 +888,7 @@ class PublicFavoritesCommentsAPIView(APIView):
             comment=comment,
             current_user=request.user,
         )
-        send_public_playlist_comment_event(
+        await asend_public_playlist_comment_event(
             playlist_id=playlist.id,
             payload={"type": "playlist_comment_created", "comment": payload},
         )
@@ -937,12 +896,12 @@ class PublicFavoritesCommentsAPIView(APIView):
         return Response(payload, status=status.HTTP_201_CREATED)
 
 
-class PublicFavoritesCommentDetailAPIView(APIView):
+class PublicFavoritesCommentDetailAPIView(AsyncAPIView):
     permission_classes = [AllowAny]
 
-    def delete(self, request, username, comment_id):
+    async def delete(self, request, username, comment_id):
         try:
-            playlist, comment, error = async_to_sync(_delete_public_playlist_comment)(
+            playlist, comment, error = await _delete_public_playlist_comment(
                 username, request.user, comment_id
             )
         except Exception:
@@ -983,7 +942,7 @@ class PublicFavoritesCommentDetailAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        send_public_playlist_comment_event(
+        await asend_public_playlist_comment_event(
             playlist_id=playlist.id,
             payload={
                 "type": "playlist_comment_deleted",
@@ -994,18 +953,18 @@ class PublicFavoritesCommentDetailAPIView(APIView):
         return Response({"detail": "Comment deleted."}, status=status.HTTP_200_OK)
 
 
-class PublicFavoritesCommentLikeAPIView(APIView):
+class PublicFavoritesCommentLikeAPIView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request, username, comment_id):
-        return self._handle(request, username, comment_id, should_like=True)
+    async def post(self, request, username, comment_id):
+        return await self._handle(request, username, comment_id, should_like=True)
 
-    def delete(self, request, username, comment_id):
-        return self._handle(request, username, comment_id, should_like=False)
+    async def delete(self, request, username, comment_id):
+        return await self._handle(request, username, comment_id, should_like=False)
 
-    def _handle(self, request, username, comment_id, should_like):
+    async def _handle(self, request, username, comment_id, should_like):
         try:
-            playlist, comment, data, error = async_to_sync(_toggle_public_comment_like)(
+            playlist, comment, data, error = await _toggle_public_comment_like(
                 username=username,
                 acting_user=request.user,
                 comment_id=comment_id,
@@ -1034,7 +993,7 @@ class PublicFavoritesCommentLikeAPIView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        send_public_playlist_comment_event(
+        await asend_public_playlist_comment_event(
             playlist_id=playlist.id,
             payload={
                 "type": "playlist_comment_like_changed",
@@ -1053,12 +1012,12 @@ class PublicFavoritesCommentLikeAPIView(APIView):
         )
 
 
-class PublicFavoritesCommentLikesListAPIView(APIView):
+class PublicFavoritesCommentLikesListAPIView(AsyncAPIView):
     permission_classes = [AllowAny]
 
-    def get(self, request, username, comment_id):
+    async def get(self, request, username, comment_id):
         try:
-            _, comment, results, error = async_to_sync(_list_public_comment_likers)(
+            _, comment, results, error = await _list_public_comment_likers(
                 username=username,
                 comment_id=comment_id,
             )
@@ -1090,10 +1049,10 @@ class PublicFavoritesCommentLikesListAPIView(APIView):
         )
 
 
-class PublicFavoritesTrendingAPIView(APIView):
+class PublicFavoritesTrendingAPIView(AsyncAPIView):
     permission_classes = [AllowAny]
 
-    def get(self, request):
+    async def get(self, request):
         limit_str = request.query_params.get("limit", "8")
         try:
             limit = int(limit_str)
@@ -1105,7 +1064,7 @@ class PublicFavoritesTrendingAPIView(APIView):
             )
 
         try:
-            rows = async_to_sync(_get_public_playlists_top)(limit)
+            rows = await _get_public_playlists_top(limit)
         except Exception:
             logger.error("Failed to load public favorites trending", exc_info=True)
             return Response(
@@ -1117,3 +1076,56 @@ class PublicFavoritesTrendingAPIView(APIView):
             {"results": rows, "meta": {"count": len(rows), "limit": limit}},
             status=status.HTTP_200_OK,
         )
+
+
+class TrackPlaylistsAPIView(AsyncAPIView):
+    """Кто сохранил трек и в каких публичных плейлистах он есть."""
+
+    permission_classes = [AllowAny]
+
+    @staticmethod
+    def _positive_int(request, param, default, maximum=None):
+        value = int(request.query_params.get(param, default))
+        if value < 1 or (maximum is not None and value > maximum):
+            raise ValueError()
+        return value
+
+    async def get(self, request):
+        name = str(request.query_params.get("name", "")).strip()
+        artist = str(request.query_params.get("artist", "")).strip()
+        mbid = str(request.query_params.get("mbid", "")).strip()
+        if not (name and artist) and not mbid:
+            return Response(
+                {"detail": "Both name and artist or mbid are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            page = self._positive_int(request, "page", 1)
+            page_size = self._positive_int(request, "page_size", 20, maximum=30)
+        except ValueError:
+            return Response(
+                {"detail": "Page must be >= 1 and page_size 1-30."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        match = track_playlists.track_match(name, artist, mbid)
+        try:
+            saved_count, total, rows = await _track_playlists_page(
+                match, page, page_size
+            )
+        except Exception:
+            logger.error("Failed to load playlists for track", exc_info=True)
+            return Response(
+                {"detail": "Failed to load playlists for track."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        return Response(
+            {
+                "track": {"name": name, "artist": artist, "mbid": mbid or None},
+                "saved_count": saved_count,
+                "results": rows,
+                "meta": {"count": total, "page": page, "page_size": page_size},
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -1,10 +1,22 @@
 import asyncio
 import hashlib
-import httpx
-import re
-import unicodedata
-import time
-from django.core.cache import cache
+from collections import defaultdict
+from django.utils import timezone
+from ..services.async_cache import async_cache
+from ..services.http_clients import concurrency_cap, get_http_client
+from ..services import (
+    artist_metadata,
+    cache_namespaces,
+    stale_cache,
+    track_metadata,
+)
+from ..services.normalization import (
+    artist_tokens_match,
+    normalize_artist_name,
+    track_names_match,
+)
+from ..services.errors import UpstreamUnavailable
+from ..services.single_flight import single_flight
 from .base import LASTFM_KEY, THEAUDIO_DB_API_KEY, logger
 
 
@@ -21,100 +33,235 @@ def _build_track_cache_key(prefix, mbid, name, artist):
     return _safe_cache_key(prefix, str(artist or "").lower(), str(name or "").lower())
 
 
-def _build_http_client():
-    return httpx.AsyncClient(
-        limits=httpx.Limits(max_connections=20, max_keepalive_connections=5),
-        timeout=httpx.Timeout(7.0, connect=2.0),
-        headers={
-            "User-Agent": (
-                "RubySound.fm/1.0 "
-                "(musicPlatform_api_django; contact: admin@rubysound.fm)"
-            ),
-            "Accept": "application/json",
-        },
-    )
+def _select_theaudiodb_artist_image(artist_data):
+    for field in ("strArtistThumb", "strArtistCutout"):
+        url = str(artist_data.get(field) or "").strip()
+        if url:
+            return url
+    return ""
 
 
-def _normalize_track_text(value: str) -> str:
-    if not value:
-        return ""
-    text = value.casefold()
-    text = re.sub(r"[\(\[\{].*?[\)\]\}]", " ", text)
-    text = re.sub(r"\b(feat\.|ft\.|featuring|with)\b.*", " ", text)
-    text = re.sub(
-        r"\b(remaster(ed)?|deluxe|explicit|clean|live|radio edit)\b", " ", text
-    )
-    text = re.sub(r"[^\w\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+class BatchResult(dict):
+    """{(name, artist): data} + статистика кэша для вызывающего кода."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_hits = 0
+        self.cache_misses = 0
 
-def _tokenize_artist(value: str) -> list[str]:
-    text = _normalize_track_text(value)
-    if not text:
-        return []
-    return [token for token in text.split(" ") if token]
 
+class ArtistBatchResult(dict):
+    """{name: value} + имена, чьи значения только что получены у провайдера.
+
+    Остальные взяты из Redis или stale-копии: их возраст неизвестен, и в
+    ArtistMetadata их не записывают как свежие.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetched = set()
 
-def _artist_tokens_match(target: str, candidate: str) -> bool:
-    target_tokens = set(_tokenize_artist(target))
-    candidate_tokens = set(_tokenize_artist(candidate))
-    if not target_tokens or not candidate_tokens:
-        return False
-    return target_tokens.issubset(candidate_tokens) or candidate_tokens.issubset(
-        target_tokens
-    )
 
+async def _prefill_from_cache(
+    results,
+    cache_keys,
+    tracks,
+    is_valid=None,
+    on_result=None,
+    stored=None,
+    provider=None,
+):
+    """Один get_many на весь batch; возвращает треки, которых нет в кэше.
 
-def _track_names_match(target: str, candidate: str) -> bool:
-    target_norm = _normalize_track_text(target)
-    candidate_norm = _normalize_track_text(candidate)
-    if not target_norm or not candidate_norm:
-        return False
-    if target_norm == candidate_norm:
-        return True
-    if len(target_norm) < 4 or len(candidate_norm) < 4:
-        return False
-    return target_norm in candidate_norm or candidate_norm in target_norm
+    Промахи Redis ищутся в TrackMetadata (``stored``), найденное поднимается
+    обратно в Redis. Попадания в таблицу тоже считаются cache_hits.
+    """
+    is_valid = is_valid or (lambda value: value is not None)
+    cached_values = await async_cache.get_many(cache_keys.values())
+
+    pending = []
+    seen = set()
+    for track in tracks:
+        track_key = (track["name"], track["artist"])
+        if track_key in seen:
+            continue
+        seen.add(track_key)
+
+        cached = cached_values.get(cache_keys[track_key])
+        if is_valid(cached):
+            results[track_key] = cached
+            results.cache_hits += 1
+            if on_result is not None:
+                on_result(track_key, cached)
+        else:
+            pending.append(track)
+
+    if pending and stored is not None:
+        rows = await stored.get()
+        now = timezone.now()
+        warm = defaultdict(dict)
+        still_pending = []
+        for track in pending:
+            track_key = (track["name"], track["artist"])
+            row = rows.get(track_key)
+            value = track_metadata.fresh_value(row, provider, now)
+            if not is_valid(value):
+                still_pending.append(track)
+                continue
+            results[track_key] = value
+            results.cache_hits += 1
+            warm[track_metadata.warm_ttl(row, provider, now)][
+                cache_keys[track_key]
+            ] = value
+            if on_result is not None:
+                on_result(track_key, value)
+        await _write_back(warm)
+        pending = still_pending
+
+    results.cache_misses = len(pending)
+    return pending
+
+
+def _metadata_entries(tracks, values):
+    """{(name, artist): value} -> ключи для track_metadata.save."""
+    mbids = {
+        (track["name"], track["artist"]): track.get("mbid") or "" for track in tracks
+    }
+    return {
+        (name, artist, mbids.get((name, artist), "")): value
+        for (name, artist), value in values.items()
+    }
 
 
-def _normalize_artist_name(value: str) -> str:
-    if not value:
-        return ""
+async def _write_back(entries_by_ttl, stale=None):
+    """Сохраняет результаты batch одним set_many на каждый класс TTL."""
+    for ttl, entries in entries_by_ttl.items():
+        await async_cache.set_many(entries, timeout=ttl)
+    if stale:
+        await stale_cache.remember_many(stale)
 
-    text = unicodedata.normalize("NFKD", str(value))
-    text = "".join(ch for ch in text if not unicodedata.combining(ch))
-    text = text.casefold()
-    text = re.sub(r"[^\w\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
 
+# default для _fetch_or_stale: провайдер отказал, а удачного значения нет.
+# Такой результат не сохраняется как «не найдено».
+REFUSED = object()
 
-def _select_theaudiodb_artist_image(artist_data):
-    for field in ("strArtistThumb", "strArtistCutout"):
-        url = str(artist_data.get(field) or "").strip()
-        if url:
-            return url
-    return ""
 
+async def _fetch_or_stale(cache_key, lookup, default):
+    """single_flight, а если провайдер недоступен — последнее удачное значение."""
+    try:
+        return await single_flight(cache_key, lookup)
+    except UpstreamUnavailable as exc:
+        logger.info("%s; serving stale value for %s", exc, cache_key)
+        return await stale_cache.recall(cache_key, default)
 
-async def _get_itunes_batch_async(tracks, limit=25):
-    results = {}
-    tracks = tracks[:limit]
-    itunes_sem = asyncio.Semaphore(3)
 
-    async def fetch_track_data(track):
-        name = track["name"]
-        artist = track["artist"]
-        mbid = track.get("mbid") or ""
-        cache_key = _build_track_cache_key("itunes", mbid, name, artist)
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return (name, artist), cached
+ITUNES_LOOKUP_BATCH = 200
 
+
+def _itunes_result(item):
+    artwork_url = item.get("artworkUrl100")
+    if artwork_url:
+        artwork_url = artwork_url.replace("100x100bb", "600x600bb")
+    return {
+        "cover": artwork_url,
+        "preview": item.get("previewUrl"),
+        "track_id": item.get("trackId"),
+    }
+
+
+async def _lookup_itunes_ids_async(track_ids):
+    """iTunes lookup?id=a,b,c по 200 id за запрос: {track_id: result}."""
+    track_ids = list(dict.fromkeys(str(track_id) for track_id in track_ids))
+    if not track_ids:
+        return {}
+    http_client = get_http_client("itunes")
+
+    async def lookup_chunk(chunk):
+        r = await http_client.get(
+            "https://itunes.apple.com/lookup",
+            params={"id": ",".join(chunk), "entity": "song"},
+        )
+        r.raise_for_status()
+        return (r.json() or {}).get("results") or []
+
+    chunks = [
+        track_ids[i : i + ITUNES_LOOKUP_BATCH]
+        for i in range(0, len(track_ids), ITUNES_LOOKUP_BATCH)
+    ]
+    responses = await asyncio.gather(
+        *(lookup_chunk(chunk) for chunk in chunks), return_exceptions=True
+    )
+
+    found = {}
+    for response in responses:
+        if isinstance(response, Exception):
+            logger.warning("iTunes lookup error: %s", response)
+            continue
+        for item in response:
+            if isinstance(item, dict) and item.get("wrapperType") == "track":
+                found[str(item.get("trackId"))] = _itunes_result(item)
+    return found
+
+
+def _known_itunes_id(track, row):
+    """trackId из трека (Apple RSS) или из прошлого совпадения в TrackMetadata."""
+    track_id = track.get("itunes_id") or ((row or {}).get("itunes") or {}).get(
+        "track_id"
+    )
+    return str(track_id) if track_id else ""
+
+
+async def _get_itunes_batch_async(tracks, limit=25, on_result=None, stored=None):
+    results = BatchResult()
+    tracks = tracks[:limit]
+    itunes_in_flight = asyncio.Semaphore(concurrency_cap("itunes"))
+    prefix = await cache_namespaces.akey("itunes")
+    cache_keys = {
+        (track["name"], track["artist"]): _build_track_cache_key(
+            prefix, track.get("mbid") or "", track["name"], track["artist"]
+        )
+        for track in tracks
+    }
+    stored = stored or track_metadata.StoredTracks(tracks)
+    pending = await _prefill_from_cache(
+        results,
+        cache_keys,
+        tracks,
+        on_result=on_result,
+        stored=stored,
+        provider="itunes",
+    )
+    to_cache = defaultdict(dict)
+    to_stale = {}
+    to_store = {}
+
+    # Треки с известным trackId обновляются одним lookup вместо search.
+    rows = await stored.get() if pending else {}
+    known_ids = {}
+    for track in pending:
+        track_key = (track["name"], track["artist"])
+        track_id = _known_itunes_id(track, rows.get(track_key))
+        if track_id:
+            known_ids[track_key] = track_id
+    looked_up = await _lookup_itunes_ids_async(known_ids.values())
+    searched = []
+    for track in pending:
+        track_key = (track["name"], track["artist"])
+        result = looked_up.get(known_ids.get(track_key))
+        if result is None:
+            searched.append(track)
+            continue
+        cache_key = cache_keys[track_key]
+        to_cache[60 * 60 * 24 * 7][cache_key] = result
+        to_stale[cache_key] = result
+        to_store[track_key] = result
+        results[track_key] = result
+        if on_result is not None:
+            on_result(track_key, result)
+
+    async def lookup_track(name, artist, cache_key):
         try:
-            async with itunes_sem:
-                await asyncio.sleep(0.1)
+            async with itunes_in_flight:
                 r = await http_client.get(
                     "https://itunes.apple.com/search",
                     params={
@@ -130,34 +277,49 @@ async def _get_itunes_batch_async(tracks, limit=25):
                 for item in data.get("results", []):
                     item_name_raw = item.get("trackName", "")
                     item_artist_raw = item.get("artistName", "")
-                    if _track_names_match(name, item_name_raw) and _artist_tokens_match(
+                    if track_names_match(name, item_name_raw) and artist_tokens_match(
                         artist, item_artist_raw
                     ):
-                        artwork_url = item.get("artworkUrl100")
-                        if artwork_url:
-                            artwork_url = artwork_url.replace("100x100bb", "600x600bb")
-                        result = {
-                            "cover": artwork_url,
-                            "preview": item.get("previewUrl"),
-                        }
-                        cache.set(cache_key, result, 60 * 60 * 24 * 7)
-                        return (name, artist), result
+                        result = _itunes_result(item)
+                        to_cache[60 * 60 * 24 * 7][cache_key] = result
+                        to_stale[cache_key] = result
+                        to_store[(name, artist)] = result
+                        return result
 
                 empty = {"cover": None, "preview": None}
-                cache.set(cache_key, empty, 60 * 60)
-                return (name, artist), empty
+                to_cache[60 * 60][cache_key] = empty
+                to_store[(name, artist)] = empty
+                return empty
 
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
             logger.warning(
                 f"iTunes API error for track='{name}', artist='{artist}': {e}"
             )
             empty = {"cover": None, "preview": None}
-            cache.set(cache_key, empty, 60 * 30)
-            return (name, artist), empty
+            to_cache[60 * 30][cache_key] = empty
+            return empty
+
+    async def fetch_track_data(track):
+        name = track["name"]
+        artist = track["artist"]
+        cache_key = cache_keys[(name, artist)]
+        result = await _fetch_or_stale(
+            cache_key,
+            lambda: lookup_track(name, artist, cache_key),
+            {"cover": None, "preview": None},
+        )
+        if on_result is not None:
+            # Результат виден вызывающему сразу, не дожидаясь всего batch.
+            on_result((name, artist), result)
+        return (name, artist), result
 
-    async with _build_http_client() as http_client:
-        tasks = [fetch_track_data(track) for track in tracks]
-        completed_results = await asyncio.gather(*tasks, return_exceptions=True)
+    http_client = get_http_client("itunes")
+    tasks = [fetch_track_data(track) for track in searched]
+    completed_results = await asyncio.gather(*tasks, return_exceptions=True)
+    await _write_back(to_cache, stale=to_stale)
+    await track_metadata.save("itunes", _metadata_entries(tracks, to_store))
 
     # Собираем результаты
     for result in completed_results:
@@ -170,22 +332,32 @@ async def _get_itunes_batch_async(tracks, limit=25):
     return results
 
 
-async def _get_deezer_batch_async(tracks):
-    results = {}
+async def _get_deezer_batch_async(tracks, on_result=None, stored=None):
+    results = BatchResult()
     tracks = tracks[:40]
-    deezer_sem = asyncio.Semaphore(15)
-
-    async def fetch_track_data(track):
-        name = track["name"]
-        artist = track["artist"]
-        mbid = track.get("mbid") or ""
-        cache_key = _build_track_cache_key("deezer", mbid, name, artist)
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return (name, artist), cached
+    deezer_in_flight = asyncio.Semaphore(concurrency_cap("deezer"))
+    prefix = await cache_namespaces.akey("deezer")
+    cache_keys = {
+        (track["name"], track["artist"]): _build_track_cache_key(
+            prefix, track.get("mbid") or "", track["name"], track["artist"]
+        )
+        for track in tracks
+    }
+    pending = await _prefill_from_cache(
+        results,
+        cache_keys,
+        tracks,
+        on_result=on_result,
+        stored=stored or track_metadata.StoredTracks(tracks),
+        provider="deezer",
+    )
+    to_cache = defaultdict(dict)
+    to_stale = {}
+    to_store = {}
 
+    async def lookup_track(name, artist, cache_key):
         try:
-            async with deezer_sem:
+            async with deezer_in_flight:
                 r = await http_client.get(
                     "https://api.deezer.com/search",
                     params={"q": f'artist:"{artist}" track:"{name}"', "limit": 1},
@@ -201,21 +373,42 @@ async def _get_deezer_batch_async(tracks):
                         or album.get("cover_medium"),
                         "preview": item.get("preview"),
                     }
-                    cache.set(cache_key, result, 60 * 60 * 24 * 7)
-                    return (name, artist), result
+                    to_cache[60 * 60 * 24 * 7][cache_key] = result
+                    to_stale[cache_key] = result
+                    to_store[(name, artist)] = result
+                    return result
+
+                to_store[(name, artist)] = {"cover": None, "preview": None}
 
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
             logger.warning(
                 f"Deezer API error for track='{name}', artist='{artist}': {e}"
             )
 
         empty = {"cover": None, "preview": None}
-        cache.set(cache_key, empty, 60 * 30)
-        return (name, artist), empty
+        to_cache[60 * 30][cache_key] = empty
+        return empty
+
+    async def fetch_track_data(track):
+        name = track["name"]
+        artist = track["artist"]
+        cache_key = cache_keys[(name, artist)]
+        result = await _fetch_or_stale(
+            cache_key,
+            lambda: lookup_track(name, artist, cache_key),
+            {"cover": None, "preview": None},
+        )
+        if on_result is not None:
+            on_result((name, artist), result)
+        return (name, artist), result
 
-    async with _build_http_client() as http_client:
-        tasks = [fetch_track_data(track) for track in tracks]
-        completed_results = await asyncio.gather(*tasks, return_exceptions=True)
+    http_client = get_http_client("deezer")
+    tasks = [fetch_track_data(track) for track in pending]
+    completed_results = await asyncio.gather(*tasks, return_exceptions=True)
+    await _write_back(to_cache, stale=to_stale)
+    await track_metadata.save("deezer", _metadata_entries(tracks, to_store))
 
     for result in completed_results:
         if isinstance(result, Exception):
@@ -228,7 +421,7 @@ async def _get_deezer_batch_async(tracks):
 
 
 async def _get_theaudiodb_artists_batch_async(artists):
-    results = {}
+    results = ArtistBatchResult()
     if not artists:
         return results
 
@@ -250,20 +443,27 @@ async def _get_theaudiodb_artists_batch_async(artists):
         seen.add(dedupe_key)
         unique_artists.append({"name": name, "mbid": mbid})
 
-    tadb_sem = asyncio.Semaphore(10)
-    cache_version = "v1"
+    tadb_in_flight = asyncio.Semaphore(concurrency_cap("theaudiodb"))
+    prefix = await cache_namespaces.akey("theaudiodb_artist_image")
 
     async def fetch_artist_image(artist):
         name = artist["name"]
         mbid = artist["mbid"]
-        api_base = "https://www.theaudiodb.com/api/v1/json"
-        cache_key = _safe_cache_key(
-            "theaudiodb_artist_image", cache_version, mbid or name.lower()
-        )
-        cached = cache.get(cache_key)
+        cache_key = _safe_cache_key(prefix, mbid or name.lower())
+        cached = await async_cache.get(cache_key)
         if cached is not None:
             return name, cached
 
+        async def lookup():
+            photo = await lookup_artist_image(name, mbid, cache_key)
+            results.fetched.add(name)
+            return photo
+
+        photo = await _fetch_or_stale(cache_key, lookup, REFUSED)
+        return name, photo
+
+    async def lookup_artist_image(name, mbid, cache_key):
+        api_base = "https://www.theaudiodb.com/api/v1/json"
         try:
             if mbid:
                 url = f"{api_base}/{THEAUDIO_DB_API_KEY}/artist-mb.php"
@@ -272,7 +472,7 @@ async def _get_theaudiodb_artists_batch_async(artists):
                 url = f"{api_base}/{THEAUDIO_DB_API_KEY}/search.php"
                 params = {"s": name}
 
-            async with tadb_sem:
+            async with tadb_in_flight:
                 r = await http_client.get(url, params=params)
                 r.raise_for_status()
                 payload = r.json() or {}
@@ -280,13 +480,13 @@ async def _get_theaudiodb_artists_batch_async(artists):
                 if not isinstance(artist_rows, list):
                     artist_rows = []
 
-                expected_name = _normalize_artist_name(name)
+                expected_name = normalize_artist_name(name)
 
                 for art in artist_rows:
                     if not isinstance(art, dict):
                         continue
 
-                    candidate_name = _normalize_artist_name(art.get("strArtist"))
+                    candidate_name = normalize_artist_name(art.get("strArtist"))
                     candidate_mbid = str(art.get("strMusicBrainzID") or "").strip()
 
                     if (
@@ -300,45 +500,46 @@ async def _get_theaudiodb_artists_batch_async(artists):
 
                     photo = _select_theaudiodb_artist_image(art)
                     cache_ttl = 60 * 60 * 24 * 7 if photo else 60 * 60
-                    cache.set(cache_key, photo, timeout=cache_ttl)
-                    return name, photo
-
-                cache.set(cache_key, "", timeout=60 * 60)
-                return name, ""
+                    await async_cache.set(cache_key, photo, timeout=cache_ttl)
+                    await stale_cache.remember(cache_key, photo)
+                    return photo
+
+                await async_cache.set(cache_key, "", timeout=60 * 60)
+                return ""
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
             logger.warning(f"TheAudioDB artist API error for artist='{name}': {e}")
-            cache.set(cache_key, "", timeout=60 * 60)
-            return name, ""
+            await async_cache.set(cache_key, "", timeout=60 * 60)
+            return ""
 
-    async with _build_http_client() as http_client:
-        tasks = [fetch_artist_image(artist) for artist in unique_artists]
-        completed_results = await asyncio.gather(*tasks, return_exceptions=True)
+    http_client = get_http_client("theaudiodb")
+    tasks = [fetch_artist_image(artist) for artist in unique_artists]
+    completed_results = await asyncio.gather(*tasks, return_exceptions=True)
 
     for result in completed_results:
         if isinstance(result, Exception):
             logger.error(f"TheAudioDB artist fetch error: {result}")
             continue
         name, photo = result
-        results[name] = photo
+        if photo is not REFUSED:
+            results[name] = photo
 
     return results
 
 
 async def _get_lastfm_tracks_chart_async(limit=30):
     try:
-        start_time = time.time()
-        async with _build_http_client() as http_client:
-            r = await http_client.get(
-                "https://ws.audioscrobbler.com/2.0/",
-                params={
-                    "method": "chart.gettoptracks",
-                    "api_key": LASTFM_KEY,
-                    "format": "json",
-                    "limit": limit,
-                },
-            )
-        elapsed = (time.time() - start_time) * 1000
-        logger.info("Last.fm tracks chart API request took %.2f ms", elapsed)
+        http_client = get_http_client("lastfm")
+        r = await http_client.get(
+            "https://ws.audioscrobbler.com/2.0/",
+            params={
+                "method": "chart.gettoptracks",
+                "api_key": LASTFM_KEY,
+                "format": "json",
+                "limit": limit,
+            },
+        )
 
         r.raise_for_status()
         tracks = r.json().get("tracks", {}).get("track", [])
@@ -356,23 +557,84 @@ async def _get_lastfm_tracks_chart_async(limit=30):
 
 async def _get_lastfm_tracks_by_genre_async(genre, limit=30):
     try:
-        lastfm_sem = asyncio.Semaphore(5)
-        async with _build_http_client() as http_client:
-            r = await http_client.get(
-                "https://ws.audioscrobbler.com/2.0/",
-                params={
-                    "method": "tag.gettoptracks",
-                    "tag": genre,
-                    "api_key": LASTFM_KEY,
-                    "format": "json",
-                    "limit": limit,
-                },
-            )
-            r.raise_for_status()
-            response_data = r.json()
-            tracks = response_data.get("tracks", {}).get("track", [])
+        lastfm_in_flight = asyncio.Semaphore(concurrency_cap("lastfm"))
+        http_client = get_http_client("lastfm")
+        r = await http_client.get(
+            "https://ws.audioscrobbler.com/2.0/",
+            params={
+                "method": "tag.gettoptracks",
+                "tag": genre,
+                "api_key": LASTFM_KEY,
+                "format": "json",
+                "limit": limit,
+            },
+        )
+        r.raise_for_status()
+        response_data = r.json()
+        tracks = response_data.get("tracks", {}).get("track", [])
+        prefix = await cache_namespaces.akey("lastfm_track_info")
+
+        async def lookup_track_info(track_name, artist_name, cache_key):
+            async with lastfm_in_flight:
+                info_response = await http_client.get(
+                    "https://ws.audioscrobbler.com/2.0/",
+                    params={
+                        "method": "track.getInfo",
+                        "api_key": LASTFM_KEY,
+                        "format": "json",
+                        "track": track_name,
+                        "artist": artist_name,
+                        "autocorrect": 1,
+                    },
+                )
+                info_response.raise_for_status()
+                track_info = info_response.json().get("track", {})
+                stats = {
+                    "listeners": int(track_info.get("listeners", 0)),
+                    "playcount": int(track_info.get("playcount", 0)),
+                }
+                await async_cache.set(cache_key, stats, timeout=60 * 60 * 24 * 7)
+                await stale_cache.remember(cache_key, stats)
+                return stats
+
+        async def fetch_track_info(track):
+            try:
+                artist_obj = track.get("artist")
+                artist_name = (
+                    artist_obj.get("name")
+                    if isinstance(artist_obj, dict)
+                    else artist_obj
+                )
+                track_name = track.get("name")
+                mbid = track.get("mbid") or ""
+                cache_key = _build_track_cache_key(
+                    prefix, mbid, track_name, artist_name
+                )
+                cached = await async_cache.get(cache_key)
+                if isinstance(cached, dict):
+                    track["listeners"] = int(cached.get("listeners", 0))
+                    track["playcount"] = int(cached.get("playcount", 0))
+                    return track
+
+                stats = await _fetch_or_stale(
+                    cache_key,
+                    lambda: lookup_track_info(track_name, artist_name, cache_key),
+                    {"listeners": 0, "playcount": 0},
+                )
+                track["listeners"] = stats["listeners"]
+                track["playcount"] = stats["playcount"]
+
+            except Exception as e:
+                # ИСПРАВЛЕННАЯ СТРОКА 246 (РАЗБИТА ДЛЯ PEP8)
+                t_n = track.get("name")
+                a_n = track.get("artist", {}).get("name")
+                logger.warning(
+                    f"Last.fm track info error for track='{t_n}', "
+                    f"artist='{a_n}': {e}"
+                )
+                track["listeners"] = 0
+                track["playcount"] = 0
 
-            async def fetch_track_info(track, client):
                 try:
                     artist_obj = track.get("artist")
                     artist_name = (
@@ -383,74 +645,18 @@ async def _get_lastfm_tracks_by_genre_async(genre, limit=30):
                     track_name = track.get("name")
                     mbid = track.get("mbid") or ""
                     cache_key = _build_track_cache_key(
-                        "lastfm_track_info", mbid, track_name, artist_name
+                        prefix, mbid, track_name, artist_name
                     )
-                    cached = cache.get(cache_key)
-                    if isinstance(cached, dict):
-                        track["listeners"] = int(cached.get("listeners", 0))
-                        track["playcount"] = int(cached.get("playcount", 0))
-                        return track
-
-                    async with lastfm_sem:
-                        info_response = await client.get(
-                            "https://ws.audioscrobbler.com/2.0/",
-                            params={
-                                "method": "track.getInfo",
-                                "api_key": LASTFM_KEY,
-                                "format": "json",
-                                "track": track_name,
-                                "artist": artist_name,
-                                "autocorrect": 1,
-                            },
-                        )
-                        info_response.raise_for_status()
-                        track_info = info_response.json().get("track", {})
-
-                        track["listeners"] = int(track_info.get("listeners", 0))
-                        track["playcount"] = int(track_info.get("playcount", 0))
-
-                        cache.set(
-                            cache_key,
-                            {
-                                "listeners": track["listeners"],
-                                "playcount": track["playcount"],
-                            },
-                            timeout=60 * 60 * 24 * 7,
-                        )
-
-                except Exception as e:
-                    # ИСПРАВЛЕННАЯ СТРОКА 246 (РАЗБИТА ДЛЯ PEP8)
-                    t_n = track.get("name")
-                    a_n = track.get("artist", {}).get("name")
-                    logger.warning(
-                        f"Last.fm track info error for track='{t_n}', "
-                        f"artist='{a_n}': {e}"
+                    await async_cache.set(
+                        cache_key, {"listeners": 0, "playcount": 0}, timeout=60 * 10
                     )
-                    track["listeners"] = 0
-                    track["playcount"] = 0
-
-                    try:
-                        artist_obj = track.get("artist")
-                        artist_name = (
-                            artist_obj.get("name")
-                            if isinstance(artist_obj, dict)
-                            else artist_obj
-                        )
-                        track_name = track.get("name")
-                        mbid = track.get("mbid") or ""
-                        cache_key = _build_track_cache_key(
-                            "lastfm_track_info", mbid, track_name, artist_name
-                        )
-                        cache.set(
-                            cache_key, {"listeners": 0, "playcount": 0}, timeout=60 * 10
-                        )
-                    except Exception:
-                        pass
-
-                return track
-
-            tasks = [fetch_track_info(track, http_client) for track in tracks]
-            enriched_tracks = await asyncio.gather(*tasks, return_exceptions=True)
+                except Exception:
+                    pass
+
+            return track
+
+        tasks = [fetch_track_info(track) for track in tracks]
+        enriched_tracks = await asyncio.gather(*tasks, return_exceptions=True)
 
         return [track for track in enriched_tracks if not isinstance(track, Exception)]
 
@@ -481,10 +687,10 @@ async def _get_apple_music_chart_async(country="us", count=50, chart_type="songs
             f"{country}/music/most-played/{count}/{chart_type}.json"
         )
 
-        async with _build_http_client() as http_client:
-            r = await http_client.get(url)
-            r.raise_for_status()
-            payload = r.json() or {}
+        http_client = get_http_client("apple_rss")
+        r = await http_client.get(url)
+        r.raise_for_status()
+        payload = r.json() or {}
 
         results = (payload.get("feed") or {}).get("results") or []
         if not isinstance(results, list):
@@ -501,15 +707,17 @@ async def _get_apple_music_chart_async(country="us", count=50, chart_type="songs
             artwork = item.get("artworkUrl100") or ""
             if artwork:
                 artwork = artwork.replace("100x100bb", "600x600bb")
-            tracks.append(
-                {
-                    "name": name,
-                    "artist": artist,
-                    "image_url": artwork,
-                    "url": "",
-                    "mbid": "",
-                }
-            )
+            track = {
+                "name": name,
+                "artist": artist,
+                "image_url": artwork,
+                "url": "",
+                "mbid": "",
+            }
+            # id песни в Apple RSS совпадает с iTunes trackId.
+            if chart_type == "songs" and str(item.get("id") or "").isdigit():
+                track["itunes_id"] = str(item["id"])
+            tracks.append(track)
 
         return tracks
 
@@ -520,23 +728,16 @@ async def _get_apple_music_chart_async(country="us", count=50, chart_type="songs
 
 async def _search_lastfm_tracks_async(query, limit=50):
     try:
-        start_time = time.time()
-        async with _build_http_client() as http_client:
-            r = await http_client.get(
-                "https://ws.audioscrobbler.com/2.0/",
-                params={
-                    "method": "track.search",
-                    "track": query,
-                    "api_key": LASTFM_KEY,
-                    "format": "json",
-                    "limit": limit,
-                },
-            )
-        elapsed = (time.time() - start_time) * 1000
-        logger.info(
-            "Last.fm track search API request took %.2f ms for query='%s'",
-            elapsed,
-            query,
+        http_client = get_http_client("lastfm")
+        r = await http_client.get(
+            "https://ws.audioscrobbler.com/2.0/",
+            params={
+                "method": "track.search",
+                "track": query,
+                "api_key": LASTFM_KEY,
+                "format": "json",
+                "limit": limit,
+            },
         )
 
         r.raise_for_status()
@@ -554,105 +755,111 @@ async def _search_lastfm_tracks_async(query, limit=50):
 
 async def _get_lastfm_track_stats_batch_async(tracks, limit=50):
     if not tracks:
-        return {}
+        return BatchResult()
 
-    results = {}
-    lastfm_sem = asyncio.Semaphore(5)
-    safe_tracks = [
-        tr
-        for tr in tracks
-        if isinstance(tr, dict) and tr.get("name") and tr.get("artist")
-    ][:limit]
-
-    async def fetch_stats(track, client):
-        try:
-            track_name = str(track.get("name") or "").strip()
-            artist_name = str(track.get("artist") or "").strip()
-            if not track_name or not artist_name:
-                return
-
-            mbid = str(track.get("mbid") or "").strip()
-            cache_key = _build_track_cache_key(
-                "lastfm_track_info", mbid, track_name, artist_name
-            )
-            cached = cache.get(cache_key)
-            if isinstance(cached, dict):
-                results[(track_name, artist_name)] = {
-                    "listeners": int(cached.get("listeners", 0)),
-                    "playcount": int(cached.get("playcount", 0)),
+    results = BatchResult()
+    lastfm_in_flight = asyncio.Semaphore(concurrency_cap("lastfm"))
+    safe_tracks = []
+    for tr in tracks:
+        if not isinstance(tr, dict):
+            continue
+        track_name = str(tr.get("name") or "").strip()
+        artist_name = str(tr.get("artist") or "").strip()
+        if track_name and artist_name:
+            safe_tracks.append(
+                {
+                    "name": track_name,
+                    "artist": artist_name,
+                    "mbid": str(tr.get("mbid") or "").strip(),
                 }
-                return
-
-            async with lastfm_sem:
-                info_response = await client.get(
-                    "https://ws.audioscrobbler.com/2.0/",
-                    params={
-                        "method": "track.getInfo",
-                        "api_key": LASTFM_KEY,
-                        "format": "json",
-                        "track": track_name,
-                        "artist": artist_name,
-                        "autocorrect": 1,
-                    },
-                )
-                info_response.raise_for_status()
-                track_info = info_response.json().get("track", {})
-                listeners = int(track_info.get("listeners", 0))
-                playcount = int(track_info.get("playcount", 0))
+            )
+    safe_tracks = safe_tracks[:limit]
+    prefix = await cache_namespaces.akey("lastfm_track_info")
+    cache_keys = {
+        (track["name"], track["artist"]): _build_track_cache_key(
+            prefix, track["mbid"], track["name"], track["artist"]
+        )
+        for track in safe_tracks
+    }
+    pending = await _prefill_from_cache(
+        results,
+        cache_keys,
+        safe_tracks,
+        is_valid=lambda value: isinstance(value, dict),
+        stored=track_metadata.StoredTracks(safe_tracks),
+        provider="lastfm",
+    )
+    to_cache = defaultdict(dict)
+    to_stale = {}
+    to_store = {}
 
-                results[(track_name, artist_name)] = {
-                    "listeners": listeners,
-                    "playcount": playcount,
-                }
-                cache.set(
-                    cache_key,
-                    {"listeners": listeners, "playcount": playcount},
-                    timeout=60 * 60 * 24 * 7,
-                )
+    async def lookup_stats(track_name, artist_name, cache_key):
+        async with lastfm_in_flight:
+            info_response = await http_client.get(
+                "https://ws.audioscrobbler.com/2.0/",
+                params={
+                    "method": "track.getInfo",
+                    "api_key": LASTFM_KEY,
+                    "format": "json",
+                    "track": track_name,
+                    "artist": artist_name,
+                    "autocorrect": 1,
+                },
+            )
+            info_response.raise_for_status()
+            track_info = info_response.json().get("track", {})
+            listeners = int(track_info.get("listeners", 0))
+            playcount = int(track_info.get("playcount", 0))
+
+            stats = {"listeners": listeners, "playcount": playcount}
+            to_cache[60 * 60 * 24 * 7][cache_key] = stats
+            to_stale[cache_key] = stats
+            to_store[(track_name, artist_name)] = stats
+            return stats
+
+    async def fetch_stats(track):
+        track_name = track["name"]
+        artist_name = track["artist"]
+        cache_key = cache_keys[(track_name, artist_name)]
+        try:
+            stats = await _fetch_or_stale(
+                cache_key,
+                lambda: lookup_stats(track_name, artist_name, cache_key),
+                {"listeners": 0, "playcount": 0},
+            )
         except Exception as e:
+            # Ошибку не кэшируем: исключение снимает lease, и другие воркеры
+            # не ждут значения, которого не будет.
             logger.warning(
                 "Last.fm track info error for track='%s', artist='%s': %s",
-                track.get("name"),
-                track.get("artist"),
+                track_name,
+                artist_name,
                 e,
             )
-            try:
-                track_name = str(track.get("name") or "").strip()
-                artist_name = str(track.get("artist") or "").strip()
-                if track_name and artist_name:
-                    results[(track_name, artist_name)] = {
-                        "listeners": 0,
-                        "playcount": 0,
-                    }
-            except Exception:
-                pass
+            stats = {"listeners": 0, "playcount": 0}
+        results[(track_name, artist_name)] = stats
 
-    async with _build_http_client() as http_client:
-        tasks = [fetch_stats(track, http_client) for track in safe_tracks]
-        await asyncio.gather(*tasks, return_exceptions=True)
+    http_client = get_http_client("lastfm")
+    tasks = [fetch_stats(track) for track in pending]
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await _write_back(to_cache, stale=to_stale)
+    await track_metadata.save("lastfm", _metadata_entries(safe_tracks, to_store))
 
     return results
 
 
 async def _search_lastfm_artists_async(query, limit=20):
     try:
-        start_time = time.time()
-        async with _build_http_client() as http_client:
-            r = await http_client.get(
-                "https://ws.audioscrobbler.com/2.0/",
-                params={
-                    "method": "artist.search",
-                    "artist": query,
-                    "api_key": LASTFM_KEY,
-                    "format": "json",
-                    "limit": limit,
-                },
-            )
-        elapsed = (time.time() - start_time) * 1000
-        logger.info(
-            "Last.fm artist search API request took %.2f ms for query='%s'",
-            elapsed,
-            query,
+        http_client = get_http_client("lastfm")
+        r = await http_client.get(
+            "https://ws.audioscrobbler.com/2.0/",
+            params={
+                "method": "artist.search",
+                "artist": query,
+                "api_key": LASTFM_KEY,
+                "format": "json",
+                "limit": limit,
+            },
         )
 
         r.raise_for_status()
@@ -669,20 +876,30 @@ async def _search_lastfm_artists_async(query, limit=20):
 
 
 async def _get_lastfm_releases_batch_async(artists):
-    results = {}
+    results = ArtistBatchResult()
     artists = artists[:75]
-    lastfm_sem = asyncio.Semaphore(5)
+    lastfm_in_flight = asyncio.Semaphore(concurrency_cap("lastfm"))
+    prefix = await cache_namespaces.akey("lastfm_releases")
 
     async def fetch_artist_releases(art):
         name = art["name"]
         mbid = art.get("mbid", "")
-        cache_key = _safe_cache_key("lastfm_releases", mbid or name.lower())
-        cached = cache.get(cache_key)
+        cache_key = _safe_cache_key(prefix, mbid or name.lower())
+        cached = await async_cache.get(cache_key)
         if cached is not None:
             return name, cached
 
+        async def lookup():
+            releases = await lookup_artist_releases(name, mbid, cache_key)
+            results.fetched.add(name)
+            return releases
+
+        releases = await _fetch_or_stale(cache_key, lookup, REFUSED)
+        return name, releases
+
+    async def lookup_artist_releases(name, mbid, cache_key):
         try:
-            async with lastfm_sem:
+            async with lastfm_in_flight:
                 r = await http_client.get(
                     "https://ws.audioscrobbler.com/2.0/",
                     params={
@@ -715,46 +932,43 @@ async def _get_lastfm_releases_batch_async(artists):
                             "cover": cover_url,
                         }
                     )
-                cache.set(cache_key, result, 60 * 60 * 24 * 3)
-                return name, result
+                await async_cache.set(cache_key, result, 60 * 60 * 24 * 3)
+                await stale_cache.remember(cache_key, result)
+                return result
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
             logger.warning(f"Last.fm releases API error for artist='{name}': {e}")
-            cache.set(cache_key, [], 60 * 60)
-            return name, []
+            await async_cache.set(cache_key, [], 60 * 60)
+            return []
 
-    async with _build_http_client() as http_client:
-        tasks = [fetch_artist_releases(art) for art in artists]
-        completed_results = await asyncio.gather(*tasks, return_exceptions=True)
+    http_client = get_http_client("lastfm")
+    tasks = [fetch_artist_releases(art) for art in artists]
+    completed_results = await asyncio.gather(*tasks, return_exceptions=True)
 
     for result in completed_results:
         if isinstance(result, Exception):
             logger.error(f"Last.fm releases fetch error: {result}")
             continue
         name, releases = result
-        results[name] = releases
+        if releases is not REFUSED:
+            results[name] = releases
 
     return results
 
 
 async def _get_lastfm_artists_by_genre_async(genre, limit=30):
     try:
-        start_time = time.time()
-        async with _build_http_client() as http_client:
-            r = await http_client.get(
-                "https://ws.audioscrobbler.com/2.0/",
-                params={
-                    "method": "tag.gettopartists",
-                    "tag": genre,
-                    "api_key": LASTFM_KEY,
-                    "format": "json",
-                    "limit": limit * 2,
-                },
-            )
-        elapsed = (time.time() - start_time) * 1000
-        logger.info(
-            "Last.fm genre artists API request took %.2f ms for genre='%s'",
-            elapsed,
-            genre,
+        http_client = get_http_client("lastfm")
+        r = await http_client.get(
+            "https://ws.audioscrobbler.com/2.0/",
+            params={
+                "method": "tag.gettopartists",
+                "tag": genre,
+                "api_key": LASTFM_KEY,
+                "format": "json",
+                "limit": limit * 2,
+            },
         )
 
         r.raise_for_status()
@@ -779,19 +993,16 @@ async def _get_lastfm_artists_by_genre_async(genre, limit=30):
 
 async def _get_lastfm_artists_chart_async(limit=30):
     try:
-        start_time = time.time()
-        async with _build_http_client() as http_client:
-            r = await http_client.get(
-                "https://ws.audioscrobbler.com/2.0/",
-                params={
-                    "method": "chart.gettopartists",
-                    "api_key": LASTFM_KEY,
-                    "format": "json",
-                    "limit": limit,
-                },
-            )
-        elapsed = (time.time() - start_time) * 1000
-        logger.info("Last.fm chart API request took %.2f ms", elapsed)
+        http_client = get_http_client("lastfm")
+        r = await http_client.get(
+            "https://ws.audioscrobbler.com/2.0/",
+            params={
+                "method": "chart.gettopartists",
+                "api_key": LASTFM_KEY,
+                "format": "json",
+                "limit": limit,
+            },
+        )
 
         r.raise_for_status()
         return r.json().get("artists", {}).get("artist", [])
@@ -811,6 +1022,43 @@ def _build_empty_wikipedia_result(artist_name):
     }
 
 
+# extracts с exintro отдаются не больше чем для 20 страниц за запрос.
+WIKIPEDIA_TITLES_BATCH = 20
+
+_WIKIPEDIA_PAGE_PARAMS = {
+    "prop": "extracts|pageimages|info",
+    "inprop": "url",
+    "exintro": 1,
+    "explaintext": 1,
+    "piprop": "original|thumbnail",
+    "pithumbsize": 640,
+    "format": "json",
+    "formatversion": 2,
+}
+
+
+def _wikipedia_summary_from_page(page, artist_name, lang):
+    if not isinstance(page, dict):
+        return None
+    extract = str(page.get("extract", "")).strip()
+    if not extract:
+        return None
+
+    image_url = ""
+    if isinstance(page.get("original"), dict):
+        image_url = str(page["original"].get("source") or "").strip()
+    if not image_url and isinstance(page.get("thumbnail"), dict):
+        image_url = str(page["thumbnail"].get("source") or "").strip()
+
+    return {
+        "bio": extract,
+        "title": page.get("title") or artist_name,
+        "source_url": str(page.get("fullurl") or "").strip(),
+        "image_url": image_url,
+        "lang": lang,
+    }
+
+
 async def _fetch_wikipedia_artist_summary_async(http_client, artist_name, lang):
     empty_result = _build_empty_wikipedia_result(artist_name)
 
@@ -822,14 +1070,7 @@ async def _fetch_wikipedia_artist_summary_async(http_client, artist_name, lang):
                 "generator": "search",
                 "gsrsearch": artist_name,
                 "gsrlimit": 1,
-                "prop": "extracts|pageimages|info",
-                "inprop": "url",
-                "exintro": 1,
-                "explaintext": 1,
-                "piprop": "original|thumbnail",
-                "pithumbsize": 640,
-                "format": "json",
-                "formatversion": 2,
+                **_WIKIPEDIA_PAGE_PARAMS,
             },
         )
         if query_response.status_code != 200:
@@ -840,30 +1081,82 @@ async def _fetch_wikipedia_artist_summary_async(http_client, artist_name, lang):
         if not pages:
             return empty_result
 
-        page = pages[0] if isinstance(pages[0], dict) else {}
-        extract = str(page.get("extract", "")).strip()
-        if not extract:
-            return empty_result
-
-        image_url = ""
-        if isinstance(page.get("original"), dict):
-            image_url = str(page["original"].get("source") or "").strip()
-        if not image_url and isinstance(page.get("thumbnail"), dict):
-            image_url = str(page["thumbnail"].get("source") or "").strip()
-
-        return {
-            "bio": extract,
-            "title": page.get("title") or artist_name,
-            "source_url": str(page.get("fullurl") or "").strip(),
-            "image_url": image_url,
-            "lang": lang,
-        }
+        summary = _wikipedia_summary_from_page(pages[0], artist_name, lang)
+        return summary or empty_result
 
+    except UpstreamUnavailable:
+        raise
     except Exception as e:
         logger.warning("Wikipedia summary API error for '%s': %s", artist_name, e)
         return empty_result
 
 
+async def _fetch_wikipedia_summaries_by_titles_async(http_client, titles, lang):
+    """Страницы с известными заголовками запросом titles=A|B|C.
+
+    Возвращает {запрошенный title: summary}; не найденных страниц в ответе нет.
+    """
+    titles = list(dict.fromkeys(titles))
+    chunks = [
+        titles[i : i + WIKIPEDIA_TITLES_BATCH]
+        for i in range(0, len(titles), WIKIPEDIA_TITLES_BATCH)
+    ]
+
+    async def fetch_chunk(chunk):
+        r = await http_client.get(
+            f"https://{lang}.wikipedia.org/w/api.php",
+            params={
+                "action": "query",
+                "titles": "|".join(chunk),
+                "redirects": 1,
+                "exlimit": "max",
+                **_WIKIPEDIA_PAGE_PARAMS,
+            },
+        )
+        r.raise_for_status()
+        return (r.json() or {}).get("query") or {}
+
+    responses = await asyncio.gather(
+        *(fetch_chunk(chunk) for chunk in chunks), return_exceptions=True
+    )
+
+    found = {}
+    for chunk, query in zip(chunks, responses):
+        if isinstance(query, UpstreamUnavailable):
+            raise query
+        if isinstance(query, Exception):
+            logger.warning("Wikipedia titles API error (%s): %s", lang, query)
+            continue
+        # Запрошенный заголовок -> итоговый после нормализации и редиректов.
+        aliases = {}
+        for entry in [
+            *(query.get("normalized") or []),
+            *(query.get("redirects") or []),
+        ]:
+            aliases[entry.get("from")] = entry.get("to")
+        pages = {
+            page.get("title"): page
+            for page in query.get("pages") or []
+            if isinstance(page, dict)
+        }
+        for title in chunk:
+            resolved = title
+            for _ in range(3):
+                resolved = aliases.get(resolved, resolved)
+            summary = _wikipedia_summary_from_page(pages.get(resolved), title, lang)
+            if summary is not None:
+                found[title] = summary
+    return found
+
+
+def _known_wikipedia_title(row, lang):
+    """(lang, title) страницы, найденной для артиста раньше, или None."""
+    entry = artist_metadata.stored_bio(row, lang) or {}
+    if entry.get("bio") and entry.get("title") and entry.get("lang"):
+        return entry["lang"], entry["title"]
+    return None
+
+
 async def _get_wikipedia_artist_bios_batch_async(artist_names, lang="en"):
     results = {}
     if not artist_names:
@@ -881,37 +1174,115 @@ async def _get_wikipedia_artist_bios_batch_async(artist_names, lang="en"):
         seen.add(lowered)
         unique_names.append(normalized)
 
-    wikipedia_sem = asyncio.Semaphore(8)
+    wikipedia_in_flight = asyncio.Semaphore(concurrency_cap("wikipedia"))
+    stored = await artist_metadata.load(unique_names)
+    to_store = {}
+    prefix = await cache_namespaces.akey("wikipedia_artist_bio")
+    cache_keys = {
+        name: _safe_cache_key(prefix, lang, name.lower()) for name in unique_names
+    }
 
-    async def fetch_artist_bio(name):
-        cache_key = _safe_cache_key("wikipedia_artist_bio_v2", lang, name.lower())
-        cached = cache.get(cache_key)
+    pending = []
+    for name in unique_names:
+        summary = artist_metadata.fresh_bio(stored.get(name), lang)
+        if summary is not None:
+            results[name] = summary
+        else:
+            pending.append(name)
+
+    cached_values = await async_cache.get_many([cache_keys[name] for name in pending])
+    missing = []
+    for name in pending:
+        cached = cached_values.get(cache_keys[name])
         if isinstance(cached, dict):
-            return name, cached
+            results[name] = cached
+        else:
+            missing.append(name)
+
+    async def remember_summary(name, summary):
+        cache_ttl = 60 * 60 * 24 * 3 if summary.get("bio") else 60 * 60 * 2
+        await async_cache.set(cache_keys[name], summary, timeout=cache_ttl)
+        if summary.get("bio"):
+            await stale_cache.remember(cache_keys[name], summary)
+
+    def keep_summary(name, summary):
+        # Пустой ответ не затирает сохранённое bio (Wikipedia могла быть
+        # недоступна).
+        previous = artist_metadata.stored_bio(stored.get(name), lang) or {}
+        if summary.get("bio") or not previous.get("bio"):
+            to_store[name] = summary
+        results[name] = summary
 
-        async with wikipedia_sem:
-            summary = await _fetch_wikipedia_artist_summary_async(
-                http_client, name, lang
+    async def lookup_known_titles(title_lang, titles_by_name):
+        try:
+            found = await _fetch_wikipedia_summaries_by_titles_async(
+                http_client, titles_by_name.values(), title_lang
             )
-            if not summary.get("bio") and lang != "en":
-                fallback_summary = await _fetch_wikipedia_artist_summary_async(
-                    http_client, name, "en"
-                )
-                if fallback_summary.get("bio"):
-                    summary = fallback_summary
-            cache_ttl = 60 * 60 * 24 * 3 if summary.get("bio") else 60 * 60 * 2
-            cache.set(cache_key, summary, timeout=cache_ttl)
-            return name, summary
+        except UpstreamUnavailable as exc:
+            logger.info("%s; searching Wikipedia by name instead", exc)
+            return
+        for name, title in titles_by_name.items():
+            summary = found.get(title)
+            if summary is not None:
+                await remember_summary(name, summary)
+                keep_summary(name, summary)
+
+    async def lookup_artist_bio(name):
+        async with wikipedia_in_flight:
+            langs = [lang] if lang == "en" else [lang, "en"]
+            summaries = await asyncio.gather(
+                *(
+                    _fetch_wikipedia_artist_summary_async(http_client, name, item)
+                    for item in langs
+                ),
+                return_exceptions=True,
+            )
+            # Отказ одного языка не теряет bio, найденное на другом.
+            found = [item for item in summaries if not isinstance(item, BaseException)]
+            summary = next((item for item in found if item.get("bio")), None)
+            if summary is None:
+                failed = [item for item in summaries if isinstance(item, BaseException)]
+                if failed:
+                    # Пустой ответ при отказе провайдера не кэшируем.
+                    raise failed[0]
+                summary = found[0]
+            await remember_summary(name, summary)
+            return summary
+
+    async def search_artist_bio(name):
+        summary = await _fetch_or_stale(
+            cache_keys[name], lambda: lookup_artist_bio(name), REFUSED
+        )
+        if summary is REFUSED:
+            # В ответ — пустое bio, в ArtistMetadata — ничего.
+            results[name] = _build_empty_wikipedia_result(name)
+            return
+        keep_summary(name, summary)
+
+    http_client = get_http_client("wikipedia")
+
+    # Артисты, для которых страница уже известна, — одним titles= на язык.
+    known_titles = defaultdict(dict)
+    for name in missing:
+        known = _known_wikipedia_title(stored.get(name), lang)
+        if known is not None:
+            known_titles[known[0]][name] = known[1]
+    await asyncio.gather(
+        *(
+            lookup_known_titles(title_lang, titles_by_name)
+            for title_lang, titles_by_name in known_titles.items()
+        )
+    )
 
-    async with _build_http_client() as http_client:
-        tasks = [fetch_artist_bio(name) for name in unique_names]
-        completed_results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Поиск по имени — только для тех, кого не нашли по заголовку.
+    completed_results = await asyncio.gather(
+        *(search_artist_bio(name) for name in missing if name not in results),
+        return_exceptions=True,
+    )
+    await artist_metadata.save_bios(lang, to_store)
 
     for result in completed_results:
         if isinstance(result, Exception):
             logger.error("Wikipedia batch fetch error: %s", result)
-            continue
-        name, summary = result
-        results[name] = summary
 
-    return results
+    return {name: results[name] for name in unique_names if name in results}
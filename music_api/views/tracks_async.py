@@ -1,14 +1,25 @@
-from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from rest_framework.pagination import PageNumberPagination
-from django.core.cache import cache
+from rest_framework.settings import api_settings
+from django.conf import settings
+from django.http import StreamingHttpResponse
 import asyncio
 import logging
-from asgiref.sync import async_to_sync
+
+from ..renderers import NDJSON_MEDIA_TYPE, NDJSONRenderer, ndjson_line
+from ..services import (
+    cache_namespaces,
+    response_cache,
+    stale_cache,
+    swr,
+    track_metadata,
+)
+from ..services.async_cache import async_cache
 
 # Асинхронные сервисные функции
+from .async_api import AsyncAPIView
 from .services_async import (
     _get_lastfm_tracks_chart_async,
     _get_lastfm_tracks_by_genre_async,
@@ -21,6 +32,12 @@ from .services_async import (
 
 DEFAULT_TRACK_COUNT = 15
 CACHE_TIMEOUT = 600  # 10 минут
+# Чарты: после CACHE_TIMEOUT отдаём кэш сразу и обновляем его в фоне,
+# после CHART_HARD_TTL считаем заново в запросе.
+CHART_HARD_TTL = 60 * 60 * 6
+
+MIN_BUDGET_MS = 100
+MAX_BUDGET_MS = 10000
 
 ITUNES_BATCH_LIMIT = 25
 DEEZER_BATCH_LIMIT = 40
@@ -28,6 +45,16 @@ LASTFM_BATCH_LIMIT = 75
 
 logger = logging.getLogger(__name__)
 
+_background_tasks = set()
+
+
+async def _year_chart_cache_key(genre, limit):
+    return await cache_namespaces.akey("tracks_chart", genre or "all", limit)
+
+
+async def _apple_chart_cache_key(country, count, chart_type):
+    return await cache_namespaces.akey("apple_chart", country, count, chart_type)
+
 
 def _normalize_artist_for_display(value):
     artist = str(value or "").strip()
@@ -49,51 +76,45 @@ class TrackPagination(PageNumberPagination):
     max_page_size = 30
 
 
-async def _enrich_tracks_list_async(tracks_list):
-    if not tracks_list:
-        return []
+def _resolve_budget(request, endpoint):
+    """Бюджет обогащения в секундах: ?budget_ms= или ENRICHMENT_BUDGET_MS.
 
-    tracks_for_batch = []
-    for tr in tracks_list:
-        if not isinstance(tr, dict):
-            continue
+    None — без ограничения. Некорректное значение — ValueError.
+    """
+    raw = request.query_params.get("budget_ms")
+    if raw is None:
+        budget_ms = settings.ENRICHMENT_BUDGET_MS.get(endpoint)
+    else:
+        budget_ms = int(raw)
+        if budget_ms < MIN_BUDGET_MS or budget_ms > MAX_BUDGET_MS:
+            raise ValueError()
+    return budget_ms / 1000 if budget_ms else None
 
-        name = tr.get("name")
-        artist_field = tr.get("artist")
-        if not name or artist_field is None:
-            continue
 
-        artist_name = (
-            artist_field.get("name") if isinstance(artist_field, dict) else artist_field
-        )
-        artist_name = _normalize_artist_for_display(artist_name)
-        if not artist_name:
-            continue
+def _keep_running(task):
+    # Недоделанный batch дописывает кэш уже после ответа; держим ссылку,
+    # чтобы задачу не собрал GC.
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
-        item = {"name": name, "artist": artist_name}
-        mbid_val = tr.get("mbid")
-        if mbid_val and str(mbid_val).strip():
-            item["mbid"] = str(mbid_val).strip()
-        tracks_for_batch.append(item)
 
-    itunes_batch = tracks_for_batch[:ITUNES_BATCH_LIMIT]
-    deezer_batch = tracks_for_batch[:DEEZER_BATCH_LIMIT]
+def _batch_result(task):
+    if task.cancelled():
+        return {}
+    exc = task.exception()
+    if exc is not None:
+        logger.warning("Enrichment batch failed: %s", exc)
+        return {}
+    return task.result()
 
-    # Запускаем batch запросы параллельно с правильными ограничениями
-    itunes_task = _get_itunes_batch_async(itunes_batch)
-    deezer_task = _get_deezer_batch_async(deezer_batch)
 
-    itunes_data, deezer_data = await asyncio.gather(
-        itunes_task, deezer_task, return_exceptions=True
-    )
-    itunes_data = itunes_data if not isinstance(itunes_data, Exception) else {}
-    deezer_data = deezer_data if not isinstance(deezer_data, Exception) else {}
+def _count_incomplete(tracks):
+    return sum(1 for track in tracks if track.get("incomplete"))
 
-    # Обработка исключений
-    itunes_data = itunes_data if not isinstance(itunes_data, Exception) else {}
 
-    # Собираем финальные данные
-    enriched = []
+def _prepare_tracks(tracks_list):
+    """(исходный трек, name, artist) для треков, которые можно обогатить."""
+    prepared = []
     for tr in tracks_list:
         if not isinstance(tr, dict):
             continue
@@ -109,59 +130,269 @@ async def _enrich_tracks_list_async(tracks_list):
         artist = _normalize_artist_for_display(artist)
         if not artist:
             continue
+        prepared.append((tr, name, artist))
+    return prepared
+
+
+def _build_track(tr, name, artist, it_res, dz_res):
+    cover = it_res.get("cover") or dz_res.get("cover")
+    preview = it_res.get("preview")
+    return {
+        "name": name,
+        "artist": artist,
+        "listeners": tr.get("listeners", 0),
+        "playcount": tr.get("playcount", 0),
+        "url": preview or "",
+        "image_url": cover or "/static/images/default.svg",
+        "mbid": tr.get("mbid", ""),
+    }
+
+
+class _Enrichment:
+    """iTunes и Deezer batch для списка треков.
+
+    Результаты складываются по мере готовности (``on_result``), поэтому
+    трек можно собрать, не дожидаясь конца обоих batch.
+    """
+
+    def __init__(self, prepared, on_update=None):
+        batch = []
+        for tr, name, artist in prepared:
+            item = {"name": name, "artist": artist}
+            mbid_val = tr.get("mbid")
+            if mbid_val and str(mbid_val).strip():
+                item["mbid"] = str(mbid_val).strip()
+            batch.append(item)
+
+        itunes_batch = batch[:ITUNES_BATCH_LIMIT]
+        deezer_batch = batch[:DEEZER_BATCH_LIMIT]
+        self.itunes_keys = {(item["name"], item["artist"]) for item in itunes_batch}
+        self.deezer_keys = {(item["name"], item["artist"]) for item in deezer_batch}
+        self.itunes_data = {}
+        self.deezer_data = {}
+        self._on_update = on_update
+
+        # Один запрос к TrackMetadata на оба провайдера.
+        stored = track_metadata.StoredTracks(batch)
+
+        # Запускаем batch запросы параллельно с правильными ограничениями
+        self.itunes_task = asyncio.ensure_future(
+            _get_itunes_batch_async(
+                itunes_batch, on_result=self._itunes_result, stored=stored
+            )
+        )
+        self.deezer_task = asyncio.ensure_future(
+            _get_deezer_batch_async(
+                deezer_batch, on_result=self._deezer_result, stored=stored
+            )
+        )
+        self.itunes_task.add_done_callback(
+            lambda task: self.itunes_data.update(_batch_result(task))
+        )
+        self.deezer_task.add_done_callback(
+            lambda task: self.deezer_data.update(_batch_result(task))
+        )
+        self.tasks = {self.itunes_task, self.deezer_task}
+
+    def _itunes_result(self, track_key, value):
+        self.itunes_data[track_key] = value
+        if self._on_update is not None:
+            self._on_update(track_key)
+
+    def _deezer_result(self, track_key, value):
+        self.deezer_data[track_key] = value
+        if self._on_update is not None:
+            self._on_update(track_key)
+
+    def is_incomplete(self, track_key):
+        waiting_itunes = (
+            track_key in self.itunes_keys
+            and track_key not in self.itunes_data
+            and not self.itunes_task.done()
+        )
+        waiting_deezer = (
+            track_key in self.deezer_keys
+            and track_key not in self.deezer_data
+            and not self.deezer_task.done()
+        )
+        # Превью есть только у iTunes; Deezer нужен лишь как запасная обложка.
+        has_cover = bool(self.itunes_data.get(track_key, {}).get("cover"))
+        return waiting_itunes or (waiting_deezer and not has_cover)
+
+    def build(self, tr, name, artist):
         track_key = (name, artist)
+        item = _build_track(
+            tr,
+            name,
+            artist,
+            self.itunes_data.get(track_key, {}),
+            self.deezer_data.get(track_key, {}),
+        )
+        if self.is_incomplete(track_key):
+            item["incomplete"] = True
+        return item
+
+    def detach(self):
+        for task in self.tasks:
+            if not task.done():
+                _keep_running(task)
+        if self.itunes_task.done() and self.deezer_task.done():
+            itunes_data = _batch_result(self.itunes_task)
+            deezer_data = _batch_result(self.deezer_task)
+            logger.debug(
+                "Enrichment cache: itunes hits=%s misses=%s, deezer hits=%s misses=%s",
+                getattr(itunes_data, "cache_hits", 0),
+                getattr(itunes_data, "cache_misses", 0),
+                getattr(deezer_data, "cache_hits", 0),
+                getattr(deezer_data, "cache_misses", 0),
+            )
+
+
+async def _enrich_tracks_list_async(tracks_list, budget=None):
+    """Обогащение обложками и превью.
 
-        it_res = itunes_data.get(track_key, {})
-        dz_res = deezer_data.get(track_key, {})
-
-        cover = it_res.get("cover") or dz_res.get("cover")
-        preview = it_res.get("preview")
-
-        enriched.append(
-            {
-                "name": name,
-                "artist": artist,
-                "listeners": tr.get("listeners", 0),
-                "playcount": tr.get("playcount", 0),
-                "url": preview or "",
-                "image_url": cover or "/static/images/default.svg",
-                "mbid": tr.get("mbid", ""),
-            }
+    ``budget`` (секунды) ограничивает ожидание: по его истечении треки без
+    результата получают обложку по умолчанию и ``incomplete: True``, а
+    незавершённые запросы продолжают работать и наполняют кэш.
+    """
+    if not tracks_list:
+        return []
+
+    prepared = _prepare_tracks(tracks_list)
+    enrichment = _Enrichment(prepared)
+    _, pending = await asyncio.wait(enrichment.tasks, timeout=budget)
+    enrichment.detach()
+    if pending:
+        logger.info(
+            "Enrichment budget of %.2fs exceeded, returning partial results", budget
         )
-    return enriched
 
+    return [enrichment.build(*entry) for entry in prepared]
+
+
+async def _iter_enriched_tracks(prepared):
+    """(индекс в prepared, трек) по мере того, как готовы обложка и превью."""
+    updates = asyncio.Queue()
+    enrichment = _Enrichment(prepared, on_update=updates.put_nowait)
+    for task in enrichment.tasks:
+        task.add_done_callback(lambda _task: updates.put_nowait(None))
+
+    indexes = {}
+    for index, (_, name, artist) in enumerate(prepared):
+        indexes.setdefault((name, artist), []).append(index)
+
+    remaining = set(indexes)
+    try:
+        while remaining:
+            ready = [key for key in remaining if not enrichment.is_incomplete(key)]
+            for track_key in ready:
+                remaining.discard(track_key)
+                for index in indexes[track_key]:
+                    yield index, enrichment.build(*prepared[index])
+            if remaining:
+                await updates.get()
+    finally:
+        # Клиент мог отключиться — оставшиеся запросы всё равно наполнят кэш.
+        enrichment.detach()
+
+
+async def _ndjson_tracks_stream(tracks_list, meta, on_complete=None):
+    """NDJSON: сразу весь список без обложек, затем по строке на трек."""
+    prepared = _prepare_tracks(tracks_list or [])
+    tracks = [_build_track(tr, name, artist, {}, {}) for tr, name, artist in prepared]
+    yield ndjson_line({"event": "tracks", "tracks": tracks, "meta": meta})
+
+    async for index, track in _iter_enriched_tracks(prepared):
+        tracks[index] = track
+        yield ndjson_line({"event": "track", "index": index, "track": track})
+
+    if on_complete is not None and tracks:
+        await on_complete(tracks)
+    yield ndjson_line({"event": "done", "count": len(tracks)})
+
+
+async def _ndjson_payload_stream(tracks, meta):
+    # Уже готовый (кэшированный) список — те же события без ожидания.
+    yield ndjson_line({"event": "tracks", "tracks": tracks, "meta": meta})
+    yield ndjson_line({"event": "done", "count": len(tracks)})
+
+
+def _ndjson_response(stream):
+    response = StreamingHttpResponse(stream, content_type=NDJSON_MEDIA_TYPE)
+    response["Cache-Control"] = "no-cache"
+    # nginx не должен буферизовать поток целиком.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _wants_ndjson(request):
+    return request.accepted_renderer.format == NDJSONRenderer.format
+
+
+async def _store_chart(cache_key, tracks, **meta):
+    entry = await swr.aset_entry(cache_key, tracks, CHART_HARD_TTL)
+    await stale_cache.remember(cache_key, tracks)
+    await response_cache.aset(
+        cache_key,
+        {"tracks": tracks, "meta": {**meta, **swr.meta_for(entry)}},
+        entry.created_at,
+        CHART_HARD_TTL,
+    )
 
-class YearChartAPIView(APIView):
+
+class YearChartAPIView(AsyncAPIView):
     """API для получения чарта треков"""
 
     permission_classes = [AllowAny]
+    # Accept: application/x-ndjson — потоковый ответ по мере обогащения.
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
 
-    async def _get_chart_data_async(self, genre, limit):
+    async def _get_raw_chart_async(self, genre, limit):
+        if genre:
+            raw = await _get_lastfm_tracks_by_genre_async(genre, limit)
+        else:
+            raw = await _get_lastfm_tracks_chart_async(limit)
+
+        # Сортируем по количеству прослушиваний (сначала listeners, потом playcount)
+        # заранее: порядок потока NDJSON должен совпадать с итоговым.
+        return sorted(
+            raw or [],
+            key=lambda track: (track.get("listeners", 0), track.get("playcount", 0)),
+            reverse=True,
+        )
+
+    async def _get_chart_data_async(self, genre, limit, budget=None):
         """Асинхронное получение данных чарта"""
         try:
-            if genre:
-                raw = await _get_lastfm_tracks_by_genre_async(genre, limit)
-            else:
-                raw = await _get_lastfm_tracks_chart_async(limit)
-
+            raw = await self._get_raw_chart_async(genre, limit)
             if not raw:
                 return []
 
-            enriched = await _enrich_tracks_list_async(raw)
-
-            # Сортируем по количеству прослушиваний (сначала listeners, потом playcount)
-            enriched.sort(
-                key=lambda track: (track["listeners"], track["playcount"]), reverse=True
-            )
-
-            return enriched
+            return await _enrich_tracks_list_async(raw, budget=budget)
 
         except Exception as e:
             logger.error(f"Chart data fetch error: {e}", exc_info=True)
             return []
 
-    def get(self, request):
+    async def _refresh_chart_async(self, cache_key, genre, limit, budget=None):
+        enriched = await self._get_chart_data_async(genre, limit, budget)
+        # Неполный результат не кэшируем: следующий запрос соберёт его
+        # из уже прогретых обложек.
+        if enriched and not _count_incomplete(enriched):
+            await _store_chart(cache_key, enriched)
+        return enriched
+
+    async def _stream_chart_async(self, cache_key, genre, limit):
+        async def save(tracks):
+            await _store_chart(cache_key, tracks)
+
+        raw = await self._get_raw_chart_async(genre, limit)
+        meta = swr.meta_for(None)
+        async for line in _ndjson_tracks_stream(raw, meta, on_complete=save):
+            yield line
+
+    async def get(self, request):
         genre = request.query_params.get("genre")
         limit_str = request.query_params.get("limit", str(DEFAULT_TRACK_COUNT))
 
@@ -174,18 +405,65 @@ class YearChartAPIView(APIView):
                 {"error": f"Limit must be 1-{LASTFM_BATCH_LIMIT}"}, status=400
             )
 
-        cache_key = f"tracks_chart:{genre or 'all'}:{limit}"
-        cached = cache.get(cache_key)
-        if cached:
-            return Response({"tracks": cached, "meta": {"cached": True}}, status=200)
+        try:
+            budget = _resolve_budget(request, "year_chart")
+        except ValueError:
+            return Response(
+                {"error": f"budget_ms must be {MIN_BUDGET_MS}-{MAX_BUDGET_MS}"},
+                status=400,
+            )
+
+        cache_key = await _year_chart_cache_key(genre, limit)
+        if not _wants_ndjson(request):
+            response = await response_cache.aserve(
+                request,
+                cache_key,
+                CACHE_TIMEOUT,
+                lambda: self._refresh_chart_async(cache_key, genre, limit),
+            )
+            if response is not None:
+                return response
+
+        entry = await swr.aget_entry(cache_key)
+        if entry is not None and entry.value:
+            if entry.is_stale(CACHE_TIMEOUT):
+                await swr.aschedule_refresh(
+                    cache_key,
+                    lambda: self._refresh_chart_async(cache_key, genre, limit),
+                )
+            meta = swr.meta_for(entry)
+            headers = swr.cache_headers(entry, CACHE_TIMEOUT)
+            if _wants_ndjson(request):
+                response = _ndjson_response(_ndjson_payload_stream(entry.value, meta))
+                for name, value in headers.items():
+                    response[name] = value
+                return response
+            return Response(
+                {"tracks": entry.value, "meta": meta}, status=200, headers=headers
+            )
+
+        if _wants_ndjson(request):
+            return _ndjson_response(self._stream_chart_async(cache_key, genre, limit))
 
         try:
-            enriched = async_to_sync(self._get_chart_data_async)(genre, limit)
+            enriched = await self._refresh_chart_async(cache_key, genre, limit, budget)
 
             if enriched:
-                cache.set(cache_key, enriched, timeout=CACHE_TIMEOUT)
+                meta = swr.meta_for(None)
+                incomplete = _count_incomplete(enriched)
+                if incomplete:
+                    meta["incomplete"] = incomplete
                 return Response(
-                    {"tracks": enriched, "meta": {"cached": False}}, status=200
+                    {"tracks": enriched, "meta": meta},
+                    status=200,
+                    headers=swr.cache_headers(None, CACHE_TIMEOUT),
+                )
+
+            stale = await stale_cache.recall(cache_key)
+            if stale:
+                return Response(
+                    {"tracks": stale, "meta": {"cached": True, "stale": True}},
+                    status=200,
                 )
             else:
                 return Response(
@@ -201,42 +479,67 @@ class YearChartAPIView(APIView):
             return Response({"error": "Server error", "tracks": []}, status=500)
 
 
-class TrackSearchAPIView(APIView):
+class TrackSearchAPIView(AsyncAPIView):
     """API для поиска треков с пагинацией перед обогащением"""
 
     permission_classes = [AllowAny]
+    # Accept: application/x-ndjson — потоковый ответ по мере обогащения.
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
     pagination_class = TrackPagination
 
-    async def _search_and_enrich_async(self, query, page):
+    async def _search_and_enrich_async(self, query, page, budget=None):
         """Асинхронный поиск и обогащение треков"""
         try:
-            enriched_page = await _enrich_tracks_list_async(page)
+            enriched_page = await _enrich_tracks_list_async(page, budget=budget)
             return enriched_page
         except Exception as e:
             logger.error(f"Search enrich error: {e}", exc_info=True)
             return []
 
-    def get(self, request):
+    def _page_meta(self, paginator):
+        return {
+            "count": paginator.page.paginator.count,
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+        }
+
+    def _stream_page(self, paginator, page, cache_key_enriched):
+        meta = self._page_meta(paginator)
+
+        async def save(tracks):
+            await async_cache.set(cache_key_enriched, tracks, timeout=CACHE_TIMEOUT)
+
+        return _ndjson_response(_ndjson_tracks_stream(page, meta, on_complete=save))
+
+    async def get(self, request):
         query = request.query_params.get("q", "").strip()
         if not query:
             return Response({"error": "Query required"}, status=400)
 
+        try:
+            budget = _resolve_budget(request, "search")
+        except ValueError:
+            return Response(
+                {"error": f"budget_ms must be {MIN_BUDGET_MS}-{MAX_BUDGET_MS}"},
+                status=400,
+            )
+
         try:
             normalized_query = " ".join(query.split()).lower()
             locale = (request.META.get("HTTP_ACCEPT_LANGUAGE") or "").split(",")[
                 0
             ].strip().lower() or "default"
-            cache_key_raw = (
-                f"search_raw:{normalized_query}:{LASTFM_BATCH_LIMIT}:{locale}"
+            cache_key_raw = await cache_namespaces.akey(
+                "search_raw", normalized_query, LASTFM_BATCH_LIMIT, locale
             )
-            tracks_raw = cache.get(cache_key_raw)
+            tracks_raw = await async_cache.get(cache_key_raw)
             if not tracks_raw:
-                tracks_raw = async_to_sync(_search_lastfm_tracks_async)(
+                tracks_raw = await _search_lastfm_tracks_async(
                     query, limit=LASTFM_BATCH_LIMIT
                 )
 
-                cache.set(cache_key_raw, tracks_raw, timeout=CACHE_TIMEOUT)
+                await async_cache.set(cache_key_raw, tracks_raw, timeout=CACHE_TIMEOUT)
 
             if not tracks_raw:
                 return Response({"results": []}, status=200)
@@ -245,16 +548,27 @@ class TrackSearchAPIView(APIView):
             page = paginator.paginate_queryset(tracks_raw, request)
 
             page_number = request.query_params.get(paginator.page_query_param, "1")
-            cache_key_enriched = (
-                "search_enriched:"
-                f"{normalized_query}:{locale}:{page_number}:{paginator.page_size}"
+            cache_key_enriched = await cache_namespaces.akey(
+                "search_enriched",
+                normalized_query,
+                locale,
+                page_number,
+                paginator.page_size,
             )
-            cached_enriched = cache.get(cache_key_enriched)
+            cached_enriched = await async_cache.get(cache_key_enriched)
+            if _wants_ndjson(request):
+                if cached_enriched is None:
+                    return self._stream_page(paginator, page, cache_key_enriched)
+                meta = self._page_meta(paginator)
+                return _ndjson_response(_ndjson_payload_stream(cached_enriched, meta))
             if cached_enriched is not None:
                 return paginator.get_paginated_response(cached_enriched)
 
-            enriched_page = async_to_sync(self._search_and_enrich_async)(query, page)
-            cache.set(cache_key_enriched, enriched_page, timeout=CACHE_TIMEOUT)
+            enriched_page = await self._search_and_enrich_async(query, page, budget)
+            if not _count_incomplete(enriched_page):
+                await async_cache.set(
+                    cache_key_enriched, enriched_page, timeout=CACHE_TIMEOUT
+                )
 
             return paginator.get_paginated_response(enriched_page)
 
@@ -270,13 +584,62 @@ class TrackSearchAPIView(APIView):
         return paginator.get_paginated_response(page)
 
 
-class DeezerChartAPIView(APIView):
+class DeezerChartAPIView(AsyncAPIView):
     """API для получения чарта треков (Apple Music RSS)"""
 
     permission_classes = [AllowAny]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
 
-    def get(self, request):
+    async def _get_chart_data_async(self, country, count, chart_type):
+        tracks_raw = await _get_apple_music_chart_async(country, count, chart_type)
+        if not tracks_raw:
+            return []
+
+        # С trackId из RSS весь чарт обогащается одним-двумя lookup, иначе
+        # остаются поиски по названию — их не больше 50.
+        if all(tr.get("itunes_id") for tr in tracks_raw):
+            itunes_limit = count
+        else:
+            itunes_limit = min(count, 50)
+        itunes_data, lastfm_stats = await asyncio.gather(
+            _get_itunes_batch_async(tracks_raw[:itunes_limit], limit=itunes_limit),
+            _get_lastfm_track_stats_batch_async(tracks_raw),
+            return_exceptions=True,
+        )
+        itunes_data = itunes_data if not isinstance(itunes_data, Exception) else {}
+        lastfm_stats = lastfm_stats if isinstance(lastfm_stats, dict) else {}
+
+        enriched = []
+        for tr in tracks_raw:
+            track_key = (tr.get("name"), tr.get("artist"))
+            it_res = itunes_data.get(track_key, {})
+            cover = (
+                it_res.get("cover")
+                or tr.get("image_url")
+                or "/static/images/default.svg"
+            )
+            preview = it_res.get("preview") or ""
+            stats = lastfm_stats.get((tr.get("name"), tr.get("artist")), {})
+            enriched.append(
+                {
+                    "name": tr.get("name") or "",
+                    "artist": tr.get("artist") or "",
+                    "listeners": int(stats.get("listeners", 0)),
+                    "playcount": int(stats.get("playcount", 0)),
+                    "url": preview,
+                    "image_url": cover,
+                    "mbid": "",
+                }
+            )
+        return enriched
+
+    async def _refresh_chart_async(self, cache_key, country, count, chart_type):
+        enriched = await self._get_chart_data_async(country, count, chart_type)
+        if enriched:
+            await _store_chart(cache_key, enriched, source="apple")
+        return enriched
+
+    async def get(self, request):
         country = request.query_params.get("country", "us").strip().lower()
         count_str = request.query_params.get("count", "50")
         chart_type = request.query_params.get("type", "songs").strip().lower()
@@ -289,57 +652,54 @@ class DeezerChartAPIView(APIView):
             return Response({"error": "Count must be 1-100"}, status=400)
 
         try:
-            cache_key = f"apple_chart:{country}:{count}:{chart_type}"
-            cached = cache.get(cache_key)
-            if cached:
+            cache_key = await _apple_chart_cache_key(country, count, chart_type)
+            response = await response_cache.aserve(
+                request,
+                cache_key,
+                CACHE_TIMEOUT,
+                lambda: self._refresh_chart_async(
+                    cache_key, country, count, chart_type
+                ),
+            )
+            if response is not None:
+                return response
+
+            entry = await swr.aget_entry(cache_key)
+            if entry is not None and entry.value:
+                if entry.is_stale(CACHE_TIMEOUT):
+                    await swr.aschedule_refresh(
+                        cache_key,
+                        lambda: self._refresh_chart_async(
+                            cache_key, country, count, chart_type
+                        ),
+                    )
+                meta = {"source": "apple", **swr.meta_for(entry)}
                 return Response(
-                    {"tracks": cached, "meta": {"source": "apple", "cached": True}},
+                    {"tracks": entry.value, "meta": meta},
                     status=200,
+                    headers=swr.cache_headers(entry, CACHE_TIMEOUT),
                 )
 
-            tracks_raw = async_to_sync(_get_apple_music_chart_async)(
-                country, count, chart_type
+            enriched = await self._refresh_chart_async(
+                cache_key, country, count, chart_type
             )
-            if not tracks_raw:
+            if not enriched:
+                stale = await stale_cache.recall(cache_key)
+                if stale:
+                    return Response(
+                        {
+                            "tracks": stale,
+                            "meta": {"source": "apple", "cached": True, "stale": True},
+                        },
+                        status=200,
+                    )
                 return Response({"tracks": [], "meta": {"source": "apple"}}, status=200)
 
-            itunes_limit = min(count, 50)
-            itunes_data = async_to_sync(_get_itunes_batch_async)(
-                tracks_raw[:itunes_limit], limit=itunes_limit
-            )
-            itunes_data = itunes_data if not isinstance(itunes_data, Exception) else {}
-            lastfm_stats = async_to_sync(_get_lastfm_track_stats_batch_async)(
-                tracks_raw
-            )
-            lastfm_stats = lastfm_stats if isinstance(lastfm_stats, dict) else {}
-
-            enriched = []
-            for tr in tracks_raw:
-                track_key = (tr.get("name"), tr.get("artist"))
-                it_res = itunes_data.get(track_key, {})
-                cover = (
-                    it_res.get("cover")
-                    or tr.get("image_url")
-                    or "/static/images/default.svg"
-                )
-                preview = it_res.get("preview") or ""
-                stats = lastfm_stats.get((tr.get("name"), tr.get("artist")), {})
-                enriched.append(
-                    {
-                        "name": tr.get("name") or "",
-                        "artist": tr.get("artist") or "",
-                        "listeners": int(stats.get("listeners", 0)),
-                        "playcount": int(stats.get("playcount", 0)),
-                        "url": preview,
-                        "image_url": cover,
-                        "mbid": "",
-                    }
-                )
-
-            cache.set(cache_key, enriched, timeout=CACHE_TIMEOUT)
+            meta = {"source": "apple", **swr.meta_for(None)}
             return Response(
-                {"tracks": enriched, "meta": {"source": "apple", "cached": False}},
+                {"tracks": enriched, "meta": meta},
                 status=200,
+                headers=swr.cache_headers(None, CACHE_TIMEOUT),
             )
 
         except Exception as e:
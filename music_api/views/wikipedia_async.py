@@ -1,25 +1,24 @@
 import logging
 
-from asgiref.sync import async_to_sync
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
-from rest_framework.views import APIView
 
+from .async_api import AsyncAPIView
 from .services_async import _get_wikipedia_artist_bios_batch_async
 
 logger = logging.getLogger(__name__)
 
 
-class WikipediaArtistBatchAPIView(APIView):
+class WikipediaArtistBatchAPIView(AsyncAPIView):
     """Отдельный API для batch-получения bio/фото артистов из Wikipedia."""
 
     permission_classes = [AllowAny]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
     authentication_classes = []
 
-    def post(self, request):
+    async def post(self, request):
         artists = request.data.get("artists")
         lang = str(request.data.get("lang", "ru")).strip().lower() or "ru"
 
@@ -43,7 +42,7 @@ class WikipediaArtistBatchAPIView(APIView):
             artists_normalized = [
                 str(name).strip() for name in artists if str(name).strip()
             ]
-            bios = async_to_sync(_get_wikipedia_artist_bios_batch_async)(
+            bios = await _get_wikipedia_artist_bios_batch_async(
                 artists_normalized, lang
             )
             return Response(
@@ -22,6 +22,7 @@ else:
 
 django_asgi_app = get_asgi_application()
 
+from .lifespan import lifespan_app  # noqa: E402
 from .routing import websocket_urlpatterns  # noqa: E402
 
 websocket_app = AuthMiddlewareStack(URLRouter(websocket_urlpatterns))
@@ -32,5 +33,6 @@ application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
         "websocket": websocket_app,
+        "lifespan": lifespan_app,
     }
 )
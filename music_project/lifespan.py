@@ -0,0 +1,23 @@
+import logging
+
+from music_api.services.http_clients import close_http_clients, open_http_clients
+
+logger = logging.getLogger(__name__)
+
+
+async def lifespan_app(scope, receive, send):
+    """ASGI lifespan: общий пул HTTP-клиентов живёт столько же, сколько воркер."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                open_http_clients()
+            except Exception as exc:
+                logger.error("Lifespan startup failed: %s", exc, exc_info=True)
+                await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_http_clients()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
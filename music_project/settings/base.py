@@ -5,7 +5,7 @@
 import os
 from datetime import timedelta
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 import dj_database_url
 
 USE_DOCKER = os.environ.get("USE_DOCKER") == "true"
@@ -136,9 +136,13 @@ if USE_DOCKER:
             "BACKEND": "django_redis.cache.RedisCache",
             "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}",
             "OPTIONS": {
-                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                # DefaultClient с метриками hit/miss/размера/задержки по префиксу ключа.
+                "CLIENT_CLASS": "music_api.services.cache_metrics.InstrumentedClient",
                 "CONNECTION_POOL_KWARGS": {"max_connections": 100},
-                "COMPRESSOR": "django_redis.compressors.zlib.ZlibCompressor",
+                # orjson (msgpack, если есть bytes), выше порога zlib, аудио — lz4;
+                # старые pickle + zlib читаются.
+                "SERIALIZER": "music_api.services.cache_codec.CacheSerializer",
+                "COMPRESSOR": "music_api.services.cache_codec.CacheCompressor",
                 "IGNORE_EXCEPTIONS": True,
                 "SOCKET_CONNECT_TIMEOUT": 5,
                 "SOCKET_TIMEOUT": 5,
@@ -157,6 +161,14 @@ else:
         }
     }
 
+# L1 в памяти воркера перед Redis (music_api/services/local_cache.py).
+# CACHE_L1_TTL переопределяет свежесть копии по пространству имён ключа,
+# например {"tracks_chart": 10}; 0 записей выключает L1.
+CACHE_L1_MAX_ENTRIES = config("CACHE_L1_MAX_ENTRIES", cast=int, default=128)
+CACHE_L1_TTL = {}
+# Сколько отдавать истёкшую копию, пока Redis недоступен.
+CACHE_L1_STALE_SECONDS = config("CACHE_L1_STALE_SECONDS", cast=int, default=15 * 60)
+
 if USE_DOCKER:
     CHANNEL_LAYERS = {
         "default": {
@@ -175,6 +187,42 @@ else:
 
 LASTFM_KEY = config("LASTFM_KEY")
 
+# Пул HTTP-клиентов к внешним API (music_api/services/http_clients.py).
+# UPSTREAM_HTTP_POOLS позволяет переопределить лимиты пула для провайдера,
+# например {"itunes": {"max_connections": 5}}. HTTP/2 требует пакет h2.
+UPSTREAM_HTTP2 = config("UPSTREAM_HTTP2", cast=bool, default=False)
+UPSTREAM_HTTP_POOLS = {}
+# Token bucket на провайдера, общий для воркеров через Redis:
+# {"itunes": {"rate": 2, "burst": 5, "max_wait": 1.0}}
+UPSTREAM_RATE_LIMITS = {}
+# Circuit breaker на провайдера (в пределах воркера):
+# {"lastfm": {"failure_threshold": 3, "open_seconds": 60}}
+UPSTREAM_CIRCUIT_BREAKERS = {}
+
+# Сколько ждать обогащения обложками (мс) до ответа с частичным результатом.
+# Переопределяется параметром ?budget_ms=; None — ждать всё.
+ENRICHMENT_BUDGET_MS = {"year_chart": 2500, "search": 1500}
+
+# Прогрев чартов: python manage.py prewarm_charts. Жанры — кнопки на главной
+# (static/js/utils/utils.js). Комбинация обновляется за LEAD секунд до
+# истечения soft TTL, плюс случайный сдвиг до JITTER секунд.
+CHART_PREWARM_GENRES = config(
+    "CHART_PREWARM_GENRES",
+    cast=Csv(),
+    default=(
+        "rock,pop,hip-hop,electronic,jazz,rap,soul,indie,r&b,k-pop,lo-fi,funk,"
+        "house,dubstep,trap,blues,metal,country,punk,classical,grunge,"
+        "alternative,phonk,edm,folk,hyperpop"
+    ),
+)
+CHART_PREWARM_INTERVAL_SECONDS = config(
+    "CHART_PREWARM_INTERVAL_SECONDS", cast=int, default=60
+)
+CHART_PREWARM_LEAD_SECONDS = config("CHART_PREWARM_LEAD_SECONDS", cast=int, default=90)
+CHART_PREWARM_JITTER_SECONDS = config(
+    "CHART_PREWARM_JITTER_SECONDS", cast=int, default=60
+)
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.User"
@@ -196,6 +244,15 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "music_api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "music_api.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "EXCEPTION_HANDLER": "music_api.exception_handler.api_exception_handler",
     "DEFAULT_THROTTLE_CLASSES": [
@@ -203,8 +260,9 @@ REST_FRAMEWORK = {
         "rest_framework.throttling.UserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
-        "anon": "100/hour",
-        "user": "1000/hour",
+        # Для нагрузочных прогонов (make k6-bench) лимиты поднимаются через .env.
+        "anon": config("THROTTLE_RATE_ANON", default="100/hour"),
+        "user": config("THROTTLE_RATE_USER", default="1000/hour"),
     },
 }
 
@@ -133,7 +133,10 @@ if REDIS_URL:
             "BACKEND": "django_redis.cache.RedisCache",
             "LOCATION": REDIS_URL,
             "OPTIONS": {
-                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                # DefaultClient с метриками hit/miss/размера/задержки по префиксу ключа.
+                "CLIENT_CLASS": "music_api.services.cache_metrics.InstrumentedClient",
+                "SERIALIZER": "music_api.services.cache_codec.CacheSerializer",
+                "COMPRESSOR": "music_api.services.cache_codec.CacheCompressor",
                 "IGNORE_EXCEPTIONS": True,
             },
             "TIMEOUT": 3600,
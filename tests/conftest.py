@@ -20,6 +20,16 @@ def clear_cache_between_tests():
     cache.clear()
 
 
+@pytest.fixture(autouse=True)
+def reset_upstream_guards(monkeypatch):
+    # Breaker'ы и локальные bucket'ы живут в процессе — не переносим их
+    # состояние из теста в тест.
+    from music_api.services import circuit_breaker, rate_limit
+
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(rate_limit, "_local_buckets", {})
+
+
 @pytest.fixture(autouse=True)
 def close_db_connections_between_tests():
     yield
@@ -47,7 +57,7 @@ def user(db):
     # Создаем плейлист для пользователя
     from music_api.models import Playlist
 
-    Playlist.objects.create(user=user, title="Test Playlist", tracks=[])
+    Playlist.objects.create(user=user, title="Test Playlist")
     return user
 
 
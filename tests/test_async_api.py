@@ -0,0 +1,39 @@
+import pytest
+from asgiref.sync import iscoroutinefunction
+from rest_framework.throttling import SimpleRateThrottle
+
+from music_api.views import async_api
+from music_api.views.tracks_async import YearChartAPIView
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.django_db(transaction=True)]
+
+
+async def test_api_views_are_served_as_coroutines():
+    assert iscoroutinefunction(YearChartAPIView.as_view())
+
+
+async def test_async_throttling_limits_anonymous_requests(
+    async_api_client, monkeypatch
+):
+    monkeypatch.setattr(
+        SimpleRateThrottle, "THROTTLE_RATES", {"anon": "2/min", "user": "2/min"}
+    )
+
+    statuses = [
+        (await async_api_client.get("/music_api/search/")).status_code for _ in range(3)
+    ]
+
+    assert statuses == [400, 400, 429]
+
+
+async def test_anonymous_request_skips_thread_pool_for_auth(
+    async_api_client, monkeypatch
+):
+    def fail_sync_to_async(*args, **kwargs):
+        raise AssertionError("anonymous request must not leave the event loop")
+
+    monkeypatch.setattr(async_api, "sync_to_async", fail_sync_to_async)
+
+    response = await async_api_client.get("/music_api/search/")
+
+    assert response.status_code == 400
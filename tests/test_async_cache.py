@@ -0,0 +1,54 @@
+import pytest
+
+from music_api.services.async_cache import AsyncCache, async_cache
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeNetworkCache:
+    def __init__(self):
+        self.data = {}
+        self.calls = []
+
+    def get_many(self, keys):
+        raise AssertionError("sync get_many must not be called from a coroutine")
+
+    async def aget_many(self, keys):
+        self.calls.append(("aget_many", list(keys)))
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    async def aset_many(self, data, timeout=None):
+        self.calls.append(("aset_many", sorted(data), timeout))
+        self.data.update(data)
+
+    async def aget(self, key, default=None):
+        self.calls.append(("aget", key))
+        return self.data.get(key, default)
+
+
+async def test_async_cache_round_trip_on_locmem():
+    assert async_cache.is_in_process()
+
+    await async_cache.set_many({"a": 1, "b": {"x": 2}}, timeout=60)
+    await async_cache.set("c", [3], timeout=60)
+
+    assert await async_cache.get("c") == [3]
+    assert await async_cache.get_many(["a", "b", "missing"]) == {"a": 1, "b": {"x": 2}}
+    assert await async_cache.add("a", 100) is False
+    await async_cache.delete("a")
+    assert await async_cache.get("a", "gone") == "gone"
+
+
+async def test_async_cache_uses_async_api_for_network_backends(monkeypatch):
+    fake = FakeNetworkCache()
+    facade = AsyncCache()
+    monkeypatch.setattr(AsyncCache, "backend", property(lambda self: fake))
+
+    await facade.set_many({"k1": 1, "k2": 2}, timeout=30)
+    result = await facade.get_many(["k1", "k1", "k3"])
+
+    assert result == {"k1": 1}
+    assert await facade.get("k2") == 2
+    assert fake.calls[0] == ("aset_many", ["k1", "k2"], 30)
+    assert fake.calls[1] == ("aget_many", ["k1", "k3"])
+    assert await facade.get_many([]) == {}
@@ -0,0 +1,100 @@
+import datetime
+import pickle
+import zlib
+from io import StringIO
+
+from django.core.management import call_command
+from django_redis.exceptions import CompressorError
+
+from music_api.management.commands.bench_cache_codec import CODECS, sample_entries
+from music_api.services.cache_codec import (
+    JSON_PREFIX,
+    LZ4_PREFIX,
+    LZ4_MIN_BYTES,
+    MSGPACK_PREFIX,
+    PICKLE_PREFIX,
+    ZLIB_PREFIX,
+    CacheCompressor,
+    CacheSerializer,
+)
+
+
+def roundtrip(value):
+    serializer, compressor = CacheSerializer({}), CacheCompressor({})
+    raw = compressor.compress(serializer.dumps(value))
+    try:
+        raw = compressor.decompress(raw)
+    except CompressorError:
+        pass
+    return serializer.loads(raw)
+
+
+def test_serializer_picks_format_by_value():
+    serializer = CacheSerializer({})
+
+    assert serializer.dumps({"value": [1, "a"], "created_at": 1.5}).startswith(
+        JSON_PREFIX
+    )
+    assert serializer.dumps({"content": b"\x00\xff"}).startswith(MSGPACK_PREFIX)
+    assert serializer.dumps({1, 2}).startswith(PICKLE_PREFIX)
+
+
+def test_values_keep_their_types():
+    tracks = [{"name": "Numb", "artist": "Linkin Park", "listeners": 10}] * 50
+    when = datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc)
+
+    assert roundtrip({"value": tracks, "created_at": 1.25}) == {
+        "value": tracks,
+        "created_at": 1.25,
+    }
+    assert roundtrip({"content": b"\x00" * 10, "content_type": "audio/mpeg"}) == {
+        "content": b"\x00" * 10,
+        "content_type": "audio/mpeg",
+    }
+    assert roundtrip({7: "int key"}) == {7: "int key"}
+    assert roundtrip(when) == when
+    assert roundtrip({"a", "b"}) == {"a", "b"}
+
+
+def test_compression_only_above_threshold():
+    compressor = CacheCompressor({"COMPRESS_MIN_BYTES": 100})
+    small = JSON_PREFIX + b"1" * 50
+    large = JSON_PREFIX + b"[" + b'"same",' * 100 + b"1]"
+
+    assert compressor.compress(small) == small
+    assert compressor.compress(large).startswith(ZLIB_PREFIX)
+    assert compressor.compress(large * (LZ4_MIN_BYTES // len(large) + 1)).startswith(
+        LZ4_PREFIX
+    )
+
+
+def test_json_values_are_not_larger_than_pickle_and_zlib():
+    legacy_serializer, legacy_compressor = CODECS["pickle+zlib"]
+    for label in ("tracks_chart (75)", "tracks_chart (15)", "search_enriched (14)"):
+        value = sample_entries()[label]
+
+        legacy = legacy_compressor.compress(legacy_serializer.dumps(value))
+        current = CacheCompressor({}).compress(CacheSerializer({}).dumps(value))
+
+        assert len(current) <= len(legacy), label
+        assert roundtrip(value) == value
+
+
+def test_reads_values_written_by_pickle_and_zlib():
+    serializer, compressor = CacheSerializer({}), CacheCompressor({})
+    legacy = zlib.compress(pickle.dumps({"value": ["old"], "created_at": 1.0}))
+
+    assert serializer.loads(compressor.decompress(legacy)) == {
+        "value": ["old"],
+        "created_at": 1.0,
+    }
+    assert serializer.loads(pickle.dumps("short")) == "short"
+
+
+def test_bench_cache_codec_command_reports_both_codecs():
+    out = StringIO()
+
+    call_command("bench_cache_codec", iterations=1, stdout=out)
+
+    assert "pickle+zlib" in out.getvalue()
+    assert "json+zlib" in out.getvalue()
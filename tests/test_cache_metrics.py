@@ -0,0 +1,99 @@
+from django_redis.cache import RedisCache
+
+from music_api.services.cache_metrics import key_prefix
+from music_api.services.metrics import (
+    CACHE_OPERATION_SECONDS,
+    CACHE_REQUESTS,
+    CACHE_SETS,
+    CACHE_VALUE_BYTES,
+)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.pending = []
+
+    def set(self, key, value, nx=False, px=None, xx=False):
+        self.pending.append((key, value))
+
+    def execute(self):
+        self.redis.data.update(self.pending)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, nx=False, px=None, xx=False):
+        self.data[key] = value
+        return True
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+def _backend(monkeypatch):
+    backend = RedisCache(
+        "redis://localhost:6379/0",
+        {
+            "OPTIONS": {
+                "CLIENT_CLASS": "music_api.services.cache_metrics.InstrumentedClient",
+                "SERIALIZER": "music_api.services.cache_codec.CacheSerializer",
+                "COMPRESSOR": "music_api.services.cache_codec.CacheCompressor",
+            },
+            "KEY_PREFIX": "metrics-test",
+        },
+    )
+    fake = FakeRedis()
+    client = backend.client
+    monkeypatch.setattr(client, "get_client", lambda *args, **kwargs: fake)
+    monkeypatch.setattr(
+        client, "get_client_with_index", lambda *args, **kwargs: (fake, 0)
+    )
+    return backend
+
+
+def test_key_prefix_keeps_label_cardinality_bounded():
+    assert key_prefix("tracks_chart:g1760000000000000:all:15") == "tracks_chart"
+    assert key_prefix("prepared:tracks_chart:g1:all:15") == "prepared"
+    assert key_prefix("audio_proxy:abc") == "audio_proxy"
+    assert key_prefix("throttle_anon_127.0.0.1") == "throttle"
+    assert key_prefix("ws_presence_user_7_connections") == "ws_presence"
+    assert key_prefix("Some Key:with spaces") == "other"
+    assert key_prefix("plain") == "other"
+
+
+def test_instrumented_client_counts_hits_misses_sets_and_sizes(monkeypatch):
+    backend = _backend(monkeypatch)
+    hits = CACHE_REQUESTS.labels(prefix="itunes", result="hit")
+    misses = CACHE_REQUESTS.labels(prefix="itunes", result="miss")
+    sets = CACHE_SETS.labels(prefix="itunes")
+    sizes = CACHE_VALUE_BYTES.labels(prefix="itunes")
+    get_latency = CACHE_OPERATION_SECONDS.labels(prefix="itunes", operation="get")
+    before = (
+        hits._value.get(),
+        misses._value.get(),
+        sets._value.get(),
+        sizes._sum.get(),
+        get_latency._sum.get(),
+    )
+    value = {"cover": "https://img.example/numb.jpg", "preview": None}
+
+    backend.set("itunes:g1:numb", value, timeout=60)
+    backend.set_many({"itunes:g1:a": value, "itunes:g1:b": value}, timeout=60)
+
+    assert backend.get("itunes:g1:numb") == value
+    assert backend.get("itunes:g1:missing", "default") == "default"
+    assert backend.get_many(["itunes:g1:a", "itunes:g1:c"]) == {"itunes:g1:a": value}
+    assert hits._value.get() - before[0] == 2
+    assert misses._value.get() - before[1] == 2
+    assert sets._value.get() - before[2] == 3
+    assert sizes._sum.get() - before[3] > 3 * len("https://img.example/numb.jpg")
+    assert get_latency._sum.get() > before[4]
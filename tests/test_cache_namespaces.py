@@ -0,0 +1,95 @@
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory
+
+from music_api.admin import _admin_cache_invalidate_view
+from music_api.services import cache_namespaces
+
+
+def test_bump_moves_namespace_to_new_keys_only():
+    chart_key = cache_namespaces.key("tracks_chart", "all", 15)
+    search_key = cache_namespaces.key("search_enriched", "numb", "default", 1, 20)
+    assert chart_key.startswith("tracks_chart:g")
+    assert chart_key.endswith(":all:15")
+
+    generation = cache_namespaces.bump("tracks_chart")
+
+    assert cache_namespaces.generation("tracks_chart") == generation
+    assert cache_namespaces.key("tracks_chart", "all", 15) != chart_key
+    assert (
+        cache_namespaces.key("search_enriched", "numb", "default", 1, 20) == search_key
+    )
+    with pytest.raises(KeyError):
+        cache_namespaces.key("tracks_chart_v8")
+
+
+def test_lost_counter_never_reuses_old_generation():
+    before = cache_namespaces.bump("apple_chart")
+    cache.delete(cache_namespaces.generation_key("apple_chart"))
+
+    assert cache_namespaces.generation("apple_chart") > before
+    cache.delete(cache_namespaces.generation_key("apple_chart"))
+    assert cache_namespaces.bump("apple_chart") > before
+
+
+@pytest.mark.asyncio
+async def test_async_key_matches_sync_key():
+    assert await cache_namespaces.akey("itunes") == cache_namespaces.key("itunes")
+    assert await cache_namespaces.akey(
+        "artist_search", "queen", "ru"
+    ) == cache_namespaces.key("artist_search", "queen", "ru")
+
+
+def test_invalidate_cache_command():
+    before = cache_namespaces.generation("search_enriched")
+    out = StringIO()
+
+    call_command("invalidate_cache", "search_enriched", stdout=out)
+
+    assert cache_namespaces.generation("search_enriched") == before + 1
+    assert f"search_enriched: g{before + 1}" in out.getvalue()
+    with pytest.raises(CommandError):
+        call_command("invalidate_cache", "unknown")
+    with pytest.raises(CommandError):
+        call_command("invalidate_cache")
+
+
+def test_admin_invalidate_view_bumps_namespace(monkeypatch):
+    monkeypatch.setattr(
+        "music_api.admin.messages.success", lambda *args, **kwargs: None
+    )
+    before = cache_namespaces.generation("trending_artists_full")
+    request = RequestFactory().post("/admin/cache/invalidate/trending_artists_full/")
+    request.user = SimpleNamespace(is_superuser=True, pk=1, get_username=lambda: "root")
+
+    response = _admin_cache_invalidate_view(request, "trending_artists_full")
+
+    assert response.status_code == 302
+    assert response["Location"] == "/admin/cache/"
+    assert cache_namespaces.generation("trending_artists_full") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_key_falls_back_to_local_generation_when_cache_is_down(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    }
+
+    key = await cache_namespaces.akey("tracks_chart", "all", 15)
+
+    assert key.startswith("tracks_chart:g")
+    assert await cache_namespaces.akey("tracks_chart", "all", 15) == key
+    assert cache_namespaces.key("tracks_chart", "all", 15) == key
+
+
+def test_key_survives_cache_errors(monkeypatch):
+    def broken(*args, **kwargs):
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(cache_namespaces.cache, "get", broken)
+
+    assert cache_namespaces.key("apple_chart", "us").startswith("apple_chart:g")
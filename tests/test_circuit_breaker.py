@@ -0,0 +1,96 @@
+import pytest
+import respx
+from django.core.cache import cache
+
+from music_api.services import (
+    cache_namespaces,
+    circuit_breaker,
+    http_clients,
+    stale_cache,
+)
+from music_api.services.stale_cache import stale_key
+from music_api.views.services_async import (
+    _build_track_cache_key,
+    _get_itunes_batch_async,
+)
+
+
+def test_breaker_opens_after_failures_and_recovers_via_probe(settings):
+    settings.UPSTREAM_CIRCUIT_BREAKERS = {
+        "lastfm": {"failure_threshold": 2, "open_seconds": 0}
+    }
+    breaker = circuit_breaker.get_breaker("lastfm")
+
+    breaker.record_failure()
+    assert breaker.state == circuit_breaker.CLOSED
+    breaker.record_failure()
+
+    # open_seconds=0: сразу полуоткрыт и пропускает одну пробу.
+    assert breaker.state == circuit_breaker.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(circuit_breaker.CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success(0.1)
+    assert breaker.state == circuit_breaker.CLOSED
+
+
+def test_slow_calls_count_as_failures(settings):
+    settings.UPSTREAM_CIRCUIT_BREAKERS = {
+        "itunes": {"failure_threshold": 1, "slow_call_seconds": 0.5}
+    }
+    breaker = circuit_breaker.get_breaker("itunes")
+
+    breaker.record_success(1.0)
+
+    assert breaker.state == circuit_breaker.OPEN
+    with pytest.raises(circuit_breaker.CircuitOpenError):
+        breaker.before_call()
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast_and_serves_stale_value(settings):
+    settings.UPSTREAM_CIRCUIT_BREAKERS = {"itunes": {"failure_threshold": 1}}
+    cache_key = _build_track_cache_key(
+        cache_namespaces.key("itunes"), "", "Numb", "Linkin Park"
+    )
+    stale_value = {"cover": "https://img.example/old.jpg", "preview": None}
+    cache.set(stale_key(cache_key), stale_value, timeout=60)
+
+    with respx.mock(assert_all_called=True) as mock:
+        route = mock.get("https://itunes.apple.com/search").respond(503)
+        client = http_clients.get_http_client("itunes")
+        await client.get("https://itunes.apple.com/search")
+
+        result = await _get_itunes_batch_async(
+            [{"name": "Numb", "artist": "Linkin Park"}]
+        )
+
+    assert circuit_breaker.get_breaker("itunes").state == circuit_breaker.OPEN
+    assert len(route.calls) == 1
+    assert result[("Numb", "Linkin Park")] == stale_value
+    # Отказ breaker'а не кэшируется как пустой результат.
+    assert cache.get(cache_key) is None
+    await http_clients.close_http_clients()
+
+
+def test_ready_health_reports_circuit_states(client, db, settings):
+    settings.UPSTREAM_CIRCUIT_BREAKERS = {"deezer": {"failure_threshold": 1}}
+    circuit_breaker.get_breaker("deezer").record_failure()
+
+    response = client.get("/health/ready")
+    circuits = response.json()["checks"]["upstream_circuits"]
+
+    assert circuits["ok"] is False
+    assert circuits["detail"]["deezer"] == circuit_breaker.OPEN
+    assert circuits["detail"]["lastfm"] == circuit_breaker.CLOSED
+
+
+def test_stale_copy_outlives_the_primary_key_it_backs():
+    for namespace, primary in stale_cache.PRIMARY_TTL_SECONDS.items():
+        key = cache_namespaces.key(namespace, "numb")
+        assert stale_cache.stale_ttl(key) > primary
+
+    releases = cache_namespaces.key("lastfm_releases", "linkin park")
+    track = cache_namespaces.key("itunes", "numb")
+    assert stale_cache.stale_ttl(releases) < stale_cache.stale_ttl(track)
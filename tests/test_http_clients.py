@@ -0,0 +1,45 @@
+import pytest
+import respx
+
+from music_api.services import http_clients
+from music_api.services.metrics import UPSTREAM_CONNECTIONS
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_http_client_is_shared_per_provider_within_loop():
+    lastfm = http_clients.get_http_client("lastfm")
+    itunes = http_clients.get_http_client("itunes")
+
+    assert http_clients.get_http_client("lastfm") is lastfm
+    assert itunes is not lastfm
+
+    await http_clients.close_http_clients()
+
+    assert lastfm.is_closed
+    assert itunes.is_closed
+    assert http_clients.get_http_client("lastfm") is not lastfm
+    await http_clients.close_http_clients()
+
+
+async def test_http_client_pool_limits_can_be_overridden(settings):
+    settings.UPSTREAM_HTTP_POOLS = {"itunes": {"max_connections": 3}}
+
+    config = http_clients.get_pool_config("itunes")
+
+    assert config.max_connections == 3
+    assert config.max_keepalive_connections == 5
+
+
+async def test_http_client_records_connection_outcome():
+    counter = UPSTREAM_CONNECTIONS.labels(provider="deezer", outcome="reused")
+    before = counter._value.get()
+
+    with respx.mock(assert_all_called=True) as mock:
+        mock.get("https://api.deezer.com/search").respond(200, json={"data": []})
+        client = http_clients.get_http_client("deezer")
+        response = await client.get("https://api.deezer.com/search")
+
+    assert response.status_code == 200
+    assert counter._value.get() == before + 1
+    await http_clients.close_http_clients()
@@ -0,0 +1,148 @@
+import orjson
+import pytest
+from django_redis.exceptions import ConnectionInterrupted
+
+from music_api.services import async_cache as async_cache_module
+from music_api.services.async_cache import AsyncCache
+from music_api.services.local_cache import MISSING, Invalidator, LocalCache
+
+HOT_KEY = "tracks_chart:all:15"
+
+
+class FakeClient:
+    def __init__(self, data):
+        self.data = data
+        self.down = False
+        self.calls = []
+
+    def get_many(self, keys):
+        self.calls.append(list(keys))
+        if self.down:
+            raise ConnectionInterrupted(connection=None)
+        return {key: self.data[key] for key in keys if key in self.data}
+
+
+class FakeRedisCache:
+    _ignore_exceptions = True
+
+    def __init__(self):
+        self.data = {}
+        self.client = FakeClient(self.data)
+
+    async def aset(self, key, value, timeout=None):
+        self.data[key] = value
+
+    async def adelete(self, key):
+        self.data.pop(key, None)
+
+    async def aget(self, key, default=None):
+        return self.data.get(key, default)
+
+    async def aget_many(self, keys):
+        return {key: self.data[key] for key in keys if key in self.data}
+
+
+class FakeInvalidator:
+    def __init__(self):
+        self.published = []
+
+    def start(self):
+        pass
+
+    def publish(self, keys):
+        self.published.append(keys)
+
+
+@pytest.fixture
+def redis_facade(monkeypatch):
+    backend = FakeRedisCache()
+    local = LocalCache(ttl={"tracks_chart": 30}, max_entries=8)
+    invalidator = FakeInvalidator()
+    monkeypatch.setattr(AsyncCache, "backend", property(lambda self: backend))
+    monkeypatch.setattr(async_cache_module, "uses_redis", lambda backend: True)
+    monkeypatch.setattr(async_cache_module, "get_local_cache", lambda: local)
+    monkeypatch.setattr(async_cache_module, "get_invalidator", lambda: invalidator)
+    return AsyncCache(), backend, local, invalidator
+
+
+def test_local_cache_caps_ttl_per_namespace_and_evicts_lru(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("music_api.services.local_cache.time.monotonic", lambda: now[0])
+    local = LocalCache(ttl={"tracks_chart": 30, "prepared": 5}, max_entries=2)
+
+    local.set("search:q", [1])
+    local.set("tracks_chart:all:15", [1], timeout=3600)
+    local.set("prepared:tracks_chart:all:15", {"body": b"{}"}, timeout=3600)
+    assert local.get("search:q") is MISSING
+    assert len(local) == 2
+
+    now[0] += 10
+    assert local.get("tracks_chart:all:15") == [1]
+    assert local.get("prepared:tracks_chart:all:15") is MISSING
+    assert local.get("prepared:tracks_chart:all:15", allow_stale=True) == {
+        "body": b"{}"
+    }
+
+    local.set("tracks_chart:rock:15", [2])
+    local.set("tracks_chart:pop:15", [3])
+    assert local.get("tracks_chart:all:15") is MISSING
+
+    local.expire_all()
+    assert local.get("tracks_chart:pop:15") is MISSING
+    assert local.get("tracks_chart:pop:15", allow_stale=True) == [3]
+
+
+def test_invalidator_drops_keys_written_by_other_workers():
+    local = LocalCache(ttl={"tracks_chart": 30})
+    invalidator = Invalidator(local)
+    local.set("tracks_chart:a:15", [1])
+    local.set("tracks_chart:b:15", [2])
+
+    own = orjson.dumps({"origin": invalidator.origin, "keys": ["tracks_chart:a:15"]})
+    invalidator.handle_message(own)
+    assert local.get("tracks_chart:a:15") == [1]
+
+    other = orjson.dumps({"origin": "other", "keys": ["tracks_chart:a:15"]})
+    invalidator.handle_message(other)
+    invalidator.handle_message(b"not json")
+    assert local.get("tracks_chart:a:15") is MISSING
+    assert local.get("tracks_chart:b:15") == [2]
+
+
+@pytest.mark.asyncio
+async def test_hot_keys_served_from_l1_and_broadcast_on_write(redis_facade):
+    facade, backend, local, invalidator = redis_facade
+
+    await facade.set(HOT_KEY, {"value": [1]}, timeout=600)
+    assert invalidator.published == [[HOT_KEY]]
+    assert await facade.get(HOT_KEY) == {"value": [1]}
+    assert backend.client.calls == []
+
+    local.clear()
+    backend.data["search:q"] = [2]
+    assert await facade.get_many([HOT_KEY, "search:q"]) == {
+        HOT_KEY: {"value": [1]},
+        "search:q": [2],
+    }
+    assert backend.client.calls == [[HOT_KEY]]
+    assert await facade.get(HOT_KEY) == {"value": [1]}
+    assert len(backend.client.calls) == 1
+
+    await facade.delete(HOT_KEY)
+    assert invalidator.published[-1] == [HOT_KEY]
+    assert await facade.get(HOT_KEY, "gone") == "gone"
+
+
+@pytest.mark.asyncio
+async def test_expired_l1_copy_served_while_redis_is_down(redis_facade):
+    facade, backend, local, _ = redis_facade
+    await facade.set(HOT_KEY, {"value": [1]}, timeout=600)
+    local.expire_all()
+    backend.client.down = True
+
+    assert await facade.get(HOT_KEY) == {"value": [1]}
+    assert await facade.get("tracks_chart:rock:15", "miss") == "miss"
+
+    backend._ignore_exceptions = False
+    with pytest.raises(ConnectionInterrupted):
+        await facade.get("tracks_chart:rock:15")
@@ -1,9 +1,13 @@
 import pytest
 from django.contrib.auth import get_user_model
-from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 
-from music_api.models import Playlist, PlaylistLike, PlaylistLikeNotification
+from music_api.models import (
+    Playlist,
+    PlaylistLike,
+    PlaylistLikeNotification,
+    PlaylistTrack,
+)
 
 pytestmark = pytest.mark.django_db
 
@@ -11,9 +15,7 @@ pytestmark = pytest.mark.django_db
 def test_playlist_belongs_to_user_and_available_via_related_name(user):
     assert user.playlists.count() == 2
     auto_playlist = user.playlists.get(title="Favorites")
-    manual_playlist = Playlist.objects.create(
-        user=user, title="Custom Playlist", tracks=[]
-    )
+    manual_playlist = Playlist.objects.create(user=user, title="Custom Playlist")
 
     assert user.playlists.count() == 3
     assert manual_playlist.user_id == user.id
@@ -21,53 +23,61 @@ def test_playlist_belongs_to_user_and_available_via_related_name(user):
     assert auto_playlist in user.playlists.all()
 
 
-def test_playlist_is_deleted_when_user_is_deleted(user):
-    playlist = Playlist.objects.create(
-        user=user,
-        title="Favorites",
-        tracks=[{"name": "Numb", "artist": "Linkin Park"}],
+def _track(playlist, name, artist, position=1, mbid=""):
+    return PlaylistTrack.objects.create(
+        playlist=playlist,
+        position=position,
+        name=name,
+        artist=artist,
+        name_key=name.lower(),
+        artist_key=artist.lower(),
+        mbid=mbid,
     )
 
+
+def test_playlist_is_deleted_when_user_is_deleted(user):
+    playlist = Playlist.objects.create(user=user, title="Favorites")
+    track = _track(playlist, "Numb", "Linkin Park")
+
     user.delete()
 
     assert not Playlist.objects.filter(id=playlist.id).exists()
+    assert not PlaylistTrack.objects.filter(id=track.id).exists()
+
 
+def test_playlist_track_dicts_keep_position_order_and_mbid(user):
+    playlist = Playlist.objects.create(user=user, title="Favorites")
+    _track(playlist, "In The End", "Linkin Park", position=2)
+    _track(playlist, "Numb", "Linkin Park", position=1, mbid="numb-mbid")
 
-def test_playlist_tracks_jsonfield_accepts_valid_json_payload(user):
-    payload = [
-        {"name": "Numb", "artist": "Linkin Park"},
+    assert playlist.track_dicts() == [
+        {"name": "Numb", "artist": "Linkin Park", "mbid": "numb-mbid"},
         {"name": "In The End", "artist": "Linkin Park"},
     ]
-    playlist = Playlist(user=user, title="Favorites", tracks=payload)
-
-    playlist.full_clean()
-    playlist.save()
-
-    playlist.refresh_from_db()
-    assert playlist.tracks == payload
 
 
-def test_playlist_tracks_jsonfield_rejects_non_json_serializable_value(user):
-    playlist = Playlist(user=user, title="Favorites", tracks={"bad_set": {1, 2, 3}})
-
-    with pytest.raises(ValidationError):
-        playlist.full_clean()
-
-
-def test_playlist_tracks_default_list_is_not_shared_between_instances(user):
+def test_playlist_track_unique_key_per_playlist(user):
     first = Playlist.objects.create(user=user, title="Favorites")
     second = Playlist.objects.create(user=user, title="Road Trip")
+    _track(first, "Numb", "Linkin Park")
+    _track(second, "Numb", "Linkin Park")
 
-    first.tracks.append({"name": "Track 1", "artist": "Artist 1"})
-    first.save(update_fields=["tracks"])
-    second.refresh_from_db()
+    with pytest.raises(IntegrityError):
+        _track(first, "Numb", "Linkin Park", position=2)
 
-    assert first.tracks != second.tracks
-    assert second.tracks == []
+
+def test_playlist_track_unique_mbid_only_when_present(user):
+    playlist = Playlist.objects.create(user=user, title="Favorites")
+    _track(playlist, "Numb", "Linkin Park", mbid="same-mbid")
+    _track(playlist, "Faint", "Linkin Park", position=2)
+    _track(playlist, "Papercut", "Linkin Park", position=3)
+
+    with pytest.raises(IntegrityError):
+        _track(playlist, "Numb (Remix)", "Linkin Park", position=4, mbid="same-mbid")
 
 
 def test_playlist_like_unique_constraint(user):
-    playlist = Playlist.objects.create(user=user, title="Test Playlist", tracks=[])
+    playlist = Playlist.objects.create(user=user, title="Test Playlist")
     liker = get_user_model().objects.create_user(
         username="liker_unique",
         email="liker_unique@example.com",
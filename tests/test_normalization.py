@@ -0,0 +1,47 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from music_api.management.commands import bench_normalization
+from music_api.services import normalization
+
+
+def test_normalizers_match_legacy_implementation():
+    values = [name for pair in bench_normalization.SAMPLE_TRACKS for name in pair]
+    values += ["", "  Sigur   Rós ", "AC/DC", "Beyoncé (Live) feat. Jay-Z"]
+
+    for value in values:
+        assert normalization.normalize_track_text(
+            value
+        ) == bench_normalization._legacy_track_text(value)
+        assert normalization.normalize_artist_name(
+            value
+        ) == bench_normalization._legacy_artist_name(value)
+        assert normalization.normalize_text(value) == bench_normalization._legacy_text(
+            value
+        )
+
+
+def test_match_helpers():
+    assert normalization.track_names_match(
+        "Bohemian Rhapsody", "Bohemian Rhapsody - Remastered 2011"
+    )
+    assert not normalization.track_names_match("One", "Once")
+    assert normalization.artist_tokens_match("Queen", "Queen & David Bowie")
+    assert not normalization.artist_tokens_match("", "Queen")
+
+
+def test_normalize_many_keeps_order_and_uses_normalizer():
+    result = normalization.normalize_many(
+        ["Björk", "Queen", "Björk", None], normalization.normalize_artist_name
+    )
+
+    assert result == ["bjork", "queen", "bjork", ""]
+
+
+def test_bench_normalization_command_reports_speedup():
+    out = StringIO()
+
+    call_command("bench_normalization", iterations=1, repeat=1, stdout=out)
+
+    assert "speedup" in out.getvalue()
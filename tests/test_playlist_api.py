@@ -52,11 +52,11 @@ async def test_playlist_add_track_and_conflict(authorized_async_api_client, user
     )
 
     playlist = await sync_to_async(Playlist.objects.get)(user=user, title="Favorites")
+    tracks = await sync_to_async(playlist.track_dicts)()
 
     assert first.status_code == 201
     assert second.status_code == 409
-    assert len(playlist.tracks) == 1
-    assert playlist.tracks[0] == {"name": "Numb", "artist": "Linkin Park"}
+    assert tracks == [{"name": "Numb", "artist": "Linkin Park"}]
 
 
 @pytest.mark.django_db(transaction=True)
@@ -90,10 +90,11 @@ async def test_playlist_add_track_stores_mbid_when_provided(
         },
     )
     playlist = await sync_to_async(Playlist.objects.get)(user=user, title="Favorites")
+    tracks = await sync_to_async(playlist.track_dicts)()
 
     assert response.status_code == 201
-    assert len(playlist.tracks) == 1
-    assert playlist.tracks[0]["mbid"] == "abc123-uuid-mbid"
+    assert len(tracks) == 1
+    assert tracks[0]["mbid"] == "abc123-uuid-mbid"
 
 
 @pytest.mark.django_db(transaction=True)
@@ -118,10 +119,11 @@ async def test_playlist_add_track_dedup_by_mbid(authorized_async_api_client, use
     )
 
     playlist = await sync_to_async(Playlist.objects.get)(user=user, title="Favorites")
+    tracks = await sync_to_async(playlist.track_dicts)()
 
     assert first.status_code == 201
     assert second.status_code == 409
-    assert len(playlist.tracks) == 1
+    assert len(tracks) == 1
 
 
 @pytest.mark.django_db(transaction=True)
@@ -144,3 +146,44 @@ async def test_playlist_me_patch_rejects_too_long_title(authorized_async_api_cli
 
     assert response.status_code == 400
     assert response.json()["detail"] == "Title is too long."
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_playlist_add_tracks_in_order_and_remove_by_key(
+    authorized_async_api_client, user
+):
+    for name in ("Numb", "Faint", "Papercut"):
+        response = await authorized_async_api_client.post(
+            "/api/playlists/me/tracks/",
+            json={"name": name, "artist": "Linkin Park"},
+        )
+        assert response.status_code == 201
+
+    removed = await authorized_async_api_client.request(
+        "DELETE",
+        "/api/playlists/me/tracks/",
+        json={"name": "  FAINT ", "artist": "linkin park"},
+    )
+    missing = await authorized_async_api_client.request(
+        "DELETE",
+        "/api/playlists/me/tracks/",
+        json={"name": "Faint", "artist": "Linkin Park"},
+    )
+    playlist = await sync_to_async(Playlist.objects.get)(user=user, title="Favorites")
+    tracks = await sync_to_async(playlist.track_dicts)()
+
+    assert removed.status_code == 200
+    assert missing.status_code == 404
+    assert [track["name"] for track in tracks] == ["Numb", "Papercut"]
+    assert [item.position async for item in playlist.items.all()] == [1, 3]
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_playlist_add_track_rejects_too_long_fields(authorized_async_api_client):
+    response = await authorized_async_api_client.post(
+        "/api/playlists/me/tracks/",
+        json={"name": "a" * 256, "artist": "Linkin Park"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Track fields are too long."
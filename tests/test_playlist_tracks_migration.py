@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+BEFORE = [("music_api", "0014_playlisttrack")]
+AFTER = [("music_api", "0015_copy_playlist_tracks")]
+
+
+def _executor():
+    # Тесты создают схему без миграций (--no-migrations): отмечаем все
+    # миграции применёнными, чтобы executor мог откатиться к нужной.
+    executor = MigrationExecutor(connection)
+    applied = executor.recorder.applied_migrations()
+    for key in executor.loader.graph.nodes:
+        if key not in applied:
+            executor.recorder.record_applied(*key)
+    return MigrationExecutor(connection)
+
+
+@pytest.fixture
+def migrate(settings):
+    settings.MIGRATION_MODULES = {}
+    executor = _executor()
+
+    def run(targets):
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    yield run
+    run(executor.loader.graph.leaf_nodes("music_api"))
+
+
+def test_copy_playlist_tracks_forward_and_back(user, migrate):
+    apps = migrate(BEFORE)
+    Playlist = apps.get_model("music_api", "Playlist")
+    playlist = Playlist.objects.create(
+        user_id=user.id,
+        title="Legacy",
+        tracks=[
+            {"name": "Numb", "artist": "Linkin Park", "mbid": "m-1"},
+            {"name": " numb ", "artist": "LINKIN  PARK"},
+            "not a track",
+            None,
+            {"name": "Other", "artist": "Someone", "mbid": "m-1"},
+            {"name": "Beyoncé", "artist": {"name": "Beyoncé", "mbid": "b"}},
+            {"name": "x" * 300, "artist": "y" * 300, "mbid": "z" * 100},
+            {"name": "", "artist": "Nobody"},
+        ],
+    )
+
+    apps = migrate(AFTER)
+    rows = list(
+        apps.get_model("music_api", "PlaylistTrack")
+        .objects.filter(playlist_id=playlist.id)
+        .order_by("position")
+        .values("position", "name", "artist", "name_key", "artist_key", "mbid")
+    )
+
+    assert rows == [
+        {
+            "position": 1,
+            "name": "Numb",
+            "artist": "Linkin Park",
+            "name_key": "numb",
+            "artist_key": "linkin park",
+            "mbid": "m-1",
+        },
+        {
+            "position": 2,
+            "name": "Beyoncé",
+            "artist": "Beyoncé",
+            "name_key": "beyonce",
+            "artist_key": "beyonce",
+            "mbid": "",
+        },
+        {
+            "position": 3,
+            "name": "x" * 255,
+            "artist": "y" * 255,
+            "name_key": "x" * 255,
+            "artist_key": "y" * 255,
+            "mbid": "z" * 64,
+        },
+    ]
+
+    apps = migrate(BEFORE)
+    restored = apps.get_model("music_api", "Playlist").objects.get(id=playlist.id)
+    assert restored.tracks == [
+        {"name": "Numb", "artist": "Linkin Park", "mbid": "m-1"},
+        {"name": "Beyoncé", "artist": "Beyoncé"},
+        {"name": "x" * 255, "artist": "y" * 255, "mbid": "z" * 64},
+    ]
+    assert not apps.get_model("music_api", "PlaylistTrack").objects.exists()
@@ -0,0 +1,57 @@
+import time
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+
+from music_api.management.commands import prewarm_charts
+from music_api.services import cache_namespaces
+from music_api.views.tracks_async import DeezerChartAPIView, YearChartAPIView
+
+
+def test_prewarm_once_refreshes_only_due_combinations(monkeypatch):
+    refreshed = []
+
+    async def fake_refresh_artists(cache_key, genre, limit):
+        refreshed.append(("trending", genre))
+
+    async def fake_year_chart(self, cache_key, genre, limit):
+        refreshed.append(("year-chart", genre))
+
+    async def fake_apple_chart(self, cache_key, country, count, chart_type):
+        refreshed.append(("apple-chart", country))
+
+    monkeypatch.setattr(prewarm_charts, "_refresh_artists", fake_refresh_artists)
+    monkeypatch.setattr(YearChartAPIView, "_refresh_chart_async", fake_year_chart)
+    monkeypatch.setattr(DeezerChartAPIView, "_refresh_chart_async", fake_apple_chart)
+    cache.set(
+        cache_namespaces.key("apple_chart", "us", 50, "songs"),
+        {"value": [{"name": "Fresh"}], "created_at": time.time()},
+        timeout=60,
+    )
+
+    out = StringIO()
+    call_command("prewarm_charts", "--once", "--genres", "rock,jazz", stdout=out)
+
+    assert sorted(refreshed, key=str) == sorted(
+        [
+            ("trending", None),
+            ("trending", "rock"),
+            ("year-chart", "rock"),
+            ("trending", "jazz"),
+            ("year-chart", "jazz"),
+        ],
+        key=str,
+    )
+    assert "Refreshed 5/6 combinations" in out.getvalue()
+
+
+async def test_prewarm_targets_match_frontend_requests():
+    targets = await prewarm_charts.build_targets(["hip-hop"])
+
+    assert [target.cache_key for target in targets] == [
+        cache_namespaces.key("apple_chart", "us", 50, "songs"),
+        cache_namespaces.key("trending_artists_full", "all", 16),
+        cache_namespaces.key("trending_artists_full", "hip-hop", 16),
+        cache_namespaces.key("tracks_chart", "hip-hop", 15),
+    ]
@@ -1,5 +1,11 @@
+import json
+import time
+
 import pytest
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
 
+from music_api.services import cache_namespaces, swr
 from music_api.views.artists_async import LASTFM_CHART_LIMIT
 from music_api.views.tracks_async import LASTFM_BATCH_LIMIT, YearChartAPIView
 
@@ -36,7 +42,7 @@ async def test_year_chart_uses_cache_on_second_request(async_api_client, monkeyp
         }
     ]
 
-    async def fake_get_chart(self, genre, limit):
+    async def fake_get_chart(self, genre, limit, budget=None):
         calls["count"] += 1
         return payload
 
@@ -52,6 +58,92 @@ async def test_year_chart_uses_cache_on_second_request(async_api_client, monkeyp
     assert calls["count"] == 1
 
 
+async def test_year_chart_serves_stale_entry_and_refreshes_once(
+    async_api_client, monkeypatch
+):
+    old_payload = [{"name": "Old", "artist": "A", "listeners": 1, "playcount": 1}]
+    new_payload = [{"name": "New", "artist": "B", "listeners": 2, "playcount": 2}]
+    created_at = time.time() - 700
+    cache.set(
+        cache_namespaces.key("tracks_chart", "all", 5),
+        {"value": old_payload, "created_at": created_at},
+        timeout=60,
+    )
+    jobs = []
+
+    async def fake_get_chart(self, genre, limit, budget=None):
+        return new_payload
+
+    monkeypatch.setattr(YearChartAPIView, "_get_chart_data_async", fake_get_chart)
+    monkeypatch.setattr(swr, "run_in_background", lambda name, job: jobs.append(job))
+
+    first = await async_api_client.get("/music_api/year-chart/?limit=5")
+    second = await async_api_client.get("/music_api/year-chart/?limit=5")
+
+    assert first.json()["tracks"] == old_payload
+    assert first.json()["meta"] == {"cached": True, "created_at": int(created_at)}
+    assert first.headers["X-Cache"] == "STALE"
+    assert int(first.headers["Age"]) >= 700
+    assert second.json()["tracks"] == old_payload
+    assert len(jobs) == 1
+
+    await jobs[0]()
+    refreshed = await async_api_client.get("/music_api/year-chart/?limit=5")
+
+    entry = await swr.aget_entry(cache_namespaces.key("tracks_chart", "all", 5))
+    assert refreshed.json()["tracks"] == new_payload
+    assert refreshed.json()["meta"] == {
+        "cached": True,
+        "created_at": int(entry.created_at),
+    }
+    assert refreshed.headers["X-Cache"] == "HIT"
+    assert refreshed.headers["Age"] == "0"
+
+
+async def test_year_chart_serves_prepared_bytes_with_etag(
+    async_api_client, monkeypatch
+):
+    payload = [{"name": "Numb", "artist": "Linkin Park", "listeners": 1}]
+
+    async def fake_get_chart(self, genre, limit, budget=None):
+        return payload
+
+    def fail_render(*args, **kwargs):
+        raise AssertionError("renderer must not run on a cache hit")
+
+    monkeypatch.setattr(YearChartAPIView, "_get_chart_data_async", fake_get_chart)
+    await async_api_client.get("/music_api/year-chart/?limit=5")
+    monkeypatch.setattr(JSONRenderer, "render", fail_render)
+
+    plain = await async_api_client.get(
+        "/music_api/year-chart/?limit=5", headers={"Accept-Encoding": "identity"}
+    )
+    # httpx сам распаковывает gzip и br, сравниваем итоговые байты.
+    compressed = await async_api_client.get(
+        "/music_api/year-chart/?limit=5", headers={"Accept-Encoding": "gzip, br"}
+    )
+    gzipped = await async_api_client.get(
+        "/music_api/year-chart/?limit=5",
+        headers={"Accept-Encoding": "gzip, br;q=0"},
+    )
+    not_modified = await async_api_client.get(
+        "/music_api/year-chart/?limit=5",
+        headers={"If-None-Match": plain.headers["ETag"]},
+    )
+
+    assert plain.status_code == 200
+    assert "Content-Encoding" not in plain.headers
+    assert json.loads(plain.content)["tracks"] == payload
+    assert compressed.headers["Content-Encoding"] == "br"
+    assert compressed.content == plain.content
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.content == plain.content
+    assert compressed.headers["ETag"] == plain.headers["ETag"]
+    assert "Accept-Encoding" in plain.headers["Vary"]
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
 async def test_trending_rejects_bad_limit(async_api_client):
     response = await async_api_client.get(
         f"/music_api/trending/?limit={LASTFM_CHART_LIMIT + 1}"
@@ -59,3 +151,48 @@ async def test_trending_rejects_bad_limit(async_api_client):
 
     assert response.status_code == 400
     assert "Limit must be" in response.json()["error"]
+
+
+async def test_year_chart_streams_ndjson_and_caches_result(
+    async_api_client, monkeypatch
+):
+    from music_api.views import tracks_async
+
+    raw = [
+        {"name": "Low", "artist": "A", "listeners": 1, "playcount": 1},
+        {"name": "Top", "artist": "B", "listeners": 5, "playcount": 9},
+    ]
+
+    async def fake_raw_chart(self, genre, limit):
+        return sorted(raw, key=lambda t: t["listeners"], reverse=True)
+
+    async def fake_itunes(tracks, on_result=None, **kwargs):
+        for track in tracks:
+            key = (track["name"], track["artist"])
+            on_result(key, {"cover": f"/{track['name']}.jpg", "preview": "p"})
+        return {}
+
+    async def fake_deezer(tracks, on_result=None, **kwargs):
+        return {}
+
+    monkeypatch.setattr(YearChartAPIView, "_get_raw_chart_async", fake_raw_chart)
+    monkeypatch.setattr(tracks_async, "_get_itunes_batch_async", fake_itunes)
+    monkeypatch.setattr(tracks_async, "_get_deezer_batch_async", fake_deezer)
+
+    response = await async_api_client.get(
+        "/music_api/year-chart/?limit=5", headers={"Accept": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["event"] == "tracks"
+    assert [t["name"] for t in lines[0]["tracks"]] == ["Top", "Low"]
+    assert lines[0]["tracks"][0]["image_url"] == "/static/images/default.svg"
+    assert sorted(
+        (line["index"], line["track"]["image_url"]) for line in lines[1:-1]
+    ) == [(0, "/Top.jpg"), (1, "/Low.jpg")]
+    assert lines[-1] == {"event": "done", "count": 2}
+
+    cached = await swr.aget_entry(cache_namespaces.key("tracks_chart", "all", 5))
+    assert [t["image_url"] for t in cached.value] == ["/Top.jpg", "/Low.jpg"]
@@ -10,7 +10,9 @@ from music_api.models import (
     PlaylistComment,
     PlaylistCommentLike,
     PlaylistLike,
+    PlaylistTrack,
 )
+from music_api.services import track_playlists
 
 pytestmark = [pytest.mark.asyncio, pytest.mark.django_db(transaction=True)]
 
@@ -32,7 +34,7 @@ def public_owner(db):
 
     from music_api.models import Playlist
 
-    Playlist.objects.create(user=user, title="Public Playlist", tracks=[])
+    Playlist.objects.create(user=user, title="Public Playlist")
     return user
 
 
@@ -136,7 +138,7 @@ async def test_public_playlist_trending_orders_by_likes(
     )
 
     second_playlist = await sync_to_async(Playlist.objects.create)(
-        user=second_owner, title="Second Playlist", tracks=[]
+        user=second_owner, title="Second Playlist"
     )
     extra_liker = await sync_to_async(User.objects.create_user)(
         username=f"liker2_{suffix}",
@@ -157,6 +159,19 @@ async def test_public_playlist_trending_orders_by_likes(
     await sync_to_async(PlaylistLike.objects.create)(
         playlist=second_playlist, user=liker_user
     )
+    await sync_to_async(PlaylistTrack.objects.bulk_create)(
+        [
+            PlaylistTrack(
+                playlist=first_playlist,
+                position=position,
+                name=name,
+                artist="Linkin Park",
+                name_key=name.lower(),
+                artist_key="linkin park",
+            )
+            for position, name in enumerate(["Numb", "Faint", "Papercut"], start=1)
+        ]
+    )
 
     response = await async_api_client.get("/api/playlists/public/trending/?limit=2")
     payload = response.json()
@@ -165,8 +180,10 @@ async def test_public_playlist_trending_orders_by_likes(
     assert payload["meta"]["count"] == 2
     assert payload["results"][0]["username"] == public_owner.username
     assert payload["results"][0]["likes_count"] == 2
+    assert payload["results"][0]["tracks_count"] == 3
     assert payload["results"][1]["username"] == second_owner.username
     assert payload["results"][1]["likes_count"] == 1
+    assert payload["results"][1]["tracks_count"] == 0
 
 
 async def test_public_playlist_comments_list_and_create(
@@ -579,3 +596,64 @@ async def test_public_playlist_comments_delete_root_with_only_own_replies(
     )()
     assert root_exists is False
     assert reply_exists is False
+
+
+def _save_track(user, name, artist, mbid=""):
+    playlist = user.playlists.order_by("created_at").first()
+    return PlaylistTrack.objects.create(
+        playlist=playlist,
+        name=name,
+        artist=artist,
+        mbid=mbid,
+        **track_playlists.track_keys(name, artist),
+    )
+
+
+async def test_track_playlists_counts_savers_and_lists_public_playlists(
+    async_api_client, public_owner, liker_user
+):
+    User = get_user_model()
+    private_user = await sync_to_async(User.objects.create_user)(
+        username=f"private_{uuid.uuid4().hex[:8]}",
+        email=f"private_{uuid.uuid4().hex[:8]}@example.com",
+        password="private-pass-123",
+        is_public_favorites=False,
+    )
+    await sync_to_async(_save_track)(public_owner, "Numb", "Linkin Park", "numb-mbid")
+    await sync_to_async(_save_track)(liker_user, "Numb (Live)", "LP", "numb-mbid")
+    await sync_to_async(_save_track)(private_user, "  numb ", "LINKIN PARK")
+    await sync_to_async(_save_track)(private_user, "Faint", "Linkin Park")
+
+    response = await async_api_client.get(
+        "/api/playlists/by-track/",
+        params={"name": "Numb", "artist": "Linkin Park", "mbid": "numb-mbid"},
+    )
+    first_page = await async_api_client.get(
+        "/api/playlists/by-track/",
+        params={"name": "numb", "artist": "linkin park", "page_size": 1},
+    )
+    payload = response.json()
+
+    assert response.status_code == 200
+    assert payload["saved_count"] == 3
+    assert payload["meta"]["count"] == 2
+    assert {row["username"] for row in payload["results"]} == {
+        public_owner.username,
+        liker_user.username,
+    }
+    assert first_page.json()["saved_count"] == 2
+    assert first_page.json()["meta"] == {"count": 1, "page": 1, "page_size": 1}
+    assert first_page.json()["results"][0]["username"] == public_owner.username
+
+
+async def test_track_playlists_validates_query(async_api_client):
+    missing = await async_api_client.get(
+        "/api/playlists/by-track/", params={"name": "Numb"}
+    )
+    bad_page = await async_api_client.get(
+        "/api/playlists/by-track/", params={"mbid": "numb-mbid", "page_size": 31}
+    )
+
+    assert missing.status_code == 400
+    assert bad_page.status_code == 400
+    assert bad_page.json()["detail"] == "Page must be >= 1 and page_size 1-30."
@@ -0,0 +1,73 @@
+import pytest
+import respx
+
+from music_api.services import http_clients, rate_limit
+from music_api.services.metrics import UPSTREAM_RATE_LIMIT_WAIT
+
+
+def test_local_bucket_spends_burst_then_reserves_slots(settings):
+    settings.UPSTREAM_RATE_LIMITS = {"lastfm": {"rate": 10, "burst": 2}}
+    limit = rate_limit.get_rate_limit("lastfm")
+
+    waits = [rate_limit._local_reserve("lastfm", limit) for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.05 < waits[2] <= 0.1
+    assert 0.15 < waits[3] <= 0.2
+
+
+def test_acquire_sync_rejects_when_wait_exceeds_max_wait(settings):
+    settings.UPSTREAM_RATE_LIMITS = {
+        "itunes_preview": {"rate": 1, "burst": 1, "max_wait": 0.5}
+    }
+
+    assert rate_limit.acquire_sync("itunes_preview") == 0.0
+    with pytest.raises(rate_limit.UpstreamRateLimited) as exc_info:
+        rate_limit.acquire_sync("itunes_preview")
+
+    assert exc_info.value.provider == "itunes_preview"
+    assert exc_info.value.wait > 0.5
+
+
+@pytest.mark.asyncio
+async def test_upstream_transport_acquires_token(settings):
+    settings.UPSTREAM_RATE_LIMITS = {"deezer": {"rate": 100, "burst": 1}}
+    histogram = UPSTREAM_RATE_LIMIT_WAIT.labels(provider="deezer", outcome="acquired")
+    before = histogram._sum.get()
+
+    with respx.mock(assert_all_called=True) as mock:
+        mock.get("https://api.deezer.com/search").respond(200, json={"data": []})
+        client = http_clients.get_http_client("deezer")
+        await client.get("https://api.deezer.com/search")
+        await client.get("https://api.deezer.com/search")
+
+    # Второй запрос ждал пополнения bucket (~10 мс при 100 токенах/с).
+    assert histogram._sum.get() - before > 0.005
+    await http_clients.close_http_clients()
+
+
+@pytest.mark.parametrize("provider", sorted(rate_limit.LARGEST_BATCH))
+def test_default_limits_admit_two_cold_batches_back_to_back(provider):
+    limit = rate_limit.get_rate_limit(provider)
+
+    # Второй пакет приходит, когда первый уже выбрал весь burst.
+    waits = [
+        rate_limit._local_reserve(provider, limit)
+        for _ in range(2 * rate_limit.LARGEST_BATCH[provider])
+    ]
+
+    assert min(waits) >= 0
+
+
+def test_batch_concurrency_is_capped_by_pool_and_burst(settings):
+    settings.UPSTREAM_HTTP_POOLS = {"lastfm": {"max_connections": 4}}
+    settings.UPSTREAM_RATE_LIMITS = {"itunes": {"burst": 2}}
+
+    assert http_clients.concurrency_cap("lastfm") == 4
+    assert http_clients.concurrency_cap("itunes") == 2
+    assert http_clients.concurrency_cap("deezer") == 20
+
+
+def test_preview_limits_fail_fast_instead_of_blocking_worker():
+    for provider in ("itunes_preview", "deezer_preview"):
+        assert rate_limit.get_rate_limit(provider).max_wait <= 0.5
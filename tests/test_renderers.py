@@ -0,0 +1,63 @@
+import datetime
+import decimal
+import io
+
+import orjson
+import pytest
+from django.core.management import call_command
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from music_api.models import Playlist, PlaylistComment
+from music_api.renderers import ORJSONParser, ORJSONRenderer
+from music_api.views.playlists_async import _serialize_comment
+
+
+def test_orjson_renderer_matches_drf_json_renderer():
+    data = {
+        "created_at": datetime.datetime(
+            2026, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+        ),
+        "day": datetime.date(2026, 1, 2),
+        "price": decimal.Decimal("1.50"),
+        "label": gettext_lazy("Favorites"),
+        "text": "Björk   line",
+        "nested": [{"id": 1, "tags": ("a", "b")}, None, True],
+    }
+
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_renderer_keeps_indent_for_browsable_api():
+    rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4")
+
+    assert rendered == JSONRenderer().render({"a": 1}, "application/json; indent=4")
+
+
+def test_orjson_parser_parses_and_rejects_invalid_json():
+    parser = ORJSONParser()
+
+    assert parser.parse(io.BytesIO(b'{"name": "Numb"}')) == {"name": "Numb"}
+    with pytest.raises(ParseError):
+        parser.parse(io.BytesIO(b'{"name": NaN}'))
+
+
+@pytest.mark.django_db
+def test_serialized_comment_needs_no_fallback_conversion(user):
+    playlist = Playlist.objects.filter(user=user).first()
+    comment = PlaylistComment.objects.create(playlist=playlist, author=user, text="Hi")
+
+    payload = _serialize_comment(comment=comment, current_user=user)
+
+    # Без default: orjson кодирует всё сам, без захода в JSONEncoder DRF.
+    assert orjson.loads(orjson.dumps(payload))["text"] == "Hi"
+
+
+def test_bench_renderers_command_reports_each_payload():
+    out = io.StringIO()
+
+    call_command("bench_renderers", iterations=1, stdout=out)
+
+    assert "trending" in out.getvalue()
+    assert "speedup" in out.getvalue()
@@ -1,7 +1,21 @@
+import asyncio
+from datetime import timedelta
+
+import httpx
 import pytest
 import respx
+from django.core.cache import cache
+from django.utils import timezone
 
-from music_api.views.services_async import _get_itunes_batch_async
+from music_api.models import ArtistMetadata, TrackMetadata
+from music_api.services import artist_metadata, cache_namespaces, track_metadata
+from music_api.services.errors import UpstreamUnavailable
+from music_api.views.services_async import (
+    ArtistBatchResult,
+    _build_track_cache_key,
+    _get_itunes_batch_async,
+    _get_wikipedia_artist_bios_batch_async,
+)
 
 pytestmark = [pytest.mark.asyncio, pytest.mark.django_db(transaction=True)]
 
@@ -34,3 +48,329 @@ async def test_itunes_batch_enriches_and_uses_cache():
     assert second[key] == first[key]
     assert route.called
     assert len(route.calls) == 1
+
+
+async def test_itunes_batch_prefetches_cache_and_reports_hits():
+    cached_track = {"name": "Numb", "artist": "Linkin Park"}
+    fresh_track = {"name": "In the End", "artist": "Linkin Park"}
+    cached_value = {"cover": "https://img.example/numb.jpg", "preview": None}
+    cache.set(
+        _build_track_cache_key(
+            cache_namespaces.key("itunes"), "", "Numb", "Linkin Park"
+        ),
+        cached_value,
+        timeout=60,
+    )
+
+    with respx.mock(assert_all_called=True) as mock:
+        route = mock.get("https://itunes.apple.com/search").respond(
+            200,
+            json={
+                "results": [
+                    {
+                        "trackName": "In the End",
+                        "artistName": "Linkin Park",
+                        "artworkUrl100": "https://img.example/100x100bb.jpg",
+                        "previewUrl": "https://audio.example/end.m4a",
+                    }
+                ]
+            },
+        )
+
+        first = await _get_itunes_batch_async([cached_track, fresh_track])
+        second = await _get_itunes_batch_async([cached_track, fresh_track])
+
+    assert first[("Numb", "Linkin Park")] == cached_value
+    assert first[("In the End", "Linkin Park")]["preview"] == (
+        "https://audio.example/end.m4a"
+    )
+    assert (first.cache_hits, first.cache_misses) == (1, 1)
+    assert (second.cache_hits, second.cache_misses) == (2, 0)
+    assert len(route.calls) == 1
+
+
+async def test_enrichment_budget_returns_partial_results_and_keeps_fetching():
+    from music_api.views import tracks_async
+
+    async def slow_itunes(request):
+        await asyncio.sleep(0.3)
+        return httpx.Response(
+            200,
+            json={
+                "results": [
+                    {
+                        "trackName": "Numb",
+                        "artistName": "Linkin Park",
+                        "artworkUrl100": "https://img.example/100x100bb.jpg",
+                        "previewUrl": "https://audio.example/numb.m4a",
+                    }
+                ]
+            },
+        )
+
+    with respx.mock(assert_all_called=True) as mock:
+        mock.get("https://itunes.apple.com/search").mock(side_effect=slow_itunes)
+        mock.get("https://api.deezer.com/search").respond(
+            200,
+            json={"data": [{"album": {"cover_xl": "https://dz.example/numb.jpg"}}]},
+        )
+
+        enriched = await tracks_async._enrich_tracks_list_async(
+            [{"name": "Numb", "artist": "Linkin Park"}], budget=0.1
+        )
+
+        assert enriched[0]["incomplete"] is True
+        assert enriched[0]["image_url"] == "https://dz.example/numb.jpg"
+
+        await asyncio.gather(*tracks_async._background_tasks)
+
+    itunes_key = _build_track_cache_key(
+        cache_namespaces.key("itunes"), "", "Numb", "Linkin Park"
+    )
+    assert cache.get(itunes_key)["preview"] == "https://audio.example/numb.m4a"
+
+
+async def test_itunes_batch_falls_back_to_track_metadata_after_eviction():
+    track = {"name": "Numb", "artist": "Linkin Park", "mbid": "mbid-numb"}
+
+    with respx.mock(assert_all_called=True) as mock:
+        route = mock.get("https://itunes.apple.com/search").respond(
+            200,
+            json={
+                "results": [
+                    {
+                        "trackName": "Numb",
+                        "artistName": "Linkin Park",
+                        "artworkUrl100": "https://img.example/100x100bb.jpg",
+                        "previewUrl": "https://audio.example/numb.m4a",
+                    }
+                ]
+            },
+        )
+        first = await _get_itunes_batch_async([track])
+
+        cache.clear()
+        second = await _get_itunes_batch_async(
+            [{"name": "numb", "artist": "Linkin  Park", "mbid": "mbid-numb"}]
+        )
+
+    assert len(route.calls) == 1
+    assert second[("numb", "Linkin  Park")] == first[("Numb", "Linkin Park")]
+    assert second.cache_hits == 1
+    row = await TrackMetadata.objects.aget(mbid="mbid-numb")
+    assert row.itunes["preview"] == "https://audio.example/numb.m4a"
+    assert row.itunes_fetched_at is not None
+
+
+async def test_track_metadata_warm_ttl_never_outlives_table_value():
+    now = timezone.now()
+    empty = {
+        "deezer": {"cover": None, "preview": None},
+        "deezer_fetched_at": now - timedelta(minutes=50),
+    }
+    found = {
+        "itunes": {"cover": "a", "preview": "p"},
+        "itunes_fetched_at": now - timedelta(days=1),
+    }
+    expired = {
+        "itunes": {"cover": None, "preview": None},
+        "itunes_fetched_at": now - timedelta(hours=2),
+    }
+
+    assert 0 < track_metadata.warm_ttl(empty, "deezer", now) <= 10 * 60
+    assert track_metadata.warm_ttl(found, "itunes", now) == 60 * 60 * 24 * 7
+    assert track_metadata.warm_ttl(expired, "itunes", now) == 0
+
+
+async def test_track_metadata_upsert_keeps_other_providers():
+    await track_metadata.save(
+        "itunes", {("Numb", "Linkin Park", ""): {"cover": "a", "preview": "p"}}
+    )
+    await track_metadata.save(
+        "deezer", {("NUMB", "linkin park", ""): {"cover": "b", "preview": None}}
+    )
+
+    rows = [row async for row in TrackMetadata.objects.all()]
+    assert len(rows) == 1
+    assert rows[0].itunes == {"cover": "a", "preview": "p"}
+    assert rows[0].deezer == {"cover": "b", "preview": None}
+
+
+async def test_track_metadata_upsert_fills_missing_mbid_only():
+    await track_metadata.save("itunes", {("Numb", "Linkin Park", ""): {"cover": "a"}})
+    await track_metadata.save(
+        "deezer", {("Numb", "Linkin Park", "m-1"): {"cover": "b"}}
+    )
+    await track_metadata.save("lastfm", {("Numb", "Linkin Park", "m-2"): {"x": 1}})
+    await track_metadata.save("itunes", {("Numb", "Linkin Park", ""): {"cover": "c"}})
+
+    row = await TrackMetadata.objects.aget()
+    assert row.mbid == "m-1"
+    assert row.itunes == {"cover": "c"}
+
+
+async def test_artist_bios_from_parallel_requests_keep_each_language():
+    # Оба запроса прочитали строку до записи: ни один язык не должен пропасть.
+    await artist_metadata.save_bios("en", {"Linkin Park": {"bio": "English"}})
+    await asyncio.gather(
+        artist_metadata.save_bios("ru", {"linkin park": {"bio": "Русский"}}),
+        artist_metadata.save_bios("de", {"Linkin Park": {"bio": "Deutsch"}}),
+    )
+
+    row = await ArtistMetadata.objects.aget(name_key="linkin park")
+    assert sorted(row.bios) == ["de", "en", "ru"]
+    assert row.bios["ru"]["bio"] == "Русский"
+    assert row.bios["en"]["fetched_at"] > 0
+
+
+async def test_itunes_batch_uses_lookup_for_known_track_ids():
+    tracks = [
+        {"name": f"Song {i}", "artist": "Artist", "itunes_id": str(1000 + i)}
+        for i in range(250)
+    ]
+
+    def lookup(request):
+        ids = request.url.params["id"].split(",")
+        return httpx.Response(
+            200,
+            json={
+                "results": [
+                    {
+                        "wrapperType": "track",
+                        "trackId": int(track_id),
+                        "artworkUrl100": f"https://img.example/{track_id}/100x100bb",
+                        "previewUrl": f"https://audio.example/{track_id}.m4a",
+                    }
+                    for track_id in ids
+                ]
+            },
+        )
+
+    with respx.mock(assert_all_called=False) as mock:
+        lookup_route = mock.get("https://itunes.apple.com/lookup").mock(
+            side_effect=lookup
+        )
+        search_route = mock.get("https://itunes.apple.com/search").respond(
+            200, json={"results": []}
+        )
+        result = await _get_itunes_batch_async(tracks, limit=250)
+
+    assert len(lookup_route.calls) == 2
+    assert not search_route.called
+    assert result[("Song 0", "Artist")] == {
+        "cover": "https://img.example/1000/600x600bb",
+        "preview": "https://audio.example/1000.m4a",
+        "track_id": 1000,
+    }
+    assert len(result) == 250
+
+
+async def test_itunes_batch_refreshes_matched_track_by_stored_id():
+    track = {"name": "Numb", "artist": "Linkin Park"}
+    item = {
+        "wrapperType": "track",
+        "trackId": 42,
+        "trackName": "Numb",
+        "artistName": "Linkin Park",
+        "artworkUrl100": "https://img.example/100x100bb.jpg",
+        "previewUrl": "https://audio.example/numb.m4a",
+    }
+
+    with respx.mock(assert_all_called=True) as mock:
+        search_route = mock.get("https://itunes.apple.com/search").respond(
+            200, json={"results": [item]}
+        )
+        await _get_itunes_batch_async([track])
+
+        cache.clear()
+        await TrackMetadata.objects.all().aupdate(itunes_fetched_at=None)
+        lookup_route = mock.get(
+            "https://itunes.apple.com/lookup", params={"id": "42"}
+        ).respond(200, json={"results": [item]})
+        result = await _get_itunes_batch_async([track])
+
+    assert len(search_route.calls) == 1
+    assert len(lookup_route.calls) == 1
+    assert result[("Numb", "Linkin Park")]["track_id"] == 42
+
+
+async def test_wikipedia_batch_resolves_known_titles_in_one_query():
+    stale_bio = {
+        "bio": "old",
+        "title": "",
+        "source_url": "",
+        "image_url": "",
+        "lang": "ru",
+        "fetched_at": 0,
+    }
+    for name, title, title_lang in [
+        ("Eminem", "Эминем", "ru"),
+        ("Drake", "Drake (musician)", "en"),
+        ("Ado", "Адо", "ru"),
+    ]:
+        await ArtistMetadata.objects.acreate(
+            name=name,
+            name_key=artist_metadata.name_key(name),
+            bios={"ru": {**stale_bio, "title": title, "lang": title_lang}},
+        )
+    searched = []
+
+    def wikipedia(request):
+        params = request.url.params
+        lang = request.url.host.split(".")[0]
+        if "gsrsearch" in params:
+            searched.append((lang, params["gsrsearch"]))
+            return httpx.Response(200, json={"query": {"pages": []}})
+        pages = [
+            {"title": title, "extract": f"{title} bio", "fullurl": f"u/{title}"}
+            for title in params["titles"].split("|")
+        ]
+        return httpx.Response(200, json={"query": {"pages": pages}})
+
+    with respx.mock() as mock:
+        route = mock.get(url__regex=r"https://\w+\.wikipedia\.org/w/api\.php").mock(
+            side_effect=wikipedia
+        )
+        result = await _get_wikipedia_artist_bios_batch_async(
+            ["Eminem", "Drake", "Ado", "Unknown"], lang="ru"
+        )
+
+    title_calls = [
+        call.request for call in route.calls if "titles" in call.request.url.params
+    ]
+    assert len(title_calls) == 2
+    assert result["Eminem"]["bio"] == "Эминем bio"
+    assert result["Drake"]["lang"] == "en"
+    assert sorted(searched) == [("en", "Unknown"), ("ru", "Unknown")]
+    assert result["Unknown"]["bio"] == ""
+
+
+async def test_wikipedia_search_keeps_english_bio_when_local_lang_is_refused():
+    def wikipedia(request):
+        if request.url.host.startswith("ru."):
+            raise UpstreamUnavailable("wikipedia", "breaker open")
+        page = {"title": "Numb", "extract": "English bio", "fullurl": "u/Numb"}
+        return httpx.Response(200, json={"query": {"pages": [page]}})
+
+    with respx.mock() as mock:
+        mock.get(url__regex=r"https://\w+\.wikipedia\.org/w/api\.php").mock(
+            side_effect=wikipedia
+        )
+        result = await _get_wikipedia_artist_bios_batch_async(["Numb"], lang="ru")
+
+    assert result["Numb"]["bio"] == "English bio"
+    assert result["Numb"]["lang"] == "en"
+
+
+async def test_merge_stored_writes_empty_only_for_real_answers():
+    from music_api.views.artists_async import _merge_stored
+
+    due = [{"name": "Rihanna"}, {"name": "Drake"}, {"name": "Adele"}]
+    fetched = ArtistBatchResult({"Rihanna": "", "Adele": "cached.jpg"})
+    fetched.fetched.add("Rihanna")
+
+    merged = _merge_stored(due, fetched, {}, "photo")
+
+    # Drake: провайдер отказал; Adele: значение из Redis — в таблицу не пишем.
+    assert merged.updated == [({"name": "Rihanna"}, "")]
+    assert merged["Adele"] == "cached.jpg"
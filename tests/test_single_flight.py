@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from django.core.cache import cache
+
+from music_api.services import single_flight as sf
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_concurrent_callers_share_one_fetch():
+    calls = []
+    release = asyncio.Event()
+
+    async def fetch():
+        calls.append(1)
+        await release.wait()
+        return {"cover": "x"}
+
+    tasks = [asyncio.create_task(sf.single_flight("sf:key", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert len(calls) == 1
+    assert results == [{"cover": "x"}] * 5
+    assert sf._inflight == {}
+
+
+async def test_leader_error_is_shared_and_lease_released():
+    async def fetch():
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        sf.single_flight("sf:error", fetch),
+        sf.single_flight("sf:error", fetch),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.get(f"{sf.LEASE_PREFIX}:sf:error") is None
+
+
+async def test_waits_for_value_when_lease_held_by_other_worker(monkeypatch):
+    monkeypatch.setattr(sf, "POLL_INTERVAL_SECONDS", 0.01)
+    cache.add(f"{sf.LEASE_PREFIX}:sf:lease", 1, timeout=5)
+
+    async def fetch():
+        raise AssertionError("fetch must not run while the lease is held")
+
+    async def other_worker():
+        await asyncio.sleep(0.03)
+        cache.set("sf:lease", {"playcount": 7}, timeout=60)
+
+    result, _ = await asyncio.gather(
+        sf.single_flight("sf:lease", fetch), other_worker()
+    )
+
+    assert result == {"playcount": 7}
+
+
+async def test_leader_hands_result_to_waiters_through_the_lease(monkeypatch):
+    monkeypatch.setattr(sf, "POLL_INTERVAL_SECONDS", 0.01)
+    lease_key = f"{sf.LEASE_PREFIX}:sf:done"
+    cache.add(lease_key, 1, timeout=5)
+
+    async def fetch():
+        raise AssertionError("fetch must not run while the lease is held")
+
+    async def other_worker():
+        # Лидер закончил, но основной ключ ещё не записан (batch write-back).
+        await asyncio.sleep(0.03)
+        cache.set(lease_key, {"value": {"cover": "y"}}, timeout=sf.DONE_TTL_SECONDS)
+
+    started = asyncio.get_running_loop().time()
+    result, _ = await asyncio.gather(sf.single_flight("sf:done", fetch), other_worker())
+
+    assert result == {"cover": "y"}
+    assert cache.get("sf:done") is None
+    assert asyncio.get_running_loop().time() - started < 1
+
+
+async def test_leader_marks_lease_done_on_success():
+    async def fetch():
+        return None
+
+    assert await sf.single_flight("sf:none", fetch) is None
+    assert cache.get(f"{sf.LEASE_PREFIX}:sf:none") == {"value": None}
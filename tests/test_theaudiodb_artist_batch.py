@@ -38,6 +38,8 @@ async def test_theaudiodb_artist_batch_uses_exact_name_match_and_cache():
         second = await _get_theaudiodb_artists_batch_async(artists)
 
     assert first["Rihanna"] == "https://img.example/rihanna.jpg"
+    assert first.fetched == {"Rihanna"}
+    assert second.fetched == set()
     assert second["Rihanna"] == "https://img.example/rihanna.jpg"
     assert route.called
     assert len(route.calls) == 1
@@ -67,3 +69,20 @@ async def test_theaudiodb_artist_batch_falls_back_to_name_search():
     assert result["Rihanna"] == "https://img.example/rihanna-search.jpg"
     assert route.called
     assert len(route.calls) == 1
+
+
+async def test_theaudiodb_artist_batch_leaves_out_refused_lookups(settings):
+    settings.UPSTREAM_RATE_LIMITS = {
+        "theaudiodb": {"rate": 0.01, "burst": 1, "max_wait": 0}
+    }
+    artists = [{"name": "Rihanna", "mbid": ""}, {"name": "Drake", "mbid": ""}]
+
+    with respx.mock(assert_all_called=True) as mock:
+        mock.get("https://www.theaudiodb.com/api/v1/json/123/search.php").respond(
+            200, json={"artists": []}
+        )
+        photos = await _get_theaudiodb_artists_batch_async(artists)
+
+    # Один запрос прошёл и честно ничего не нашёл, второй отклонён лимитом.
+    assert list(photos.values()) == [""]
+    assert len(photos) == 1
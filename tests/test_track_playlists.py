@@ -0,0 +1,60 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from music_api.models import PlaylistTrack
+from music_api.services import track_playlists
+
+pytestmark = pytest.mark.django_db
+
+
+def _save(playlist, name, artist):
+    return PlaylistTrack.objects.create(
+        playlist=playlist,
+        name=name,
+        artist=artist,
+        **track_playlists.track_keys(name, artist),
+    )
+
+
+def test_report_groups_tracks_by_key_in_database(user):
+    other = get_user_model().objects.create_user(
+        username="report_other", email="report_other@example.com", password="x"
+    )
+    favorites = user.playlists.get(title="Favorites")
+    second = user.playlists.get(title="Test Playlist")
+    _save(favorites, "Numb", "Linkin Park")
+    _save(second, "numb", "linkin park")
+    _save(other.playlists.get(), "NUMB", "Linkin Park")
+    _save(other.playlists.get(), "Faint", "Linkin Park")
+
+    rows = track_playlists.report()
+
+    assert rows[0]["name"].lower() == "numb"
+    assert rows[0]["user_count"] == 2
+    assert rows[0]["total_adds"] == 3
+    assert [u["username"] for u in rows[0]["users"]] == sorted(
+        [user.username, "report_other"], key=str.lower
+    )
+    assert rows[1]["name"] == "Faint"
+    assert rows[1]["user_count"] == 1
+
+
+def test_report_filters_by_track_or_user(user):
+    favorites = user.playlists.get(title="Favorites")
+    _save(favorites, "Numb", "Linkin Park")
+    _save(favorites, "Around the World", "Daft Punk")
+
+    assert [row["artist"] for row in track_playlists.report("daft")] == ["Daft Punk"]
+    assert len(track_playlists.report(user.email)) == 2
+    assert track_playlists.report("nobody-matches") == []
+
+
+def test_report_matches_words_across_track_artist_and_user(user):
+    favorites = user.playlists.get(title="Favorites")
+    _save(favorites, "Numb", "Linkin Park")
+    _save(favorites, "Faint", "Linkin Park")
+
+    assert [row["name"] for row in track_playlists.report("numb linkin")] == ["Numb"]
+    assert [row["name"] for row in track_playlists.report("park numb")] == ["Numb"]
+    assert len(track_playlists.report(f"linkin {user.username}")) == 2
+    assert track_playlists.report("numb daft") == []
@@ -1,8 +1,21 @@
+from datetime import timedelta
+
 import pytest
+from django.core.cache import cache
+from django.utils import timezone
 
 import music_api.views.artists_async as artists_async
+from music_api.models import ArtistMetadata
+from music_api.services import artist_metadata
+from music_api.views.services_async import ArtistBatchResult
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.django_db(transaction=True)]
+
 
-pytestmark = pytest.mark.asyncio
+def _from_provider(values):
+    result = ArtistBatchResult(values)
+    result.fetched.update(values)
+    return result
 
 
 async def test_async_get_artists_uses_theaudiodb_images(monkeypatch):
@@ -15,13 +28,15 @@ async def test_async_get_artists_uses_theaudiodb_images(monkeypatch):
 
     async def fake_images(artists):
         assert [artist["name"] for artist in artists] == ["Rihanna", "Drake"]
-        return {
-            "Rihanna": "https://img.example/rihanna.jpg",
-            "Drake": "https://img.example/drake.jpg",
-        }
+        return _from_provider(
+            {
+                "Rihanna": "https://img.example/rihanna.jpg",
+                "Drake": "https://img.example/drake.jpg",
+            }
+        )
 
     async def fake_releases(_artists):
-        return {"Rihanna": [], "Drake": []}
+        return _from_provider({"Rihanna": [], "Drake": []})
 
     monkeypatch.setattr(artists_async, "_get_lastfm_artists_chart_async", fake_chart)
     monkeypatch.setattr(
@@ -36,3 +51,50 @@ async def test_async_get_artists_uses_theaudiodb_images(monkeypatch):
     assert cached is False
     assert payload["artists"][0]["photo_url"] == "https://img.example/rihanna.jpg"
     assert payload["artists"][1]["photo_url"] == "https://img.example/drake.jpg"
+
+
+async def test_trending_reads_artist_metadata_and_refreshes_only_stale(monkeypatch):
+    requested = {"photos": [], "releases": []}
+
+    async def fake_chart(limit):
+        return [
+            {"name": "Rihanna", "listeners": 100, "playcount": 200},
+            {"name": "Drake", "listeners": 90, "playcount": 180},
+        ]
+
+    async def fake_images(artists):
+        requested["photos"].append([artist["name"] for artist in artists])
+        return _from_provider(
+            {
+                artist["name"]: f"https://img.example/{artist['name']}.jpg"
+                for artist in artists
+            }
+        )
+
+    async def fake_releases(artists):
+        requested["releases"].append([artist["name"] for artist in artists])
+        return _from_provider(
+            {artist["name"]: [{"title": "Album"}] for artist in artists}
+        )
+
+    monkeypatch.setattr(artists_async, "_get_lastfm_artists_chart_async", fake_chart)
+    monkeypatch.setattr(
+        artists_async, "_get_theaudiodb_artists_batch_async", fake_images
+    )
+    monkeypatch.setattr(
+        artists_async, "_get_lastfm_releases_batch_async", fake_releases
+    )
+
+    await artists_async._async_get_artists(limit=2)
+    old = timezone.now() - artist_metadata.MAX_AGE["photo"] - timedelta(days=1)
+    await ArtistMetadata.objects.filter(name="Drake").aupdate(photo_fetched_at=old)
+    cache.clear()
+    payload, _ = await artists_async._async_get_artists(limit=2)
+
+    assert requested["photos"] == [["Rihanna", "Drake"], ["Drake"]]
+    assert requested["releases"] == [["Rihanna", "Drake"], []]
+    assert [a["photo_url"] for a in payload["artists"]] == [
+        "https://img.example/Rihanna.jpg",
+        "https://img.example/Drake.jpg",
+    ]
+    assert payload["artists"][0]["releases"] == [{"title": "Album"}]
@@ -0,0 +1,115 @@
+import httpx
+import pytest
+import respx
+
+from music_api.services import http_clients
+from music_api.services.metrics import (
+    UPSTREAM_ERRORS,
+    UPSTREAM_REQUEST_SECONDS,
+    UPSTREAM_RESPONSE_BYTES,
+    UPSTREAM_RESPONSES,
+)
+from music_api.services.upstream_metrics import InstrumentedTransport, upstream_method
+
+
+def _method(provider, url, **params):
+    return upstream_method(provider, httpx.Request("GET", url, params=params))
+
+
+def test_upstream_method_keeps_label_cardinality_bounded():
+    lastfm = "https://ws.audioscrobbler.com/2.0/"
+    assert _method("lastfm", lastfm, method="track.getInfo") == "track.getInfo"
+    assert _method("lastfm", lastfm, method="drop table; --") == "other"
+    assert _method("itunes", "https://itunes.apple.com/search", term="numb") == (
+        "search"
+    )
+    assert _method("deezer", "https://api.deezer.com/search/track") == "search"
+    assert (
+        _method("theaudiodb", "https://www.theaudiodb.com/api/v1/json/2/search.php")
+        == "search"
+    )
+    assert (
+        _method(
+            "apple_rss",
+            "https://rss.applemarketingtools.com/api/v2/us/music/most-played/"
+            "50/songs.json",
+        )
+        == "songs"
+    )
+    wiki = "https://en.wikipedia.org/w/api.php"
+    assert _method("wikipedia", wiki, action="query", list="search") == "search"
+    assert _method("wikipedia", wiki, action="query", titles="Linkin Park") == (
+        "titles"
+    )
+    assert _method("itunes_preview", "https://audio.example/a/b/c.m4a") == "preview"
+    assert _method("deezer", "https://api.deezer.com/") == "other"
+
+
+@pytest.mark.asyncio
+async def test_async_client_records_latency_status_and_response_size():
+    method = "chart.gettoptracks"
+    responses = UPSTREAM_RESPONSES.labels(
+        provider="lastfm", method=method, status="200"
+    )
+    latency = UPSTREAM_REQUEST_SECONDS.labels(provider="lastfm", method=method)
+    sizes = UPSTREAM_RESPONSE_BYTES.labels(provider="lastfm", method=method)
+    before = (responses._value.get(), latency._sum.get(), sizes._sum.get())
+    body = b'{"tracks": {"track": []}}'
+
+    with respx.mock(assert_all_called=True) as mock:
+        mock.get("https://ws.audioscrobbler.com/2.0/").respond(200, content=body)
+        client = http_clients.get_http_client("lastfm")
+        response = await client.get(
+            "https://ws.audioscrobbler.com/2.0/", params={"method": method}
+        )
+
+    assert response.json() == {"tracks": {"track": []}}
+    assert responses._value.get() == before[0] + 1
+    assert latency._sum.get() > before[1]
+    assert sizes._sum.get() == before[2] + len(body)
+    await http_clients.close_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_async_client_records_transport_errors():
+    errors = UPSTREAM_ERRORS.labels(
+        provider="itunes", method="search", error="ConnectTimeout"
+    )
+    before = errors._value.get()
+
+    with respx.mock(assert_all_called=True) as mock:
+        mock.get("https://itunes.apple.com/search").mock(
+            side_effect=httpx.ConnectTimeout("boom")
+        )
+        client = http_clients.get_http_client("itunes")
+        with pytest.raises(httpx.ConnectTimeout):
+            await client.get("https://itunes.apple.com/search")
+
+    assert errors._value.get() == before + 1
+    await http_clients.close_http_clients()
+
+
+def test_sync_transport_records_status_and_streamed_size():
+    responses = UPSTREAM_RESPONSES.labels(
+        provider="deezer_preview", method="preview", status="206"
+    )
+    sizes = UPSTREAM_RESPONSE_BYTES.labels(provider="deezer_preview", method="preview")
+    before = (responses._value.get(), sizes._sum.get())
+    audio = b"\x00" * 4096
+    transport = InstrumentedTransport(
+        "deezer_preview",
+        # Итератор, а не bytes: тело не вычитывается заранее, как с сети.
+        httpx.MockTransport(
+            lambda request: httpx.Response(
+                206, content=iter([audio[:1024], audio[1024:]])
+            )
+        ),
+    )
+
+    with httpx.Client(transport=transport) as client:
+        with client.stream("GET", "https://cdn.deezer.example/preview.mp3") as resp:
+            chunks = list(resp.iter_bytes())
+
+    assert b"".join(chunks) == audio
+    assert responses._value.get() == before[0] + 1
+    assert sizes._sum.get() == before[1] + len(audio)
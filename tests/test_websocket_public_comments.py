@@ -66,9 +66,7 @@ async def test_public_comments_websocket_rejects_private_profile():
         password="test-pass-123",
         is_public_favorites=False,
     )
-    await sync_to_async(Playlist.objects.create)(
-        user=owner, title="Favorites", tracks=[]
-    )
+    await sync_to_async(Playlist.objects.create)(user=owner, title="Favorites")
 
     communicator = WebsocketCommunicator(
         application,
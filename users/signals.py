@@ -16,7 +16,6 @@ def create_favorites_playlist(sender, instance, created, **kwargs):
         Playlist.objects.get_or_create(
             user=instance,
             title="Favorites",
-            defaults={"tracks": []},
         )
 
 
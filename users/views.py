@@ -8,12 +8,13 @@ from django.conf import settings
 from asgiref.sync import async_to_sync
 from rest_framework.generics import RetrieveUpdateAPIView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.parsers import FormParser, MultiPartParser, JSONParser
+from rest_framework.parsers import FormParser, MultiPartParser
 
 from .serializers import UserSerializer
 from .forms import SignupForm, ProfileUpdateForm, LoginForm
 from .presence import get_user_last_seen_display, get_user_last_seen_iso, is_user_online
 from music_api.models import Playlist, PlaylistLikeNotification
+from music_api.renderers import ORJSONParser
 from music_api.views.tracks_async import _enrich_tracks_list_async
 
 User = get_user_model()
@@ -89,10 +90,8 @@ def profile_view(request):
 def playlists_page_view(request):
     playlist = Playlist.objects.filter(user=request.user).order_by("created_at").first()
     if playlist is None:
-        playlist = Playlist.objects.create(
-            user=request.user, title="Favorites", tracks=[]
-        )
-    raw_tracks = playlist.tracks if isinstance(playlist.tracks, list) else []
+        playlist = Playlist.objects.create(user=request.user, title="Favorites")
+    raw_tracks = playlist.track_dicts()
     try:
         tracks = async_to_sync(_enrich_tracks_list_async)(raw_tracks)
     except Exception:
@@ -111,10 +110,8 @@ def public_user_page_view(request, username):
 
     playlist = Playlist.objects.filter(user=profile_user).order_by("created_at").first()
     if playlist is None:
-        playlist = Playlist.objects.create(
-            user=profile_user, title="Favorites", tracks=[]
-        )
-    raw_tracks = playlist.tracks if isinstance(playlist.tracks, list) else []
+        playlist = Playlist.objects.create(user=profile_user, title="Favorites")
+    raw_tracks = playlist.track_dicts()
     try:
         tracks = async_to_sync(_enrich_tracks_list_async)(raw_tracks)
     except Exception:
@@ -153,7 +150,7 @@ def logout_view(request):
 class UserMeAPIView(RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = UserSerializer
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
     def get_object(self):
         return self.request.user